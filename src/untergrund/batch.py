@@ -0,0 +1,287 @@
+# batch.py
+"""
+Untergrundklassifizierung – Batch-Lauf über viele Fahrten
+
+Zweck
+-----
+main.py verarbeitet genau eine `input_path`. Für eine ganze Saison werden hier
+alle Fahrten eines Verzeichnisses/Globs parallel verarbeitet:
+- pro Datei ein eigener Ctx (make_ctx) mit eigener `input_path`, sonst gleiche Config
+- run_stages je Fahrt in einem Prozess-Pool (ProcessPoolExecutor)
+- höchstens `max_in_flight` Fahrten gleichzeitig im Pool → begrenzter Speicher
+- Fehler einer Fahrt (Exception, abgestürzter Worker) brechen den Batch nicht ab
+- Zusammenfassung: Laufzeit pro Stage und pro Fahrt
+
+Verträge
+--------
+- Worker geben nur eine kleine Zusammenfassung zurück (kein Ctx); Ergebnisse
+  persistiert die EXPORT-Stage.
+- stdout einer Fahrt wird im Worker abgefangen und (optional) nach
+  <log_dir>/<nr>_<name>.log geschrieben, damit sich Ausgaben nicht mischen.
+- Stirbt ein Worker-Prozess (z. B. OOM), werden die betroffenen Fahrten einmal
+  in einem neuen Pool wiederholt und erst danach als fehlgeschlagen gemeldet.
+- Mit mehreren Workern ist `parallel_sensors` meist überflüssig (CPU ist bereits ausgelastet).
+
+Aufruf
+------
+    python -m src.untergrund.batch data/ --config config.json --workers 4
+"""
+
+import argparse
+import contextlib
+import copy
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Sequence
+
+import pandas as pd
+
+from .config import validate_config
+from .context import make_ctx
+from .log import get_logger
+from .orchestrator import run_stages
+from .runners.ingest import ingested_ctx
+from .stages import Stage
+
+log = get_logger("batch")
+
+_MAX_ATTEMPTS = 2   # Fahrt + eine Wiederholung nach Worker-Absturz
+
+
+# ---------- Eingaben -----------------------------------------------------
+
+def collect_inputs(source: str | os.PathLike, *, pattern: str = "*.json") -> list[Path]:
+    """
+    Eingabedateien eines Batches (sortiert).
+    - Verzeichnis: alle Dateien nach `pattern` (nicht rekursiv)
+    - sonst: Glob-Muster (z. B. "data/2025-*/*.json", ** rekursiv) oder einzelne Datei
+    """
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(p for p in path.glob(pattern) if p.is_file())
+    else:
+        files = sorted(Path(p) for p in glob.glob(os.fspath(source), recursive=True) if Path(p).is_file())
+    if not files:
+        raise ValueError(f"No input files found for '{source}'.")
+    return files
+
+
+def ride_config(cfg: dict[str, Any], input_path: str | os.PathLike) -> dict[str, Any]:
+    """Kopie der Basis-Config mit der input_path einer Fahrt."""
+    ride_cfg = copy.deepcopy(cfg)
+    ride_cfg["input_path"] = os.fspath(input_path)
+    return ride_cfg
+
+
+# ---------- Worker -------------------------------------------------------
+
+def run_ride(cfg: dict[str, Any], *, log_path: str | None = None, sensors: dict[str, pd.DataFrame] | None = None) -> dict[str, Any]:
+    """
+    Verarbeitet eine Fahrt (läuft im Worker-Prozess).
+    - sensors: bereits empfangenes Sensor-Dict (z. B. server.py) -> INGEST entfällt,
+      input_path dient nur als Fahrt-Kennung
+    Gibt nie eine Exception weiter, sondern status="failed" + Traceback.
+    """
+    buffer = io.StringIO()
+    t0 = time.perf_counter()
+    result: dict[str, Any] = {"input_path": cfg["input_path"], "status": "ok", "error": None}
+    with contextlib.redirect_stdout(buffer):
+        try:
+            if sensors is None:
+                ctx = run_stages(make_ctx(cfg))
+            else:
+                ctx = run_stages(ingested_ctx(cfg, sensors), start=Stage.SELECT)
+            result["stage_timings"] = dict(ctx.artifacts.get("stage_timings", {}))
+            result["n_windows"] = len(ctx.features.get("cluster", ()))
+            if "profile" in ctx.artifacts:
+                result["profile"] = ctx.artifacts["profile"]
+        except Exception:
+            result.update(status="failed", error=traceback.format_exc(), stage_timings={}, n_windows=0)
+    result["total_s"] = time.perf_counter() - t0
+
+    if log_path is not None:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        text = buffer.getvalue() + (result["error"] or "")
+        Path(log_path).write_text(text, encoding="utf-8")
+    return result
+
+
+def _failed(input_path: str, error: str) -> dict[str, Any]:
+    return {"input_path": input_path, "status": "failed", "error": error, "stage_timings": {}, "n_windows": 0, "total_s": 0.0}
+
+
+# ---------- Batch --------------------------------------------------------
+
+def run_batch(
+    cfg: dict[str, Any],
+    inputs: Sequence[str | os.PathLike],
+    *,
+    workers: int | None = None,
+    max_in_flight: int | None = None,
+    log_dir: str | os.PathLike | None = None,
+    max_tasks_per_child: int | None = None,
+    mp_context: str = "spawn",
+) -> dict[str, Any]:
+    """
+    Führt run_stages für jede Eingabedatei in einem Prozess-Pool aus.
+    - workers: Anzahl Prozesse (Default: os.cpu_count())
+    - max_in_flight: max. gleichzeitig eingereichte Fahrten (Default: workers) → Speichergrenze
+    - log_dir: stdout je Fahrt als Datei (None = verwerfen)
+    - max_tasks_per_child: Worker nach n Fahrten neu starten (Speicherlecks begrenzen)
+    - mp_context: "spawn" (Default, sicher mit Thread-Pools im Elternprozess) oder "forkserver"/"fork"
+    Rückgabe: Zusammenfassung (siehe summarize_batch), Fahrten in Eingabereihenfolge.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or workers, 1)
+
+    jobs = []
+    for i, path in enumerate(inputs):
+        log_path = os.fspath(Path(log_dir) / f"{i:04d}_{Path(path).stem}.log") if log_dir is not None else None
+        jobs.append((ride_config(cfg, path), log_path))
+
+    results: list[dict[str, Any] | None] = [None] * len(jobs)
+    attempts = [0] * len(jobs)
+    pending = list(range(len(jobs)))
+    t0 = time.perf_counter()
+
+    while pending:
+        pending = _run_pool(jobs, pending, results, attempts, workers=workers, max_in_flight=max_in_flight,
+                            max_tasks_per_child=max_tasks_per_child, mp_context=mp_context)
+
+    summary = summarize_batch([r for r in results if r is not None], wall_s=time.perf_counter() - t0)
+    summary["workers"] = workers
+    return summary
+
+
+def _run_pool(
+    jobs: list[tuple[dict[str, Any], str | None]],
+    pending: list[int],
+    results: list[dict[str, Any] | None],
+    attempts: list[int],
+    *,
+    workers: int,
+    max_in_flight: int,
+    max_tasks_per_child: int | None,
+    mp_context: str,
+) -> list[int]:
+    """Ein Pool-Durchlauf; gibt die nach einem Worker-Absturz zu wiederholenden Fahrten zurück."""
+    retry: list[int] = []
+    queue = list(pending)
+    in_flight: dict[Future, int] = {}
+    pool_kwargs: dict[str, Any] = {"max_workers": workers, "mp_context": multiprocessing.get_context(mp_context)}
+    if max_tasks_per_child is not None:
+        pool_kwargs["max_tasks_per_child"] = max_tasks_per_child
+
+    with ProcessPoolExecutor(**pool_kwargs) as pool:
+        broken = False
+        while queue or in_flight:
+            while queue and len(in_flight) < max_in_flight and not broken:
+                i = queue.pop(0)
+                attempts[i] += 1
+                ride_cfg, log_path = jobs[i]
+                in_flight[pool.submit(run_ride, ride_cfg, log_path=log_path)] = i
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = in_flight.pop(future)
+                input_path = jobs[i][0]["input_path"]
+                try:
+                    results[i] = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if attempts[i] < _MAX_ATTEMPTS:
+                        retry.append(i)
+                    else:
+                        results[i] = _failed(input_path, "Worker process terminated abruptly (e.g. out of memory).")
+                except Exception:
+                    results[i] = _failed(input_path, traceback.format_exc())
+                if results[i] is not None:
+                    _print_ride(results[i])
+        retry.extend(queue)   # nicht mehr eingereicht, weil der Pool defekt ist
+        if retry:
+            log.warning("Worker pool broke; retrying %s ride(s) in a new pool.", len(retry))
+    return sorted(retry)
+
+
+# ---------- Zusammenfassung ----------------------------------------------
+
+def summarize_batch(results: list[dict[str, Any]], *, wall_s: float) -> dict[str, Any]:
+    """Laufzeiten je Stage (Summe/Mittel/Max über erfolgreiche Fahrten) und je Fahrt."""
+    ok = [r for r in results if r["status"] == "ok"]
+    stages: dict[str, dict[str, float]] = {}
+    for st in Stage:
+        values = [r["stage_timings"][st.name] for r in ok if st.name in r["stage_timings"]]
+        if values:
+            stages[st.name] = {"total_s": sum(values), "mean_s": sum(values) / len(values), "max_s": max(values)}
+    return {
+        "n_rides": len(results),
+        "n_ok": len(ok),
+        "n_failed": len(results) - len(ok),
+        "wall_s": wall_s,
+        "stages": stages,
+        "rides": results,
+    }
+
+
+def _print_ride(result: dict[str, Any]) -> None:
+    name = Path(result["input_path"]).name
+    if result["status"] == "ok":
+        log.info("%s: ok in %.2f s (%s windows)", name, result["total_s"], result["n_windows"])
+    else:
+        last_line = (result["error"] or "").strip().splitlines()[-1:] or [""]
+        log.warning("%s: failed – %s", name, last_line[0])
+
+
+def print_batch_summary(summary: dict[str, Any]) -> None:
+    print(
+        f"[Info] Batch: {summary['n_rides']} rides, {summary['n_ok']} ok, {summary['n_failed']} failed, "
+        f"wall {summary['wall_s']:.2f} s"
+    )
+    if summary["stages"]:
+        print(f"{'stage':<12}{'total_s':>10}{'mean_s':>10}{'max_s':>10}")
+        for name, t in summary["stages"].items():
+            print(f"{name:<12}{t['total_s']:>10.2f}{t['mean_s']:>10.2f}{t['max_s']:>10.2f}")
+    print(f"{'ride':<40}{'status':>8}{'total_s':>10}{'windows':>9}")
+    for r in summary["rides"]:
+        print(f"{Path(r['input_path']).name:<40}{r['status']:>8}{r['total_s']:>10.2f}{r['n_windows']:>9}")
+
+
+# ---------- CLI ----------------------------------------------------------
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the pipeline for many rides in parallel.")
+    parser.add_argument("inputs", help="Directory or glob pattern of SensorLogger JSON files")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--log-dir", default=None)
+    parser.add_argument("--summary", default=None, help="Write the batch summary as JSON to this path")
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    validate_config(cfg)
+
+    summary = run_batch(
+        cfg, collect_inputs(args.inputs), workers=args.workers, max_in_flight=args.max_in_flight, log_dir=args.log_dir
+    )
+    print_batch_summary(summary)
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(summary, indent=1), encoding="utf-8")
+    return 1 if summary["n_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+# bench.py
+"""
+Untergrundklassifizierung – Benchmark-Suite
+
+Zweck
+-----
+Laufzeiten der Pipeline auf synthetischen SensorLogger-Fahrten (synthetic.py)
+reproduzierbar messen und gegen gespeicherte Ergebnisse vergleichen:
+- jede Stage aus orchestrator.STAGE_FUNCS über run_stage (INGEST liest die geschriebene JSON,
+  Log-Level aus config["log_level"])
+- jede Feature-Funktion aus FEATURE_BENCHMARKS einzeln auf dem WINDOW-Ergebnis
+- Fahrtlängen nach Wahl: Presets "10min" | "1h" | "8h" (synthetic.RIDE_LENGTHS) oder "90s", "30min", ...
+- je Messung das Minimum aus `repeat` Läufen (robust gegen Ausreißer)
+
+Ergebnisse (JSON)
+-----------------
+{"meta": {Umgebung (Versionen, Plattform, CPUs), repeat},
+ "rides": {"10min": {"seconds": 600, "acc_rate": ..., "gyro_rate": ..., "seed": ..., "records": ...,
+                     "stages": {"INGEST": s, ...}, "features": {"acc_rms": s, ...}}}}
+compare_results meldet jede Messung, die langsamer ist als
+baseline * (1 + tolerance) UND mindestens min_delta_s länger dauert (Rauschen kurzer Steps).
+Verglichen werden nur Fahrten mit gleichen Parametern (Länge, Raten, seed).
+
+Aufruf
+------
+    python -m src.untergrund.bench --lengths 10min --baseline benchmarks/baseline.json
+    python -m src.untergrund.bench --lengths 10min 1h 8h --out bench_results.json
+    python -m src.untergrund.bench --lengths 10min --baseline benchmarks/baseline.json --update-baseline
+Exit-Code 1 bei Regressionen.
+
+Hinweise
+--------
+- Die JSON-Dateien werden in --workdir zwischengespeichert (deterministisch, gleicher Name
+  -> gleicher Inhalt). 8h mit 200 Hz sind ~1.5 GB JSON und brauchen mehrere GB RAM.
+- Ingest-Cache, Checkpoints, Sensor-Store, Profiling und Memory-Audit sind abgeschaltet,
+  sonst misst man Cache-Treffer bzw. Messaufwand.
+- Baselines sind maschinenabhängig: nur Ergebnisse derselben Maschine vergleichen.
+- Optionale Pakete, die Stages erst beim Aufruf importieren (scikit-learn in MODEL), werden
+  vor der Messung geladen -> gemessen wird die Arbeit, nicht der einmalige Import.
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+import scipy
+
+from .config import validate_config
+from .context import Ctx, make_ctx
+from .log import get_logger
+from .orchestrator import run_stage
+from .runners.features import (
+    acc_kurtosis,
+    acc_p2p,
+    acc_rms,
+    acc_std,
+    acc_window_features,
+    compute_optimal_exponent,
+    compute_window_velocity,
+    normalize_features_by_velocity,
+    zero_crossing_rate,
+)
+from .stages import Stage
+from .synthetic import parse_ride_length, ride_size, synthetic_sensor_frames, write_synthetic_ride
+
+log = get_logger("bench")
+
+WINDOW_KEY = "cluster"
+
+# Feature-Funktion -> Aufruf auf (Ctx nach WINDOW, Ctx nach Feature-Phase 1)
+FEATURE_BENCHMARKS: dict[str, Callable[[Ctx, Ctx], Any]] = {
+    "compute_window_velocity": lambda w, f: compute_window_velocity(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "acc_window_features": lambda w, f: acc_window_features(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "acc_rms": lambda w, f: acc_rms(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "acc_std": lambda w, f: acc_std(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "acc_p2p": lambda w, f: acc_p2p(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "zero_crossing_rate": lambda w, f: zero_crossing_rate(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "acc_kurtosis": lambda w, f: acc_kurtosis(w.sensors, w.features, window_key=WINDOW_KEY, window_index=_window_index(w)),
+    "compute_optimal_exponent": lambda w, f: compute_optimal_exponent(f, WINDOW_KEY),
+    "normalize_features_by_velocity": lambda w, f: normalize_features_by_velocity(
+        f.sensors, f.features, window_key=WINDOW_KEY, cfg=f.config, feature_columns=["acc_rms", "acc_std", "acc_p2p", "zero_crossing_rate"]
+    ),
+}
+
+
+def _window_index(ctx: Ctx) -> Any:
+    return ctx.artifacts.get("window_index", {}).get(WINDOW_KEY)
+
+
+def bench_config(cfg: dict[str, Any], input_path: str | os.PathLike) -> dict[str, Any]:
+    """Kopie der Config für Messungen: input_path gesetzt, Caches, Export und Mess-Optionen aus."""
+    bench_cfg = copy.deepcopy(cfg)
+    bench_cfg["input_path"] = os.fspath(input_path)
+    bench_cfg["ingest"] = {**bench_cfg.get("ingest", {}), "cache": False}
+    bench_cfg["checkpoint"] = {**bench_cfg.get("checkpoint", {}), "enabled": False}
+    bench_cfg["sensor_store"] = {**bench_cfg.get("sensor_store", {}), "enabled": False}
+    bench_cfg["profile"] = {**bench_cfg.get("profile", {}), "enabled": False}
+    bench_cfg["export"] = {**bench_cfg.get("export", {}), "enabled": False}
+    bench_cfg["memory_audit"] = False
+    return bench_cfg
+
+
+def _timed(fn: Callable[[], Any], *, repeat: int) -> tuple[float, Any]:
+    """Minimum aus repeat Läufen (Sekunden) und das Ergebnis des letzten Laufs; stdout wird verworfen."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def benchmark_ride(
+    cfg: dict[str, Any],
+    length: str | int,
+    *,
+    acc_rate: float = 200.0,
+    gyro_rate: float = 200.0,
+    seed: int = 0,
+    repeat: int = 1,
+    workdir: str | os.PathLike = ".cache/bench",
+) -> dict[str, Any]:
+    """Misst alle Stages und Feature-Funktionen auf einer synthetischen Fahrt."""
+    if repeat < 1:
+        raise ValueError(f"repeat must be >= 1, got {repeat}")
+    seconds = parse_ride_length(length)
+    frames = synthetic_sensor_frames(seconds, acc_rate=acc_rate, gyro_rate=gyro_rate, seed=seed)
+    path = Path(workdir) / f"ride_{seconds}s_{acc_rate:g}hz_{gyro_rate:g}hz_seed{seed}.json"
+    if not path.exists():
+        log.info("Writing synthetic ride %s ...", path)
+        write_synthetic_ride(path.with_suffix(".tmp"), frames).replace(path)
+    size = ride_size(frames)
+    del frames
+
+    _preload_optional_imports()
+    ctx = make_ctx(bench_config(cfg, path))
+    stages: dict[str, float] = {}
+    windowed = None
+    for st in Stage:
+        stages[st.name], ctx = _timed(lambda: run_stage(st, ctx), repeat=repeat)
+        if st is Stage.WINDOW:
+            windowed = ctx
+    if windowed is None:
+        raise ValueError("WINDOW stage did not run.")
+
+    # Feature-Phase 1 als Eingabe für Exponent und Normalisierung
+    phase_1 = compute_window_velocity(windowed.sensors, windowed.features, window_key=WINDOW_KEY, window_index=_window_index(windowed))
+    phase_1 = acc_window_features(windowed.sensors, phase_1, window_key=WINDOW_KEY, window_index=_window_index(windowed))
+    featured = replace(windowed, features=phase_1)
+    features = {name: _timed(lambda: fn(windowed, featured), repeat=repeat)[0] for name, fn in FEATURE_BENCHMARKS.items()}
+
+    return {
+        "seconds": seconds,
+        "acc_rate": acc_rate,
+        "gyro_rate": gyro_rate,
+        "seed": seed,
+        "records": size["records"],
+        "n_windows": len(windowed.features[WINDOW_KEY]),
+        "stages": stages,
+        "features": features,
+    }
+
+
+def _preload_optional_imports() -> None:
+    """Lazy importierte optionale Pakete vorab laden, sonst misst der erste Lauf einer Stage den Import mit."""
+    for module in ("sklearn.cluster", "sklearn.preprocessing"):
+        with contextlib.suppress(ImportError):
+            __import__(module)
+
+
+def _environment() -> dict[str, Any]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(
+    cfg: dict[str, Any],
+    lengths: Sequence[str | int],
+    *,
+    repeat: int = 1,
+    acc_rate: float = 200.0,
+    gyro_rate: float = 200.0,
+    seed: int = 0,
+    workdir: str | os.PathLike = ".cache/bench",
+) -> dict[str, Any]:
+    """Benchmark über mehrere Fahrtlängen (Label = Eingabe, z. B. "10min")."""
+    rides = {}
+    for length in lengths:
+        log.info("Benchmark ride '%s' ...", length)
+        rides[str(length)] = benchmark_ride(
+            cfg, length, acc_rate=acc_rate, gyro_rate=gyro_rate, seed=seed, repeat=repeat, workdir=workdir
+        )
+    return {"meta": {**_environment(), "repeat": repeat}, "rides": rides}
+
+
+# ---------- Vergleich / Report -------------------------------------------
+
+_RIDE_PARAMS = ("seconds", "acc_rate", "gyro_rate", "seed")
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+    min_delta_s: float = 0.01,
+) -> list[dict[str, Any]]:
+    """Regressionen gegenüber baseline (siehe Modul-Docstring), langsamste Verschlechterung zuerst."""
+    regressions = []
+    for label, ride in current["rides"].items():
+        base = baseline.get("rides", {}).get(label)
+        if base is None:
+            continue
+        if any(ride[k] != base.get(k) for k in _RIDE_PARAMS):
+            log.warning("compare_results: ride '%s' has different parameters than the baseline, skipped.", label)
+            continue
+        for group in ("stages", "features"):
+            for name, seconds in ride[group].items():
+                base_s = base.get(group, {}).get(name)
+                if base_s is None:
+                    continue
+                if seconds > base_s * (1 + tolerance) and seconds - base_s >= min_delta_s:
+                    regressions.append({
+                        "ride": label, "group": group, "name": name,
+                        "baseline_s": base_s, "current_s": seconds, "ratio": seconds / base_s if base_s else float("inf"),
+                    })
+    return sorted(regressions, key=lambda r: r["current_s"] - r["baseline_s"], reverse=True)
+
+
+_RATIO_CAP = 9999.0   # größere Verhältnisse (z. B. gegenüber ~0 s) als ">9999" -> Spaltenbreite fest
+
+
+def _format_ratio(seconds: float, base_s: float) -> str:
+    ratio = seconds / base_s if base_s else float("inf")
+    return f"{'>' + format(_RATIO_CAP, '.0f'):>10}" if ratio > _RATIO_CAP else f"{ratio:>10.2f}"
+
+
+def format_bench_report(results: dict[str, Any], baseline: dict[str, Any] | None = None) -> str:
+    """Tabelle je Fahrt; mit baseline zusätzlich Verhältnis current/baseline (gekappt bei >9999)."""
+    lines = []
+    for label, ride in results["rides"].items():
+        base = (baseline or {}).get("rides", {}).get(label, {})
+        lines.append(f"== {label}: {ride['seconds']} s, {ride['records']} records, {ride['n_windows']} windows ==")
+        lines.append(f"  {'':<10}{'name':<34}{'s':>10}{'baseline':>10}{'ratio':>10}")
+        for group in ("stages", "features"):
+            for name, seconds in ride[group].items():
+                base_s = base.get(group, {}).get(name)
+                ref = f"{'-':>10}{'-':>10}" if base_s is None else f"{base_s:>10.3f}{_format_ratio(seconds, base_s)}"
+                lines.append(f"  {group:<10}{name:<34}{seconds:>10.3f}{ref}")
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark all stages and feature functions on synthetic rides.")
+    parser.add_argument("--lengths", nargs="+", default=["10min"], help="Ride lengths, e.g. 10min 1h 8h 90s")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--acc-rate", type=float, default=200.0)
+    parser.add_argument("--gyro-rate", type=float, default=200.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=".cache/bench")
+    parser.add_argument("--out", default=None, help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Compare against stored results")
+    parser.add_argument("--update-baseline", action="store_true", help="Merge the results into --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    validate_config(cfg)
+
+    results = run_benchmarks(
+        cfg, args.lengths, repeat=args.repeat, acc_rate=args.acc_rate, gyro_rate=args.gyro_rate, seed=args.seed, workdir=args.workdir
+    )
+    baseline = None
+    if args.baseline and Path(args.baseline).exists():
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    print(format_bench_report(results, baseline))
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=1), encoding="utf-8")
+
+    if args.update_baseline:
+        if not args.baseline:
+            raise ValueError("--update-baseline requires --baseline")
+        merged = {"meta": results["meta"], "rides": {**(baseline or {}).get("rides", {}), **results["rides"]}}
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.baseline).write_text(json.dumps(merged, indent=1), encoding="utf-8")
+        log.info("Baseline updated: %s", args.baseline)
+        return 0
+
+    if baseline is None:
+        return 0
+    base_repeat = baseline.get("meta", {}).get("repeat")
+    if base_repeat is not None and base_repeat != args.repeat:
+        # min über mehr Läufe blendet Effekte des ersten Aufrufs aus -> nicht vergleichbar
+        log.warning("Baseline was recorded with --repeat %s, this run uses --repeat %s.", base_repeat, args.repeat)
+    regressions = compare_results(results, baseline, tolerance=args.tolerance, min_delta_s=args.min_delta)
+    for r in regressions:
+        log.warning("Regression %s %s/%s: %.3f s -> %.3f s (%.2fx)", r["ride"], r["group"], r["name"], r["baseline_s"], r["current_s"], r["ratio"])
+    if not regressions:
+        log.info("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
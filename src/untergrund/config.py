@@ -7,10 +7,24 @@
 }
 
 _OPTIONAL = {
+    "checkpoint": dict,
+    "ingest": dict,
     "resample_imu": dict,
     "resample_location": dict,
+    "sensor_store": dict,
     "trim_to_common_timeframe": dict,
     "velocity_normalization": dict,
+    "model": dict,
+    "export": dict,
+    "incremental": dict,
+    "streaming": dict,
+    "server": dict,
+    "profile": dict,
+    "parallel_sensors": bool,
+    "fused_imu": bool,
+    "memory_audit": bool,
+    "defensive_copies": bool,
+    "log_level": str,
 }
 
 def validate_config(cfg: dict[str, Any]) -> dict[str, Any]:
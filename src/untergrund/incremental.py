@@ -0,0 +1,147 @@
+# incremental.py
+"""
+Untergrundklassifizierung – Inkrementelle Fenster/Features für angehängte Daten
+
+Zweck
+-----
+Lädt ein Handy eine Fahrt in Teilen hoch (oder wächst eine Live-Session), muss
+nicht die ganze Pipeline erneut über alle Fenster laufen. run_incremental nimmt
+einen bereits bis FEATURES verarbeiteten Ctx und neue Rohdaten (SELECT-Ausgabe)
+und berechnet nur:
+- die Fenster am bisherigen Datenende neu, deren Sensordaten durch Filter-Randeffekte
+  (zero-phase Filter, Padding) beeinflusst waren: end_utc > data_end - warmup_s
+- alle neuen Fenster dahinter, im selben Raster (start + k * hop) mit fortlaufender window_id
+
+PREPROCESS läuft dafür nur über die Rohdaten ab `resume - warmup_s` (Einschwingzeit
+der Filter vor dem ersten neu berechneten Fenster); die Überlappung durch
+window_hop_s < window_duration_s ist darin enthalten, da neu berechnete Fenster
+ab `resume` vollständig in diesem Abschnitt liegen.
+
+Verträge
+--------
+- Aufwand der Sensor-Verarbeitung ~ neue Daten + warmup_s + ein Fenster, nicht ~ Fahrtlänge.
+- Die Raw Features (acc_*, zero_crossing_rate, v) bereits fertiger Fenster bleiben
+  unverändert; der Geschwindigkeits-Exponent und die *_vnorm-Spalten werden über alle
+  Fenster neu bestimmt (reine Fenster-Daten, vernachlässigbar gegenüber den Sensoren).
+- Ergebnis-Ctx: features[window_key] = alle Fenster, sensors = nur der neu verarbeitete
+  Abschnitt; preds[window_key] und artifacts["window_index"][window_key] entfallen (veraltet),
+  ein vorhandenes artifacts["cluster_model"] bleibt (MODEL ordnet dann nur zu).
+- artifacts["incremental"]["raw_start"]: ab hier müssen Rohdaten für das nächste Update
+  vorliegen (ältere Rohdaten dürfen verworfen werden).
+
+Config
+------
+    "incremental": {"warmup_s": 10}
+"""
+
+from dataclasses import replace
+from typing import Any
+
+import pandas as pd
+
+from .context import Ctx
+from .log import get_logger
+from .orchestrator import run_stage
+from .runners.features import compute_raw_features, normalize_raw_features
+from .runners.window import window_frame, window_params
+from .stages import Stage
+
+log = get_logger("incremental")
+
+
+def _warmup(cfg: dict[str, Any]) -> pd.Timedelta:
+    warmup_s = cfg.get("incremental", {}).get("warmup_s", 10)
+    if warmup_s < 0:
+        raise ValueError("incremental.warmup_s must be >= 0")
+    return pd.Timedelta(warmup_s, unit="s")
+
+
+def data_end(ctx: "Ctx", *, window_key: str = "cluster") -> pd.Timestamp:
+    """Ende der bisher verarbeiteten Sensordaten (letztes Update, sonst Sensoren, sonst letztes Fenster)."""
+    if "incremental" in ctx.artifacts:
+        return ctx.artifacts["incremental"]["data_end"]
+    if ctx.sensors:
+        return max(df.index.max() for df in ctx.sensors.values())
+    return ctx.features[window_key]["end_utc"].max()
+
+
+def _resume(windows: pd.DataFrame, end: pd.Timestamp, warmup: pd.Timedelta, hop_s: float) -> tuple[int, pd.Timestamp]:
+    """
+    (Anzahl unveränderter Fenster, Start des ersten neu zu berechnenden Fensters).
+    Unverändert bleiben Fenster mit end_utc <= end - warmup.
+    """
+    if len(windows) == 0:
+        raise ValueError("run_incremental: window DataFrame is empty, run the full pipeline first.")
+    n_keep = int(windows["end_utc"].searchsorted(end - warmup, side="right"))
+    if n_keep == 0:
+        return 0, windows["start_utc"].iloc[0]
+    return n_keep, windows["start_utc"].iloc[n_keep - 1] + pd.Timedelta(hop_s, unit="s")
+
+
+def raw_start(ctx: "Ctx", *, window_key: str = "cluster") -> pd.Timestamp:
+    """Frühester Roh-Zeitstempel, den das nächste Update braucht (resume - warmup_s)."""
+    _, hop_s = window_params(ctx.config)
+    warmup = _warmup(ctx.config)
+    return _resume(ctx.features[window_key], data_end(ctx, window_key=window_key), warmup, hop_s)[1] - warmup
+
+
+def run_incremental(prev: "Ctx", raw_sensors: dict[str, pd.DataFrame], *, window_key: str = "cluster") -> "Ctx":
+    """
+    Hängt Fenster/Features für neue Rohdaten an einen bis FEATURES verarbeiteten Ctx an.
+    - raw_sensors: SELECT-Ausgabe (Spalte "time" in ns) der gewachsenen Fahrt oder nur des
+      neuen Teils, sofern sie ab raw_start(prev) vorliegt; ältere Zeilen werden ignoriert
+    Beispiel:
+        part = run_stage(Stage.SELECT, run_stage(Stage.INGEST, make_ctx({**cfg, "input_path": upload})))
+        ctx = run_incremental(ctx, part.sensors)
+    """
+    cfg = prev.config
+    warmup = _warmup(cfg)
+    duration_s, hop_s = window_params(cfg)
+    if window_key not in prev.features:
+        raise ValueError(f"run_incremental: window_key '{window_key}' not found in features, run the full pipeline first.")
+    windows = prev.features[window_key]
+    n_keep, resume = _resume(windows, data_end(prev, window_key=window_key), warmup, hop_s)
+    cutoff = resume - warmup
+
+    # Rohdaten ab Einschwingbeginn; fehlt davon etwas, sind die ersten neuen Fenster ungenauer
+    tail = {name: df[df["time"] >= cutoff.value] for name, df in raw_sensors.items()}
+    for name, df in tail.items():
+        if len(df) and df["time"].min() > (cutoff + pd.Timedelta(1, unit="s")).value:
+            log.warning("run_incremental: %s beginnt erst %s nach dem Warm-up-Start %s.", name, pd.Timestamp(int(df["time"].min()), tz="UTC") - cutoff, cutoff)
+
+    # PREPROCESS nur über den Abschnitt (Sensor-Store würde die ganze Fahrt überschreiben)
+    seg_cfg = {**cfg, "sensor_store": {**cfg.get("sensor_store", {}), "enabled": False}}
+    seg = run_stage(Stage.PREPROCESS, Ctx(sensors=tail, meta=prev.meta, config=seg_cfg))
+    t_max = max(df.index.max() for df in seg.sensors.values())
+
+    new_windows = window_frame(resume, t_max, duration_s=duration_s, hop_s=hop_s, first_id=n_keep)
+    n_recomputed = len(windows) - n_keep
+    if len(new_windows) <= n_recomputed:
+        log.info("run_incremental: Keine neuen vollständigen Fenster bis %s.", t_max)
+        return prev
+
+    seg = compute_raw_features(replace(seg, features={window_key: new_windows}), window_key)
+    fresh = seg.features[window_key]
+    combined = pd.concat([windows.iloc[:n_keep][list(fresh.columns)], fresh])
+
+    window_index = {k: v for k, v in prev.artifacts.get("window_index", {}).items() if k != window_key}
+    updates = prev.artifacts.get("incremental", {}).get("updates", 0) + 1
+    artifacts = {**prev.artifacts, "window_index": window_index}
+    out = replace(
+        prev,
+        sensors=seg.sensors,
+        features={**prev.features, window_key: combined},
+        preds={k: v for k, v in prev.preds.items() if k != window_key},
+        artifacts=artifacts,
+    )
+    out = normalize_raw_features(out, window_key)
+
+    # Rohdaten-Bedarf des nächsten Updates (gleiche Regel wie oben, neues Datenende)
+    _, next_resume = _resume(combined, t_max, warmup, hop_s)
+    report = {
+        "data_end": t_max, "resume": resume, "raw_start": next_resume - warmup,
+        "kept": n_keep, "recomputed": n_recomputed, "new": len(new_windows) - n_recomputed, "updates": updates,
+    }
+    out = replace(out, artifacts={**out.artifacts, "incremental": report})
+    log.info("run_incremental: %s Fenster behalten, %s neu berechnet, %s angehängt (Daten bis %s).", n_keep, n_recomputed, report["new"], t_max)
+    return out
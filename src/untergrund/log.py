@@ -0,0 +1,114 @@
+# log.py
+"""
+Untergrundklassifizierung – Leveled, lazy Logging
+
+Zweck
+-----
+Ein Logger-Baum "untergrund.<modul>" statt print:
+- Meldungen mit %-Platzhaltern (log.info("... %s", x)) -> unterhalb des Levels wird
+  nichts formatiert
+- Diagnose-Inspektoren (@diagnostic, z. B. shared/inspect.py) laufen in CtxPipeline.tap
+  nur, wenn ihr Level aktiv ist; sonst entfallen Projektion, deepcopy und die
+  describe()/info()-Formatierung komplett
+- Ausgabe wie bisher auf stdout mit Präfix "[Debug]" / "[Info]" / "[Warning]" / "[Error]";
+  der Handler schreibt in das jeweils aktuelle sys.stdout (redirect_stdout in batch.py, capsys)
+
+Level
+-----
+config["log_level"] = "DEBUG" | "INFO" | "WARNING" | "ERROR"
+- ohne Config: INFO (Inspektoren aus)
+- orchestrator.run_stage setzt das Level für die Dauer einer Stage (log_level_from_config)
+- Notebook/Analyse: "DEBUG" (alle Inspektoren), Batch/Produktion: "WARNING"
+"""
+
+import contextlib
+import logging
+import sys
+from typing import Any, Callable, Iterator, TypeVar
+
+ROOT_LOGGER = "untergrund"
+DEFAULT_LEVEL = logging.INFO
+LEVELS: tuple[str, ...] = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_PREFIX = {logging.DEBUG: "Debug", logging.INFO: "Info", logging.WARNING: "Warning", logging.ERROR: "Error", logging.CRITICAL: "Error"}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _PrefixFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return f"[{_PREFIX.get(record.levelno, record.levelname.title())}] {super().format(record)}"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler auf das aktuelle sys.stdout (nicht das beim Anlegen gültige)."""
+
+    @property  # type: ignore[override]
+    def stream(self) -> Any:
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value: Any) -> None:
+        pass
+
+
+def _root() -> logging.Logger:
+    """Root-Logger des Pakets; Handler wird genau einmal installiert (auch bei doppeltem Import)."""
+    logger = logging.getLogger(ROOT_LOGGER)
+    if not any(getattr(h, "_untergrund_stdout", False) for h in logger.handlers):
+        handler = _StdoutHandler()
+        handler._untergrund_stdout = True  # type: ignore[attr-defined]
+        handler.setFormatter(_PrefixFormatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(DEFAULT_LEVEL)
+        logger.propagate = False
+    return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger "untergrund.<name>" (erbt Level und Handler vom Paket-Logger)."""
+    _root()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def parse_level(level: int | str) -> int:
+    """"DEBUG" | "info" | logging.WARNING | ... -> numerisches Level."""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level '{level}' (expected one of {LEVELS}).")
+    return value
+
+
+def is_enabled(level: int | str) -> bool:
+    """True, wenn Meldungen dieses Levels aktuell ausgegeben werden."""
+    return _root().isEnabledFor(parse_level(level))
+
+
+@contextlib.contextmanager
+def log_level(level: int | str | None) -> Iterator[None]:
+    """Setzt das Paket-Level für die Dauer des Blocks (None -> unverändert)."""
+    logger = _root()
+    previous = logger.level
+    if level is not None:
+        logger.setLevel(parse_level(level))
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
+
+
+def log_level_from_config(cfg: dict[str, Any]) -> contextlib.AbstractContextManager[None]:
+    """log_level(cfg["log_level"]) – ohne Eintrag bleibt das aktuelle Level."""
+    return log_level(cfg.get("log_level"))
+
+
+def diagnostic(func: F) -> F:
+    """
+    Markiert einen Inspektor als Diagnose-Ausgabe (Level DEBUG).
+    CtxPipeline.tap überspringt ihn samt Projektion/Kopie, solange DEBUG nicht aktiv ist.
+    Vor inspect_all_sensors anwenden (functools.wraps übernimmt das Attribut).
+    """
+    func.log_level = logging.DEBUG  # type: ignore[attr-defined]
+    return func
@@ -0,0 +1,127 @@
+# memaudit.py
+"""
+Untergrundklassifizierung – Speicher-Audit für CtxPipeline
+
+Zweck
+-----
+Misst pro Pipeline-Step (add und tap), wie viel Speicher er belegt:
+- alloc:   Netto-Allokation (tracemalloc, nach − vor dem Step)
+- peak:    Spitze während des Steps über dem Stand davor (tracemalloc)
+- frames:  Größe aller DataFrames/Series im Ctx nach dem Step (memory_usage, ohne deep)
+- Δframes: Änderung von frames durch den Step
+- ΔmaxRSS: Anstieg des Prozess-Maximums (resource.getrusage; None, wo nicht verfügbar)
+Der Step mit der größten Spitze wird im Report markiert.
+
+Aktivierung: CtxPipeline(memory_audit=True) bzw. config["memory_audit"] = true.
+
+Hinweise
+--------
+- NumPy meldet seine Puffer an tracemalloc, pandas-Daten sind daher enthalten.
+- frames zählt Views wie Kopien (logische Größe); ob ein Step wirklich kopiert,
+  zeigen alloc/peak.
+- tracemalloc verlangsamt Python-Allokationen deutlich -> nur zur Analyse.
+"""
+
+import sys
+import tracemalloc
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+import pandas as pd
+
+try:  # nicht unter Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def frame_bytes(obj: Any) -> int:
+    """Summe der Datenbytes aller DataFrames/Series in obj (dataclass, dict, list/tuple)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=False))
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return sum(frame_bytes(getattr(obj, f.name)) for f in fields(obj))
+    if isinstance(obj, dict):
+        return sum(frame_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(frame_bytes(v) for v in obj)
+    return 0
+
+
+def _max_rss_bytes() -> int | None:
+    """Maximaler Resident Set Size des Prozesses in Bytes (Linux: KiB, macOS: Bytes)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(rss) if sys.platform == "darwin" else int(rss) * 1024
+
+
+class MemoryAudit:
+    """
+    Sammelt Messwerte je Step. Nutzung:
+        with MemoryAudit() as audit:
+            audit.begin(ctx); ctx = step(ctx); audit.end(name, ctx)
+    Startet tracemalloc nur, wenn es noch nicht läuft (und stoppt es dann wieder).
+    """
+
+    def __init__(self) -> None:
+        self.records: list[dict[str, Any]] = []
+        self._owns_tracing = False
+        self._before: tuple[int, int, int | None] = (0, 0, None)
+
+    def __enter__(self) -> "MemoryAudit":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def begin(self, ctx: Any) -> None:
+        frames = frame_bytes(ctx)
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        self._before = (current, frames, _max_rss_bytes())
+
+    def end(self, step_name: str, ctx: Any) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        current0, frames0, rss0 = self._before
+        frames = frame_bytes(ctx)
+        rss = _max_rss_bytes()
+        self.records.append({
+            "step": step_name,
+            "alloc_bytes": current - current0,
+            "peak_bytes": peak - current0,
+            "frames_bytes": frames,
+            "frames_delta_bytes": frames - frames0,
+            "max_rss_delta_bytes": None if rss is None or rss0 is None else rss - rss0,
+        })
+
+
+def dominant_step(records: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Step mit der größten Speicherspitze (peak_bytes)."""
+    return max(records, key=lambda r: r["peak_bytes"]) if records else None
+
+
+def format_memory_report(records: list[dict[str, Any]], *, width: int = 60) -> str:
+    """Tabelle in MB; der Step mit der größten Spitze ist mit '*' markiert."""
+    def mb(v: int | None) -> str:
+        return f"{'-':>9}" if v is None else f"{v / 1e6:>9.1f}"
+
+    top = dominant_step(records)
+    lines = [f"{'':2}{'#':>3}  {'step':<{width}}{'alloc':>9}{'peak':>9}{'frames':>9}{'Δframes':>9}{'ΔmaxRSS':>9}"]
+    for i, r in enumerate(records, start=1):
+        name = r["step"] if len(r["step"]) <= width else r["step"][: width - 1] + "…"
+        mark = "*" if r is top else ""
+        lines.append(
+            f"{mark:<2}{i:>3}  {name:<{width}}{mb(r['alloc_bytes'])}{mb(r['peak_bytes'])}"
+            f"{mb(r['frames_bytes'])}{mb(r['frames_delta_bytes'])}{mb(r['max_rss_delta_bytes'])}"
+        )
+    if top is not None:
+        lines.append(f"* peak dominated by step {records.index(top) + 1:02}: {top['step']} ({top['peak_bytes'] / 1e6:.1f} MB)")
+    return "\n".join(lines)
@@ -0,0 +1,250 @@
+# memo.py
+"""
+Untergrundklassifizierung – Step-Memoization für CtxPipeline
+
+Zweck
+-----
+Optionale Zwischenspeicherung von Step-Ergebnissen innerhalb eines Prozesses
+(z. B. Notebook): wird eine Pipeline mit denselben Eingaben erneut ausgeführt,
+liefern unveränderte Steps ihr Ergebnis aus dem Cache; nur Steps ab der ersten
+Änderung rechnen neu.
+
+Schlüssel = Hash(Funktions-Identität, gebundene kwargs, Selektion, Eingabe-Fingerprints)
+- Funktions-Identität: Modul + qualname + Bytecode der Kernfunktion
+  (bei Decorator-Steps `.core`, bei partial `.func`)
+- Eingabe-Fingerprints: Hash der DataFrame-/Array-Puffer und des Index.
+  Ergebnisse eines Treffers/Misses erhalten einen abgeleiteten Fingerprint,
+  sodass Folge-Steps ihre Eingaben nicht erneut hashen müssen.
+
+Nicht memoisierbar (→ Step läuft normal): Lambdas/lokale Closures ohne `.core`
+(z. B. bridge), Eingaben/kwargs ohne definierten Fingerprint.
+
+Verträge
+--------
+- Steps müssen reine Funktionen sein (Eingaben nicht mutieren); Treffer geben
+  dasselbe Objekt zurück, das beim ersten Lauf erzeugt wurde.
+- Eviction: LRU, begrenzt durch max_entries und max_bytes (geschätzt).
+"""
+
+import hashlib
+import sys
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+
+class _Unfingerprintable(Exception):
+    """Wert hat keinen stabilen Fingerprint → Step wird nicht memoisiert."""
+
+
+# ---------- Fingerprints -------------------------------------------------
+
+def _update_array(h: "hashlib._Hash", arr: np.ndarray) -> None:
+    if arr.dtype == object:
+        h.update(pd.util.hash_pandas_object(pd.Series(arr), index=False).to_numpy().tobytes())
+        return
+    arr = np.ascontiguousarray(arr)
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    h.update(memoryview(arr).cast("B"))
+
+
+def _update_index(h: "hashlib._Hash", index: pd.Index) -> None:
+    h.update(f"{type(index).__name__}:{index.name}:{index.dtype}".encode())
+    if isinstance(index, pd.RangeIndex):
+        h.update(f"{index.start}:{index.stop}:{index.step}".encode())
+    elif isinstance(index, pd.DatetimeIndex):
+        h.update(index.asi8.tobytes())
+    else:
+        _update_array(h, index.to_numpy())
+
+
+def _update(h: "hashlib._Hash", value: Any) -> None:
+    """Rekursiver Fingerprint (nur Datentypen mit eindeutiger Darstellung)."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, pd.DataFrame):
+        h.update(b"DF")
+        _update_index(h, value.index)
+        for col in value.columns:
+            series = value[col]
+            h.update(f"{col!r}:{series.dtype};".encode())
+            _update_array(h, series.to_numpy())
+    elif isinstance(value, pd.Series):
+        h.update(f"S:{value.name!r}:{value.dtype};".encode())
+        _update_index(h, value.index)
+        _update_array(h, value.to_numpy())
+    elif isinstance(value, pd.Index):
+        _update_index(h, value)
+    elif isinstance(value, np.ndarray):
+        _update_array(h, value)
+    elif isinstance(value, np.generic):
+        h.update(f"{value.dtype}:{value!r};".encode())
+    elif isinstance(value, pd.Timestamp | pd.Timedelta):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}{{".encode())
+        for k in sorted(value, key=repr):
+            _update(h, k)
+            _update(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        h.update(f"{type(value).__name__}{len(value)}[".encode())
+        for item in items:
+            _update(h, item)
+        h.update(b"]")
+    elif callable(value):
+        h.update(callable_identity(value).encode())
+    else:
+        raise _Unfingerprintable(type(value).__name__)
+
+
+def fingerprint(value: Any) -> str:
+    """Inhalts-Fingerprint eines Wertes (ValueError, falls nicht möglich)."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        _update(h, value)
+    except _Unfingerprintable as e:
+        raise ValueError(f"No fingerprint for value of type {e}") from e
+    return h.hexdigest()
+
+
+def callable_identity(fn: Callable[..., Any]) -> str:
+    """
+    Stabile Identität eines Steps innerhalb des Prozesses.
+    - partial: Funktion + args/keywords
+    - Decorator-Steps (transform_all_sensors): Kernfunktion + _bound_kwargs + _selection
+    - Lambdas/lokale Funktionen ohne Kernfunktion → _Unfingerprintable
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(fn, partial):
+        h.update(callable_identity(fn.func).encode())
+        _update(h, list(fn.args))
+        _update(h, dict(fn.keywords))
+        return h.hexdigest()
+
+    target = getattr(fn, "_core_func", None) or getattr(fn, "core", None) or fn
+    qualname = getattr(target, "__qualname__", None)
+    code = getattr(target, "__code__", None)
+    if qualname is None or code is None or "<lambda>" in qualname or "<locals>" in qualname:
+        raise _Unfingerprintable(f"callable {getattr(fn, '__name__', fn)!r}")
+    h.update(f"{target.__module__}.{qualname};".encode())
+    h.update(code.co_code)
+    h.update(repr(code.co_consts).encode())
+    _update(h, getattr(fn, "_bound_kwargs", None) or {})
+    _update(h, getattr(fn, "_selection", None))
+    return h.hexdigest()
+
+
+def _estimate_nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# ---------- Cache ------------------------------------------------------------
+
+class StepMemo:
+    """
+    LRU-Cache für Step-Ergebnisse (prozesslokal).
+    - max_entries: maximale Anzahl Einträge
+    - max_bytes:   grobe Obergrenze für den Speicher aller Ergebnisse
+    """
+
+    def __init__(self, *, max_entries: int = 64, max_bytes: int = 1 << 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, str, int]] = OrderedDict()
+        self._known: dict[int, tuple[Any, str]] = {}   # id(Ergebnis) -> (Ergebnis, Fingerprint)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"StepMemo(entries={len(self)}, nbytes={self.nbytes}, hits={self.hits}, misses={self.misses})"
+
+    def fingerprint(self, value: Any) -> str:
+        """Fingerprint einer Eingabe; bekannte Cache-Ergebnisse ohne erneutes Hashen."""
+        known = self._known.get(id(value))
+        if known is not None and known[0] is value:
+            return known[1]
+        return fingerprint(value)
+
+    def call(self, step_identity: str, fn: Callable[..., Any], inputs: list[Any]) -> Any:
+        """Führt fn(*inputs) aus oder liefert das gespeicherte Ergebnis."""
+        try:
+            input_fps = [self.fingerprint(v) for v in inputs]
+        except ValueError:
+            return fn(*inputs)
+        key = hashlib.blake2b("|".join([step_identity, *input_fps]).encode(), digest_size=16).hexdigest()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        result = fn(*inputs)
+        self._store(key, result)
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._known.clear()
+        self.nbytes = 0
+
+    def _store(self, key: str, result: Any) -> None:
+        nbytes = _estimate_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        out_fp = hashlib.blake2b(f"out|{key}".encode(), digest_size=16).hexdigest()
+        self._entries[key] = (result, out_fp, nbytes)
+        self._known[id(result)] = (result, out_fp)
+        self.nbytes += nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (old, _, old_nbytes) = self._entries.popitem(last=False)
+            self._known.pop(id(old), None)
+            self.nbytes -= old_nbytes
+
+
+# Prozessweiter Default (None = aus); CtxPipeline(memo=...) überschreibt pro Pipeline
+_DEFAULT_MEMO: StepMemo | None = None
+
+
+def enable_step_memo(*, max_entries: int = 64, max_bytes: int = 1 << 30) -> StepMemo:
+    """Aktiviert die Step-Memoization für alle CtxPipelines (z. B. im Notebook)."""
+    global _DEFAULT_MEMO
+    _DEFAULT_MEMO = StepMemo(max_entries=max_entries, max_bytes=max_bytes)
+    return _DEFAULT_MEMO
+
+
+def disable_step_memo() -> None:
+    global _DEFAULT_MEMO
+    _DEFAULT_MEMO = None
+
+
+def default_step_memo() -> StepMemo | None:
+    return _DEFAULT_MEMO
+
+
+def step_identity(fn: Callable[..., Any]) -> str | None:
+    """Identität für Memoization oder None, falls der Step nicht memoisierbar ist."""
+    try:
+        return callable_identity(fn)
+    except _Unfingerprintable:
+        return None
@@ -1,5 +1,9 @@
+import time
+from dataclasses import replace
+
 from .stages import Stage
 from .context import Ctx
+from .log import get_logger, log_level_from_config
 from .runners.ingest import run_ingest
 from .runners.select import run_select
 from .runners.preprocess import run_preprocess
@@ -7,6 +11,16 @@
 from .runners.features import run_features
 from .runners.model import run_model
 from .runners.export import run_export
+from .shared.checkpoint import (
+    CHECKPOINT_STAGES,
+    checkpoint_path,
+    has_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+    stage_fingerprints,
+)
+
+log = get_logger("orchestrator")
 
 
 STAGE_FUNCS = {
@@ -19,7 +33,62 @@
     Stage.EXPORT: run_export,
 }
 
-def run_stages(ctx: "Ctx") -> "Ctx":
+# Laufzeit-Reports eines Laufs (nicht aus Checkpoints übernehmen)
+_RUN_REPORT_KEYS = ("stage_timings", "profile", "memory_audit")
+
+
+def run_stage(st: Stage, ctx: "Ctx") -> "Ctx":
+    """
+    Führt eine Stage aus und trägt ihre Laufzeit in artifacts["stage_timings"] ein (Sekunden).
+    Log-Level der Stage: config["log_level"] (siehe log.py).
+    """
+    t0 = time.perf_counter()
+    with log_level_from_config(ctx.config):
+        ctx = STAGE_FUNCS[st](ctx)
+    timings = {**ctx.artifacts.get("stage_timings", {}), st.name: time.perf_counter() - t0}
+    return replace(ctx, artifacts={**ctx.artifacts, "stage_timings": timings})
+
+
+def run_stages(ctx: "Ctx", *, start: Stage = Stage.INGEST) -> "Ctx":
+    """
+    Führt alle Stages ab `start` aus.
+    - start: spätere Stage, wenn ctx bereits deren Eingabe enthält (z. B. SELECT nach
+      runners.ingest.ingested_ctx); Checkpoints nur für komplette Läufe (Fingerprint über die Eingabedatei)
+    """
+    checkpoint_cfg = ctx.config.get("checkpoint", {})
+    if checkpoint_cfg.get("enabled", False) and start is Stage.INGEST:
+        return run_stages_checkpointed(ctx, checkpoint_dir=checkpoint_cfg.get("dir", ".cache/checkpoints"))
     for st in Stage:
-        ctx = STAGE_FUNCS[st](ctx) 
+        if st.value >= start.value:
+            ctx = run_stage(st, ctx)
+    return ctx
+
+
+def run_stages_checkpointed(ctx: "Ctx", *, checkpoint_dir: str) -> "Ctx":
+    """
+    Wie run_stages, aber mit Checkpoints pro Stage (opt-in über config["checkpoint"]).
+    - Fingerprint je Stage: vorheriger Fingerprint + relevante Config-Keys + Code-Hash
+    - Start nach dem spätesten vorhandenen Checkpoint, alle weiteren Stages laufen
+      und schreiben ihren Checkpoint (EXPORT läuft immer)
+    """
+    fps = stage_fingerprints(ctx.config)
+    stages = list(Stage)
+
+    start = 0
+    with log_level_from_config(ctx.config):   # wie run_stage: Level aus der Config auch beim Laden
+        for i in reversed(range(len(stages))):
+            st = stages[i]
+            if st in fps and has_checkpoint(checkpoint_path(checkpoint_dir, st, fps[st])):
+                mmap_mode = "r" if ctx.config.get("sensor_store", {}).get("enabled", False) else None
+                ctx = load_checkpoint(checkpoint_path(checkpoint_dir, st, fps[st]), config=ctx.config, mmap_mode=mmap_mode)
+                # Laufzeiten des gespeicherten Laufs gelten nicht für diesen Lauf
+                ctx = replace(ctx, artifacts={k: v for k, v in ctx.artifacts.items() if k not in _RUN_REPORT_KEYS})
+                log.info("Resuming after %s checkpoint (%s).", st.name, fps[st])
+                start = i + 1
+                break
+
+    for st in stages[start:]:
+        ctx = run_stage(st, ctx)
+        if st in CHECKPOINT_STAGES:
+            save_checkpoint(checkpoint_path(checkpoint_dir, st, fps[st]), ctx)
     return ctx
\ No newline at end of file
@@ -2,11 +2,26 @@
 from typing import Callable, Optional, Any, Sequence
 from inspect import signature, Parameter
 from functools import partial
+import contextlib
 import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+from .log import get_logger, is_enabled, parse_level
+from .memo import StepMemo, default_step_memo, step_identity
+from .memaudit import MemoryAudit, format_memory_report
+from .profiling import Capture, StepProfiler, format_profile_report
+
+log = get_logger("pipeline")
 
 
 # ---------- kleine Utilities (lokal, ohne Decorator-Kopplung) ----------
 
+# kwargs, die im Step-Label nur als "{...}" erscheinen (große Dicts/Arrays)
+_ELIDED_LABEL_KWARGS = {"cfg", "window_index"}
+
 def _defensive_copy_kwargs(kw: dict[str, Any]) -> dict[str, Any]:
     """Shallow-Kopie mutabler kwarg-Werte (best-effort)."""
     safe: dict[str, Any] = {}
@@ -44,6 +59,66 @@ def _validate_kwargs_for_fn(fn: Callable[..., Any], fn_kwargs: dict[str, Any]) -
         )
 
 
+def _declares_copy_kwarg(fn: Callable[..., Any]) -> bool:
+    """
+    View-Sicherheit eines Steps: die Kernfunktion hat einen keyword-only Parameter `copy`
+    (copy=False -> Rückgabe darf Views auf die Eingabe enthalten).
+    """
+    target = getattr(fn, "core", fn)
+    target = getattr(target, "_core_func", target)
+    if isinstance(target, partial):
+        target = target.func
+    try:
+        param = signature(target).parameters.get("copy")
+    except (TypeError, ValueError):
+        return False
+    return param is not None and param.kind is Parameter.KEYWORD_ONLY
+
+
+def _readonly_array(arr: np.ndarray) -> np.ndarray:
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def readonly_view(value: Any) -> Any:
+    """
+    Read-only Projektion für Taps – schützt vor Mutation, ohne die Daten zu kopieren:
+    - DataFrame/Series: neues Objekt auf denselben Spalten-Puffern, NumPy-Arrays mit
+      writeable=False (Schreiben in Werte -> ValueError). Strukturänderungen (neue Spalte,
+      drop/sort inplace) betreffen nur die Projektion. Extension-Spalten (z. B. tz-aware
+      Zeitstempel) werden kopiert.
+    - np.ndarray: read-only View
+    - dict: rekursiv; alles andere: copy.deepcopy (kleine Objekte wie meta/config)
+    """
+    if isinstance(value, pd.DataFrame):
+        columns = {}
+        for i in range(value.shape[1]):
+            col = value.iloc[:, i]
+            columns[i] = _readonly_array(col.to_numpy()) if isinstance(col.dtype, np.dtype) else col.copy()
+        out = pd.DataFrame(columns, index=value.index, copy=False)
+        out.columns = value.columns
+        return out
+    if isinstance(value, pd.Series):
+        if isinstance(value.dtype, np.dtype):
+            return pd.Series(_readonly_array(value.to_numpy()), index=value.index, name=value.name, copy=False)
+        return value.copy()
+    if isinstance(value, np.ndarray):
+        return _readonly_array(value)
+    if isinstance(value, dict):
+        return {k: readonly_view(v) for k, v in value.items()}
+    return copy.deepcopy(value)
+
+
+def readonly_tap(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Markiert einen Inspektor: CtxPipeline.tap projiziert standardmäßig read-only (readonly_view)
+    statt per deepcopy. Vor inspect_all_sensors anwenden (functools.wraps übernimmt das Attribut).
+    """
+    func.tap_readonly = True  # type: ignore[attr-defined]
+    return func
+
+
 def _label_for_callable(f: Callable[..., Any]) -> str:
     """
     Saubere Label-Darstellung:
@@ -60,9 +135,8 @@ def _short(v: Any, maxlen: int = 1000) -> str:
             base = getattr(f, "_base_name")
             kw = getattr(f, "_bound_kwargs", None) or {}
             if kw:
-                if "cfg" in kw.keys():  # Sonderbehandlung für große Config-Dicts
-                    kw = kw.copy()
-                    kw["cfg"] = "{...}"
+                if _ELIDED_LABEL_KWARGS & kw.keys():  # Sonderbehandlung für große Config-Dicts/Index-Maps
+                    kw = {k: ("{...}" if k in _ELIDED_LABEL_KWARGS else v) for k, v in kw.items()}
                 items = [f"{k}={_short(kw[k])}" for k in sorted(kw)]
                 return f"{base}({', '.join(items)})"
             return base
@@ -71,9 +145,8 @@ def _short(v: Any, maxlen: int = 1000) -> str:
             base = getattr(f.func, "__name__", f.func.__class__.__name__)
             kw = getattr(f, "keywords", None) or {}
             if kw:
-                if "cfg" in kw.keys():  # Sonderbehandlung für große Config-Dicts
-                    kw = kw.copy()
-                    kw["cfg"] = "{...}"
+                if _ELIDED_LABEL_KWARGS & kw.keys():  # Sonderbehandlung für große Config-Dicts/Index-Maps
+                    kw = {k: ("{...}" if k in _ELIDED_LABEL_KWARGS else v) for k, v in kw.items()}
                 items = [f"{k}={_short(kw[k])}" for k in sorted(kw)]
                 return f"{base}({', '.join(items)})"
             return base
@@ -127,7 +200,7 @@ class CtxPipeline:
         - name:          Optionaler Anzeigename (repr / Fehlermeldungen).
         - fn_kwargs:     Nur Keyword-Parameter; werden früh validiert/gebunden.
 
-      tap(inspector, *, projector=None, deepcopy=True, name=None)
+      tap(inspector, *, source, name=None, deepcopy=True, readonly=None, level=None)
         - Inspector erhält IMMER ein dict[str, Any]:
             * source=str, value ist dict → direkt durchreichen (flach).
             * source=str, value ist single → {source: value}.
@@ -135,26 +208,135 @@ class CtxPipeline:
                 - dict-Quellen werden in das Ergebnis gemerged,
                 - Single-Quellen unter ihrem Quellnamen hinzugefügt.
         - deepcopy=True: es wird eine tiefe Kopie des gesamten dicts erstellt.
+        - readonly=True: read-only Views statt Kopie (readonly_view); Default: inspector.tap_readonly
+          (@readonly_tap, alle Inspektoren aus shared/inspect.py), sonst False.
+        - level: Tap läuft nur, wenn dieses Log-Level aktiv ist (Default: inspector.log_level,
+          gesetzt von @diagnostic; sonst immer). Abgeschaltet entfallen Projektion und Kopie.
         - Rückgaben des Inspectors werden ignoriert; bei Rückgabe != None erfolgt eine Warnung.
+
+    Memoization (optional, siehe memo.py):
+      CtxPipeline(memo=StepMemo(...)) bzw. prozessweit via memo.enable_step_memo().
+      add-Steps mit stabiler Identität liefern bei gleichen Eingaben das
+      gespeicherte Ergebnis; Taps laufen immer.
+
+    Speicher-Audit (optional, siehe memaudit.py):
+      CtxPipeline(memory_audit=True) misst je Step Allokation und Spitze (tracemalloc)
+      sowie die DataFrame-Größen im Ctx; Report nach dem Lauf in .memory_report
+      (Liste von dicts) und als Tabelle auf stdout.
+
+    Defensive Kopien (optional):
+      CtxPipeline(defensive_copies=False) bindet copy=False an alle Steps, die einen
+      keyword-only Parameter `copy` deklarieren (View-sicher). Deren Ergebnisse dürfen
+      Views auf die Eingabe enthalten – zulässig, weil kein Step Eingaben in-place ändert
+      (Immutability-Vertrag von Ctx). Explizites fn_kwargs["copy"] hat Vorrang.
+
+    Profiling (optional, siehe profiling.py):
+      CtxPipeline(profile=True) misst je Step Wall-/CPU-Zeit, Zeilen in/out und
+      Speicheränderung; profile="cprofile"/"pyinstrument" erfasst zusätzlich ein
+      Profil je Step (Top-N: profile_top, Dateien: profile_dir). Report in .profile_report.
+
+    Stage-Runner: CtxPipeline.from_config(cfg, name="STAGE") liest memory_audit/defensive_copies/profile
+    aus der Config, pipeline.record_reports(ctx) legt die Reports unter name in ctx.artifacts ab.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        memo: Optional[StepMemo] = None,
+        memory_audit: bool = False,
+        defensive_copies: bool = True,
+        profile: bool | Capture = False,
+        profile_top: int = 15,
+        profile_dir: Optional[str | os.PathLike] = None,
+        name: Optional[str] = None,
+    ):
         self.steps: list[Callable[[Any], Any]] = []
         self.taps: dict[str, list] = {}
+        self.memo = memo
+        self.memory_audit = memory_audit
+        self.defensive_copies = defensive_copies
+        self.profile = profile
+        self.profile_top = profile_top
+        self.profile_dir = profile_dir
+        self.name = name
+        self.memory_report: list[dict[str, Any]] = []
+        self.profile_report: list[dict[str, Any]] = []
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any], *, name: Optional[str] = None, **kwargs: Any) -> "CtxPipeline":
+        """
+        Pipeline mit Laufoptionen aus der Config (kwargs haben Vorrang):
+        - memory_audit: bool, defensive_copies: bool
+        - profile: {"enabled": bool, "capture": None | "cprofile" | "pyinstrument", "top": int, "dir": str | None}
+        - name: Report-Key (z. B. Stage-Name), Profil-Dateien unter <profile.dir>/<name>/
+        """
+        profile_cfg = cfg.get("profile", {})
+        profile_dir = profile_cfg.get("dir")
+        options: dict[str, Any] = {
+            "memory_audit": cfg.get("memory_audit", False),
+            "defensive_copies": cfg.get("defensive_copies", True),
+            "profile": (profile_cfg.get("capture") or True) if profile_cfg.get("enabled", False) else False,
+            "profile_top": profile_cfg.get("top", 15),
+            "profile_dir": os.path.join(profile_dir, name) if profile_dir and name else profile_dir,
+            "name": name,
+        }
+        return cls(**{**options, **kwargs})
+
+    def record_reports(self, ctx: Any, key: Optional[str] = None) -> Any:
+        """
+        Legt die Reports des letzten Laufs unter ctx.artifacts["memory_audit"|"profile"][key] ab
+        (Default: name der Pipeline). Mehrere Pipelines mit gleichem key werden angehängt.
+        """
+        key = key or self.name
+        if key is None:
+            raise ValueError("record_reports(...): key fehlt (weder key noch name gesetzt).")
+        updates: dict[str, Any] = {}
+        for field, report in (("memory_audit", self.memory_report), ("profile", self.profile_report)):
+            if report:
+                per_key = dict(ctx.artifacts.get(field, {}))
+                per_key[key] = [*per_key.get(key, []), *report]
+                updates[field] = per_key
+        return replace(ctx, artifacts={**ctx.artifacts, **updates}) if updates else ctx
 
     # ---------- Core execution ----------
 
     def __call__(self, ctx: Any) -> Any:
         if not is_dataclass(ctx):
             raise TypeError("CtxPipeline erwartet ein dataclass-Objekt als ctx.")
+        profiler = None
+        if self.profile:
+            capture = None if self.profile is True else self.profile
+            profiler = StepProfiler(capture=capture, top=self.profile_top, dump_dir=self.profile_dir)
+        with contextlib.ExitStack() as stack:
+            audit = stack.enter_context(MemoryAudit()) if self.memory_audit else None
+            ctx = self._run(ctx, audit, profiler)
+        if audit is not None:
+            self.memory_report = audit.records
+            log.info("Memory audit per step (MB):\n%s", format_memory_report(self.memory_report))
+        if profiler is not None:
+            self.profile_report = profiler.records
+            log.info("Profile per step (MB for memory columns):\n%s", format_profile_report(self.profile_report))
+        return ctx
+
+    def _run(self, ctx: Any, audit: Optional[MemoryAudit], profiler: Optional[StepProfiler]) -> Any:
         for i, f in enumerate(self.steps, start=1):
             step_name = getattr(f, "__name__", repr(f))
+            if audit is not None:
+                audit.begin(ctx)
+            if profiler is not None:
+                profiler.begin(ctx, getattr(f, "_route", None))
             try:
                 ctx = f(ctx)
             except Exception as e:
+                if profiler is not None:
+                    profiler.cancel()
                 raise RuntimeError(f"Pipeline-Fehler in Step {i:02} {step_name}: {e}") from e
             if ctx is None:
                 raise RuntimeError(f"Step {i:02} {step_name} hat nichts zurückgegeben!")
+            if profiler is not None:
+                profiler.end(step_name, ctx)
+            if audit is not None:
+                audit.end(step_name, ctx)
         return ctx
 
     def __repr__(self) -> str:
@@ -182,7 +364,10 @@ def add(
         - fn_kwargs:      Nur Keyword-Parameter; früh validiert/gebunden.
                           Falls `fn.with_kwargs` existiert → wird bevorzugt genutzt.
                           Sonst Fallback via functools.partial(fn, **kw).
+        - defensive_copies=False: View-sichere Steps (keyword-only `copy`) erhalten copy=False.
         """
+        if not self.defensive_copies and "copy" not in (fn_kwargs or {}) and _declares_copy_kwarg(fn):
+            fn_kwargs = {**(fn_kwargs or {}), "copy": False}
         # --- Parametrisierung (ohne Kopplung) ---
         bound_fn = fn
         if fn_kwargs:
@@ -209,6 +394,8 @@ def tap(
         source: str | Sequence[str],
         name: Optional[str] = None,
         deepcopy: bool = True,
+        readonly: Optional[bool] = None,
+        level: Optional[int | str] = None,
     ) -> "CtxPipeline":
         """
         Inspektions-Step (read-only):
@@ -217,15 +404,26 @@ def tap(
             * Dem Inspektor wird IMMER ein dict[str, Any] übergeben.
             * Rückgabewerte des Inspektors werden ignoriert; bei Rückgabe != None erfolgt eine Warnung.
         - deepcopy: True (Standard) => schützt sicher vor versehentlichen Mutationen.
+        - readonly: True => read-only Views ohne Kopie (readonly_view), hat Vorrang vor deepcopy.
+                    Default: inspector.tap_readonly (@readonly_tap) bzw. False.
         - name: optionaler Anzeigename (nur für __repr__/Debug).
+        - level: Log-Level, ab dem der Tap läuft (z. B. "DEBUG"); Default: inspector.log_level
+          (@diagnostic) bzw. None = immer. Ist das Level aus, wird weder projiziert/kopiert
+          noch der Inspektor aufgerufen (zur Laufzeit geprüft).
 
         Gibt den unveränderten Ctx weiter.
         """
         step_name = name or getattr(inspector, "__name__", "tap")
+        if level is None:
+            level = getattr(inspector, "log_level", None)
+        if level is not None:
+            level = parse_level(level)  # unbekanntes Level -> ValueError schon beim Registrieren
+        if readonly is None:
+            readonly = getattr(inspector, "tap_readonly", False)
 
         # Deepcopy Warnung
-        if not deepcopy:
-            print(f"WARNUNG: tap({step_name}, deepcopy=False) – Mutationen am Ctx sind möglich!")
+        if not deepcopy and not readonly:
+            log.warning("tap(%s, deepcopy=False) – Mutationen am Ctx sind möglich!", step_name)
 
         def _project(ctx: Any) -> Any:
             # Einheitlicher Vertrag für Inspektoren: immer dict[str, Any]
@@ -244,10 +442,12 @@ def _project(ctx: Any) -> Any:
                         # Merge: Key wird überschrieben falls schon verhanden! -> Warnung
                         overlap = items.keys() & v.keys()
                         if overlap:
-                            print(f"[Warnung] Doppelte Keys beim Merge aus Quelle '{s}': {sorted(overlap)}")
+                            log.warning("Doppelte Keys beim Merge aus Quelle '%s': %s", s, sorted(overlap))
                         items.update(v)
                     else:
                         items[s] = v
+            if readonly:
+                return readonly_view(items)
             return copy.deepcopy(items) if deepcopy else items
 
 
@@ -264,13 +464,16 @@ def _project(ctx: Any) -> Any:
             # return copy.deepcopy(items) if deepcopy else items
 
         def _tap(ctx: Any) -> Any:
+            if level is not None and not is_enabled(level):
+                return ctx    # Level aus -> keine Projektion/Kopie, kein Inspektor
             view = _project(ctx)
             result = inspector(view)   # Inspektor bekommt IMMER dict[str, Any]
             if result is not None:
-                print(f"[Warnung] Tap-Inspektor {step_name} hat etwas zurückgegeben! Return wird aber ignoriert ;)")
+                log.warning("Tap-Inspektor %s hat etwas zurückgegeben! Return wird aber ignoriert ;)", step_name)
             return ctx        # Ctx bleibt unverändert
 
         _tap.__name__ = f"tap({step_name})"
+        _tap._route = ([source] if isinstance(source, str) else list(source), None)  # type: ignore[attr-defined]
         self.steps.append(_tap)
         return self
 
@@ -312,6 +515,9 @@ def _compile_route(
         label = name or _label_for_callable(fn)
         step_name = f"{left} → {dest}: {label}"
 
+        # Identität für Memoization (None → Step wird nie aus dem Cache bedient)
+        identity = step_identity(fn)
+
         def _apply(ctx: Any) -> Any:
             # Validierung der Felder am realen ctx-Objekt
             if not is_dataclass(ctx):
@@ -325,9 +531,13 @@ def _apply(ctx: Any) -> Any:
 
             # Eingaben aus ctx holen
             inputs = [getattr(ctx, s) for s in sources]
+            memo = self.memo if self.memo is not None else default_step_memo()
             # Aufruf der reinen Funktion
             try:
-                new_value = fn(*inputs) if multi_source else fn(inputs[0])
+                if memo is not None and identity is not None:
+                    new_value = memo.call(identity, fn, inputs)
+                else:
+                    new_value = fn(*inputs) if multi_source else fn(inputs[0])
             except TypeError as e:
                 raise TypeError(f"{step_name}: Signatur passt nicht zu Quellen {sources}: {e}") from e
 
@@ -335,6 +545,7 @@ def _apply(ctx: Any) -> Any:
             return replace(ctx, **{dest: new_value})  # pyright: ignore[reportArgumentType]
 
         _apply.__name__ = step_name
+        _apply._route = (sources, dest)  # type: ignore[attr-defined]
         return _apply
 
 
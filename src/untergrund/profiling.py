@@ -0,0 +1,191 @@
+# profiling.py
+"""
+Untergrundklassifizierung – Step-Profiling für CtxPipeline
+
+Zweck
+-----
+Kosten je Pipeline-Step (add und tap) als strukturierter Report:
+- wall_s / cpu_s:      Laufzeit (perf_counter) und CPU-Zeit des Prozesses (process_time;
+                       mit parallel_sensors inkl. Worker-Threads -> cpu_s > wall_s möglich)
+- rows_in / rows_out:  Zeilen aller DataFrames/Series in den Quell-Feldern vor bzw. im
+                       Ziel-Feld nach dem Step (Taps: rows_out = None)
+- frames_delta_bytes:  Änderung der DataFrame-Größe im Ctx (memory_usage, ohne deep)
+- rss_delta_bytes:     Änderung des aktuellen RSS (Linux /proc/self/statm, sonst None)
+- capture (optional):  "cprofile" -> pstats-Auszug (Top-N nach cumulative),
+                       "pyinstrument" -> Text-Ausgabe (Paket optional, nicht in requirements)
+                       mit dump_dir zusätzlich je Step eine .prof- bzw. .html-Datei
+
+Aktivierung: CtxPipeline(profile=True | "cprofile" | "pyinstrument") bzw.
+config["profile"] = {"enabled": true, "capture": null | "cprofile" | "pyinstrument", "top": 15, "dir": null}.
+Die Stage-Runner legen den Report in ctx.artifacts["profile"][<STAGE>] ab.
+
+Hinweise
+--------
+- cProfile/pyinstrument erfassen nur den aufrufenden Thread (parallel_sensors: Worker fehlen).
+- Zusammen mit memory_audit verfälscht tracemalloc die Laufzeiten.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from pathlib import Path
+from typing import Any, Literal, Sequence
+
+import pandas as pd
+
+from .memaudit import frame_bytes
+
+type Capture = Literal["cprofile", "pyinstrument"]
+
+CAPTURES: tuple[str, ...] = ("cprofile", "pyinstrument")
+
+
+def frame_rows(obj: Any) -> int:
+    """Summe der Zeilen aller DataFrames/Series in obj (auch verschachtelte dicts)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(frame_rows(v) for v in obj.values())
+    return 0
+
+
+def _current_rss_bytes() -> int | None:
+    """Aktueller Resident Set Size in Bytes (nur Linux)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StepProfiler:
+    """
+    Sammelt Messwerte je Step. Nutzung (siehe CtxPipeline._run):
+        profiler.begin(ctx, route); ctx = step(ctx); profiler.end(name, ctx)
+    route = (Quell-Felder, Ziel-Feld | None) des Steps.
+    """
+
+    def __init__(self, *, capture: Capture | None = None, top: int = 15, dump_dir: str | os.PathLike | None = None):
+        if capture is not None and capture not in CAPTURES:
+            raise ValueError(f"Unknown profile capture '{capture}' (expected one of {CAPTURES} or None)")
+        if capture == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as e:
+                raise ValueError("Profile capture 'pyinstrument' requires the pyinstrument package.") from e
+        self.capture = capture
+        self.top = top
+        self.dump_dir = Path(dump_dir) if dump_dir is not None else None
+        self.records: list[dict[str, Any]] = []
+        self._state: dict[str, Any] = {}
+
+    def begin(self, ctx: Any, route: tuple[Sequence[str], str | None] | None) -> None:
+        sources, dest = route if route is not None else ((), None)
+        self._state = {
+            "dest": dest,
+            "rows_in": sum(frame_rows(getattr(ctx, s, None)) for s in sources),
+            "frames": frame_bytes(ctx),
+            "rss": _current_rss_bytes(),
+            "profiler": self._start_capture(),
+        }
+        self._state["wall"] = time.perf_counter()
+        self._state["cpu"] = time.process_time()
+
+    def end(self, step_name: str, ctx: Any) -> None:
+        wall_s = time.perf_counter() - self._state["wall"]
+        cpu_s = time.process_time() - self._state["cpu"]
+        capture = self._stop_capture(self._state["profiler"], step_name)
+        dest = self._state["dest"]
+        rss, rss0 = _current_rss_bytes(), self._state["rss"]
+        record: dict[str, Any] = {
+            "step": step_name,
+            "wall_s": wall_s,
+            "cpu_s": cpu_s,
+            "rows_in": self._state["rows_in"],
+            "rows_out": frame_rows(getattr(ctx, dest, None)) if dest is not None else None,
+            "frames_delta_bytes": frame_bytes(ctx) - self._state["frames"],
+            "rss_delta_bytes": None if rss is None or rss0 is None else rss - rss0,
+        }
+        if capture is not None:
+            record["capture"] = capture
+        self.records.append(record)
+
+    def cancel(self) -> None:
+        """Step abgebrochen (Exception): Profiler stoppen, kein Record."""
+        profiler = self._state.get("profiler")
+        if profiler is not None and self.capture == "cprofile":
+            profiler.disable()
+        elif profiler is not None:
+            profiler.stop()
+        self._state = {}
+
+    # ---------- cProfile / pyinstrument ----------
+
+    def _start_capture(self) -> Any:
+        if self.capture == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.capture == "pyinstrument":
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_capture(self, profiler: Any, step_name: str) -> str | None:
+        if profiler is None:
+            return None
+        if self.capture == "cprofile":
+            profiler.disable()
+        else:
+            profiler.stop()
+        stem = f"{len(self.records) + 1:02}_{re.sub(r'[^A-Za-z0-9_]+', '_', step_name.split(': ')[-1])[:60]}"
+        if self.capture == "cprofile":
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.top)
+            if self.dump_dir is not None:
+                self.dump_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(self.dump_dir / f"{stem}.prof")
+            return stream.getvalue()
+        if self.dump_dir is not None:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            (self.dump_dir / f"{stem}.html").write_text(profiler.output_html(), encoding="utf-8")
+        return profiler.output_text(unicode=True, color=False)
+
+
+# ---------- Auswertung ----------
+
+def format_profile_report(records: list[dict[str, Any]], *, width: int = 60) -> str:
+    """Tabelle je Step; der langsamste Step ist mit '*' markiert."""
+    def mb(v: int | None) -> str:
+        return f"{'-':>9}" if v is None else f"{v / 1e6:>9.1f}"
+
+    def rows(v: int | None) -> str:
+        return f"{'-':>10}" if v is None else f"{v:>10}"
+
+    slowest = max(records, key=lambda r: r["wall_s"]) if records else None
+    lines = [f"{'':2}{'#':>3}  {'step':<{width}}{'wall_s':>9}{'cpu_s':>9}{'rows_in':>10}{'rows_out':>10}{'Δframes':>9}{'ΔRSS':>9}"]
+    for i, r in enumerate(records, start=1):
+        name = r["step"] if len(r["step"]) <= width else r["step"][: width - 1] + "…"
+        mark = "*" if r is slowest else ""
+        lines.append(
+            f"{mark:<2}{i:>3}  {name:<{width}}{r['wall_s']:>9.3f}{r['cpu_s']:>9.3f}{rows(r['rows_in'])}{rows(r['rows_out'])}"
+            f"{mb(r['frames_delta_bytes'])}{mb(r['rss_delta_bytes'])}"
+        )
+    if slowest is not None:
+        total = sum(r["wall_s"] for r in records)
+        lines.append(f"* slowest step {records.index(slowest) + 1:02}: {slowest['step']} ({slowest['wall_s']:.3f} s of {total:.3f} s)")
+    return "\n".join(lines)
+
+
+def profile_hotspots(profile: dict[str, list[dict[str, Any]]], *, top: int = 10, key: str = "wall_s") -> list[dict[str, Any]]:
+    """
+    Teuerste Steps über alle Stages (ctx.artifacts["profile"]), absteigend nach key.
+    Jeder Eintrag enthält zusätzlich "stage".
+    """
+    steps = [{"stage": stage, **record} for stage, records in profile.items() for record in records]
+    return sorted(steps, key=lambda r: r[key], reverse=True)[:top]
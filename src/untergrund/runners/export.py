@@ -1,6 +1,211 @@
 from src.untergrund.context import Ctx
+from ..pipeline import CtxPipeline
+from ..log import get_logger
+from ..shared.checkpoint import code_digest
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+import json
+import os
+import re
+import shutil
+import uuid
+import pandas as pd
+
+log = get_logger("export")
+
+# Dateiformate -> Endung (Feather = Arrow-IPC-Datei, beide brauchen pyarrow)
+EXPORT_FORMATS: dict[str, str] = {"parquet": ".parquet", "feather": ".feather"}
+# Manifeste liegen neben den Tabellen-Datasets; "_"-Präfix -> von pyarrow.dataset ignoriert
+MANIFEST_TABLE = "_manifests"
 
 
 def run_export(ctx: "Ctx") -> "Ctx":
-    print("+++EXPORT+++") # Platzhalter für die Pipeline
-    return ctx
\ No newline at end of file
+    """
+    Schreibt features, preds und meta einer Fahrt spaltenbasiert (Parquet/Feather), je Tabelle
+    ein hive-partitioniertes Dataset, + manifest.json.
+    Opt-in über config["export"]["enabled"]; Layout siehe write_export.
+    """
+    export_cfg = ctx.config.get("export", {})
+    if not export_cfg.get("enabled", False):
+        log.info("Export disabled (config['export']['enabled'] = false).")
+        return ctx
+
+    pipeline = CtxPipeline.from_config(ctx.config, name="EXPORT")
+    pipeline.add(
+        write_export,
+        source=["features", "preds", "meta", "artifacts"],
+        dest="artifacts",
+        fn_kwargs={"cfg": ctx.config, **{k: v for k, v in export_cfg.items() if k != "enabled"}},
+    )
+    return pipeline.record_reports(pipeline(ctx))
+
+
+### Partitionen
+
+def ride_id(cfg: dict[str, Any]) -> str:
+    """Fahrt-ID aus dem Dateinamen der Eingabe (Zeichen außer [A-Za-z0-9._-] -> "_")."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", Path(cfg["input_path"]).stem) or "ride"
+
+
+def ride_date(meta: dict[str, Any], features: dict[str, pd.DataFrame]) -> str:
+    """
+    Datum (UTC, YYYY-MM-DD) der Fahrt:
+    - meta["recording epoch time"] (ms, SensorLogger-Metadaten)
+    - sonst erstes Fenster (start_utc) eines Feature-DataFrames
+    - sonst "unknown"
+    """
+    epoch_ms = meta.get("recording epoch time")
+    if epoch_ms is not None:
+        try:
+            return datetime.fromtimestamp(float(epoch_ms) / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        except (TypeError, ValueError, OverflowError):
+            log.warning("ride_date: Ungültige 'recording epoch time' %r", epoch_ms)
+    for fdf in features.values():
+        if "start_utc" in fdf.columns and len(fdf):
+            return pd.Timestamp(fdf["start_utc"].min()).strftime("%Y-%m-%d")
+    return "unknown"
+
+
+def partition_path(root: str | os.PathLike, table: str, *, date: str, ride: str) -> Path:
+    """
+    Hive-Layout <root>/<table>/date=<date>/ride=<ride>/: ein Dataset je Tabelle, lesbar mit
+    pyarrow.dataset.dataset(<root>/<table>, partitioning="hive") bzw. pd.read_parquet(<root>/<table>).
+    """
+    return Path(root) / table / f"date={date}" / f"ride={ride}"
+
+
+### Schreiben
+
+def _chunks(df: pd.DataFrame, rows: int) -> Iterator[pd.DataFrame]:
+    """Zeilenblöcke als iloc-Slices; mindestens ein (ggf. leerer) Block für das Schema."""
+    for start in range(0, max(len(df), 1), rows):
+        yield df.iloc[start:start + rows]
+
+
+def write_table(path: Path, df: pd.DataFrame, *, format: str = "parquet", compression: str | None = "zstd", row_group_size: int = 65536) -> dict[str, Any]:
+    """
+    Schreibt df blockweise (Streaming): je Block wird nur dieser Slice nach Arrow konvertiert,
+    die komplette Tabelle liegt nie zusätzlich als Arrow-Kopie im Speicher.
+    Gibt den Manifest-Eintrag der Datei zurück.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError(f"Export format '{format}' requires the pyarrow package.") from e
+
+    writer: Any = None
+    schema = None
+    try:
+        for chunk in _chunks(df, row_group_size):
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=True)
+            if writer is None:
+                schema = table.schema
+                if format == "parquet":
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+                else:
+                    writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+            if format == "parquet":
+                writer.write_table(table, row_group_size=row_group_size)
+            else:
+                writer.write_table(table, max_chunksize=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {"file": path.name, "rows": len(df), "columns": [str(c) for c in df.columns], "bytes": path.stat().st_size}
+
+
+def write_export(
+    features: dict[str, pd.DataFrame],
+    preds: dict[str, pd.Series],
+    meta: dict[str, Any],
+    artifacts: dict[str, Any],
+    *,
+    cfg: dict[str, Any],
+    dir: str = "out/export",
+    format: str = "parquet",
+    compression: str | None = "zstd",
+    row_group_size: int = 65536,
+) -> dict[str, Any]:
+    """
+    Reporter: schreibt eine Fahrt als je eine Partition pro Tabelle und ergänzt artifacts
+    um run_id und export (Pfade + Manifest). Layout unter <dir>:
+        features_<key>/date=<YYYY-MM-DD>/ride=<id>/part-0.<ext>   ein Dataset je Fenster-Set
+        preds_<key>/date=.../ride=.../part-0.<ext>                Labels je Fenster (Index = Fenster-Index der Features)
+        meta/date=.../ride=.../part-0.<ext>                       eine Zeile Fahrt-Metadaten
+        _manifests/date=.../ride=.../manifest.json                run_id, Input (Pfad + Hash), Code-Hash, Config, Dateien
+    "_manifests" beginnt mit "_" -> von pyarrow.dataset ignoriert, auch beim Lesen von <dir>.
+    Alles wird zuerst in ein temporäres Verzeichnis geschrieben; danach wird je Tabelle die
+    Partition per os.replace ersetzt, das Manifest zuletzt. Tabellen einer früheren Version
+    der Fahrt, die es nicht mehr gibt (laut altem Manifest), werden entfernt.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}' (expected one of {list(EXPORT_FORMATS)}).")
+    ext = EXPORT_FORMATS[format]
+
+    run_id = artifacts.get("run_id") or f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+    ride, date = ride_id(cfg), ride_date(meta, features)
+    root = Path(dir)
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = root / f"_tmp-{ride}-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    tables: dict[str, pd.DataFrame] = {}
+    for key, fdf in features.items():
+        tables[f"features_{key}"] = fdf
+    for key, labels in preds.items():
+        tables[f"preds_{key}"] = labels.to_frame(name=labels.name or key)
+    if meta:
+        tables["meta"] = pd.DataFrame([meta])
+
+    manifest_dir = partition_path(root, MANIFEST_TABLE, date=date, ride=ride)
+    try:
+        files = []
+        for name, df in tables.items():
+            part = partition_path(tmp, name, date=date, ride=ride)
+            part.mkdir(parents=True)
+            entry = write_table(part / f"part-0{ext}", df, format=format, compression=compression, row_group_size=row_group_size)
+            files.append({**entry, "table": name, "file": (part / entry["file"]).relative_to(tmp).as_posix()})
+        manifest = {
+            "run_id": run_id,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "ride": ride,
+            "date": date,
+            "format": format,
+            "input": artifacts.get("input"),
+            "code_digest": code_digest(),
+            "config": cfg,
+            "files": files,
+        }
+        tmp_manifest = partition_path(tmp, MANIFEST_TABLE, date=date, ride=ride)
+        tmp_manifest.mkdir(parents=True)
+        (tmp_manifest / "manifest.json").write_text(json.dumps(manifest, indent=1, default=str), encoding="utf-8")
+
+        stale = set(_manifest_tables(manifest_dir / "manifest.json")) - set(tables)
+        for name in [*tables, MANIFEST_TABLE]:
+            target = partition_path(root, name, date=date, ride=ride)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(partition_path(tmp, name, date=date, ride=ride), target)
+        for name in stale:
+            shutil.rmtree(partition_path(root, name, date=date, ride=ride), ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    paths = {name: str(partition_path(root, name, date=date, ride=ride)) for name in tables}
+    log.info("Export: %s Tabellen nach %s (run_id=%s)", len(files), root, run_id)
+    return {**artifacts, "run_id": run_id, "export": {"dir": str(root), "tables": paths, "manifest": str(manifest_dir / "manifest.json")}}
+
+
+def _manifest_tables(path: Path) -> list[str]:
+    """Tabellen eines vorhandenen Manifests (leer, wenn keins existiert)."""
+    if not path.exists():
+        return []
+    try:
+        return [f["table"] for f in json.loads(path.read_text(encoding="utf-8")).get("files", []) if "table" in f]
+    except (OSError, ValueError):
+        log.warning("Export: Manifest %s nicht lesbar, alte Tabellen bleiben liegen.", path)
+        return []
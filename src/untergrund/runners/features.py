@@ -1,10 +1,13 @@
 from src.untergrund.context import Ctx
 from untergrund.shared.inspect import start_end, print_description, print_info, head_tail, row_col_nan_dur_freq
 from ..pipeline import CtxPipeline
+from ..log import get_logger
+from ..shared.windows import WindowIndexEntry, resolve_window_bounds, gather_windows, segment_counts, iter_window_chunks
 import pandas as pd
 import numpy as np
-from scipy.stats import kurtosis as scipy_kurtosis
-from typing import Any,cast
+from typing import Any, Sequence, cast
+
+log = get_logger("features")
 
 
 # zwingend als erstes im RUNNER ausführen!
@@ -15,10 +18,10 @@ def select_window_key(ctx: "Ctx", window_key: str="default") -> str:
         raise ValueError("No feature sets available to set as global.")
     if len(windows_dict) == 1:
         key = next(iter(windows_dict))
-        print(f"Only one feature set available. Using the only key: '{key}'")
+        log.info("Only one feature set available. Using the only key: '%s'", key)
         return key
     if window_key in windows_dict:
-        print(f"Multiple feature sets available. Using specified key: '{window_key}'")
+        log.info("Multiple feature sets available. Using specified key: '%s'", window_key)
         return window_key   
     raise ValueError(f"Multiple feature sets available, but specified key '{window_key}' not found in windows.")
 
@@ -64,7 +67,7 @@ def compute_optimal_exponent(
     required_cols = {"v", "v_confidence", feature}
     missing = required_cols - set(fdf.columns)
     if missing:
-        print(f"[Warning] compute_optimal_exponent: Fehlende Spalten {missing}, using fallback={fallback_exponent}")
+        log.warning("compute_optimal_exponent: Fehlende Spalten %s, using fallback=%s", missing, fallback_exponent)
         return fallback_exponent
 
     # Input validierung:
@@ -82,7 +85,7 @@ def compute_optimal_exponent(
     # mindestens x Datenpunkte für robuste Regression -> fallback für kurze testdatensätze
     n_valid = mask.sum()
     if n_valid < 50:  
-        print(f"[Warning] compute_optimal_exponent: Nur {n_valid} Fenster für Kalibrierung (< 50), using fallback={fallback_exponent}")
+        log.warning("compute_optimal_exponent: Nur %s Fenster für Kalibrierung (< 50), using fallback=%s", n_valid, fallback_exponent)
         return fallback_exponent
 
     # Extrahiere Daten
@@ -107,22 +110,22 @@ def compute_optimal_exponent(
         exponent = slope
     except (ValueError, RuntimeError) as e:
         # hier besser raise in production???
-        print(f"[Warning] compute_optimal_exponent: Regression failed ({e}), using fallback={fallback_exponent}")
+        log.warning("compute_optimal_exponent: Regression failed (%s), using fallback=%s", e, fallback_exponent)
         return fallback_exponent
 
     ####### Besser ohne fallback? (man hat sich ja für die nutzung der Funktion entschieden) -> aber auf jeden fall immer Info, und dicke warnug bei schlechtem Score
     # Validierung: R² Score
     if r_squared < min_r_squared:
-        print(f"[Warning] compute_optimal_exponent: Low R²={r_squared:.2f} (< {min_r_squared}), using fallback={fallback_exponent}")
+        log.warning("compute_optimal_exponent: Low R²=%.2f (< %s), using fallback=%s", r_squared, min_r_squared, fallback_exponent)
         return fallback_exponent
 
     # Validierung: Sanity Check (Exponent muss physikalisch plausibel sein)
     if not (1.0 <= exponent <= 3.0):
         original_exponent = exponent
         exponent = np.clip(exponent, 1.0, 3.0)
-        print(f"[Warning] compute_optimal_exponent: Unrealistic exponent={original_exponent:.2f}, clamped to {exponent:.2f}")
+        log.warning("compute_optimal_exponent: Unrealistic exponent=%.2f, clamped to %.2f", original_exponent, exponent)
 
-    print(f"[Info] compute_optimal_exponent: Calibrated exponent={exponent:.2f} (R²={r_squared:.2f}, n_windows={n_valid})")
+    log.info("compute_optimal_exponent: Calibrated exponent=%.2f (R²=%.2f, n_windows=%s)", exponent, r_squared, n_valid)
     return exponent
 
 
@@ -135,32 +138,39 @@ def run_features(ctx: "Ctx") -> "Ctx":
     if not required.issubset(ctx.features[w_key].columns):
         raise ValueError(f"Im Window-DataFrame '{w_key}' müssen {required} Spalten vorhanden sein.")
 
-    # erster Teil
-    pipeline_1 = CtxPipeline()
+    # Fenster->Sample-Offsets aus der WINDOW-Stage (falls vorhanden, sonst rechnen die Funktionen selbst)
+    window_index = ctx.artifacts.get("window_index", {}).get(w_key)
+
+    ctx = compute_raw_features(ctx, w_key, window_index=window_index)
+    return normalize_raw_features(ctx, w_key)
+
+
+def compute_raw_features(ctx: "Ctx", w_key: str, *, window_index: dict[str, WindowIndexEntry] | None = None) -> "Ctx":
+    """Phase 1: Geschwindigkeit + Raw Features je Fenster (braucht die Sensordaten der Fenster)."""
+    pipeline_1 = CtxPipeline.from_config(ctx.config, name="FEATURES")
 
     def add_f1(fn, **kwargs):
         """Phase 1: Add raw feature functions"""
-        pipeline_1.add(fn, source=["sensors","features"], dest="features", fn_kwargs={"window_key": w_key, **kwargs})
+        pipeline_1.add(fn, source=["sensors","features"], dest="features", fn_kwargs={"window_key": w_key, "window_index": window_index, **kwargs})
 
     # 1: Geschwindigkeit aus dem Location Sensor holen und confidence berechnen
     add_f1(compute_window_velocity)
 
-    # 2: Raw Features
-    add_f1(acc_rms)
-    add_f1(acc_std)
-    add_f1(acc_p2p)
-    add_f1(zero_crossing_rate)
-    add_f1(acc_kurtosis)
+    # 2: Raw Features (acc_rms, acc_std, acc_p2p, zero_crossing_rate, acc_kurtosis) in einem Durchlauf
+    add_f1(acc_window_features)
 
     # Pipeline erstmal ausführen, da ich zur Ermittung des Exponenten die Raw Features brauche
-    ctx = pipeline_1(ctx)
+    return pipeline_1.record_reports(pipeline_1(ctx))
 
+
+def normalize_raw_features(ctx: "Ctx", w_key: str) -> "Ctx":
+    """Phase 2: Exponent über alle Fenster kalibrieren, *_vnorm-Spalten bilden (nur Fenster-Daten, keine Sensoren)."""
     # Exonenten ermitteln
     exponent_amp = compute_optimal_exponent(ctx, w_key, feature="acc_rms")
     # Optional: exponent_freq = compute_optimal_exponent(ctx, w_key, feature="zero_crossing_rate") <- sollte nahe "1" sein
 
     # rest in zweiter pipeline
-    pipeline_2 = CtxPipeline()
+    pipeline_2 = CtxPipeline.from_config(ctx.config, name="FEATURES")
 
     def add_f2(fn, **kwargs):
         """Phase 2: Add normalization functions"""
@@ -187,9 +197,8 @@ def add_f2(fn, **kwargs):
     pipeline_2.tap(print_description, source="features")
     pipeline_2.tap(start_end, source="features")
 
-    print("\nFeature-Pipeline Phase 2 Repr:")
-    print(pipeline_2)
-    return pipeline_2(ctx)
+    log.debug("Feature-Pipeline Phase 2 Repr:\n%s", pipeline_2)
+    return pipeline_2.record_reports(pipeline_2(ctx))
 
 
 ### Features: 
@@ -206,7 +215,8 @@ def compute_window_velocity(
     aggregation: str = "median",
     speedacc_scale: float = 5.0,
     penalty_1_point: float = -0.15,
-    penalty_2_points: float = -0.05
+    penalty_2_points: float = -0.05,
+    window_index: dict[str, WindowIndexEntry] | None = None
 ) -> dict[str, pd.DataFrame]:
     """
     Extrahiert Geschwindigkeit aus GPS-Location-Sensor und berechnet einen Confidence-Score.
@@ -233,6 +243,7 @@ def compute_window_velocity(
         speedacc_scale: Skalierungsfaktor für speedAccuracy → confidence
         penalty_1_point: Confidence-Penalty für einzelnen GPS-Punkt
         penalty_2_points: Confidence-Penalty für zwei GPS-Punkte
+        window_index: Fenster->Sample-Offsets aus der WINDOW-Stage (optional)
 
     Returns:
         Features-Dictionary mit aktualisierten Spalten v und v_confidence
@@ -260,120 +271,208 @@ def compute_window_velocity(
     speed_col = cols[0]
     speedacc_col = cols[1]
 
-    v_values = []
-    v_confidence_values = []
-    nan_count = 0
+    # Nur valide GPS-Punkte nutzen (negative Werte = ungültig laut Sensor Logger Doku, NaN fällt ebenfalls raus)
+    speed = location[speed_col].to_numpy(dtype=np.float64)
+    speed_acc = location[speedacc_col].to_numpy(dtype=np.float64)
+    valid = (speed >= 0) & (speed_acc >= 0)
+    values = np.column_stack([np.where(valid, speed, np.nan), np.where(valid, speed_acc, np.nan)])
+
+    # Fenster -> Sample-Offsets (einmalig), valide Punkte je Fenster per kumulativer Summe
+    start, stop = resolve_window_bounds(location, fdf, sensor_name=sensor_name, window_index=window_index)
+    n_points = segment_counts(valid, start, stop)
+    has_data = n_points > 0
+    nan_count = int((~has_data).sum())
+
+    # Geschwindigkeit + mittlere speedAccuracy: Aggregation über valide Punkte (nur Fenster mit Daten)
+    v = np.full(len(fdf), np.nan)
+    mean_speedacc = np.full(len(fdf), np.nan)
+    with_data = np.flatnonzero(has_data)
+    for chunk in iter_window_chunks(stop[with_data] - start[with_data], width=2):
+        sel = with_data[chunk]
+        matrix, _ = gather_windows(values, start[sel], stop[sel])
+        if aggregation == "median":
+            v[sel] = np.nanmedian(matrix[..., 0], axis=1)
+        else:  # aggregation == "mean"
+            v[sel] = np.nanmean(matrix[..., 0], axis=1)
+        mean_speedacc[sel] = np.nanmean(matrix[..., 1], axis=1) # oder besser auch/zusätzlich median???
 
-    for i, row in fdf.iterrows():
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
+    # Confidence berechnen (4 Faktoren)
 
-        # GPS-Punkte im Fenster filtern
-        window_data = location.loc[(location.index >= start_utc) & (location.index < end_utc), cols]
+    # Faktor 2: speedAccuracy (Hauptfaktor, ~80% Gewicht)
+    # -> Hypothese: Sensor kennt seine eigene Unsicherheit am besten
+    confidence_base = np.maximum(1.0 - mean_speedacc / speedacc_scale, 0.0)
 
-        # Nur valide GPS-Punkte nutzen (negative Werte = ungültig laut Sensor Logger Doku)
-        valid_mask = (window_data[speed_col] >= 0) & (window_data[speedacc_col] >= 0)
-        valid_speeds = window_data.loc[valid_mask, speed_col]
-        valid_accs = window_data.loc[valid_mask, speedacc_col]
+    # Faktor 3: GPS-Punktanzahl (Robustheit)
+    # Einzelmessung unsicher -> je mehr GPS Punkte in einem Fenster um so genauer!
+    penalty_points = np.select([n_points == 1, n_points == 2], [penalty_1_point, penalty_2_points], default=0.0)
 
-        # Keine validen GPS-Punkte im Fenster
-        if len(valid_speeds) == 0:
-            v_values.append(np.nan)
-            v_confidence_values.append(np.nan)
-            nan_count += 1
-            continue
+    # Faktor 4: Stabilität (Platzhalter)
+    # TODO nach MVP: Variation der Werte innerhalt eines Fensters (und ggf. Nachbarfenster)
+    # -> Problem: Bei Beschleunigung/Bremsen auch hohe Variation → false positives
+    penalty_stability = 0.0
 
-        # Geschwindigkeit: Aggregation über valide Punkte
-        if aggregation == "median":
-            v = valid_speeds.median()
-        else:  # aggregation == "mean"
-            v = valid_speeds.mean()
-
-        # Confidence berechnen (4 Faktoren)
-
-        # Faktor 1: Min/Max Speed -> Showstopper, physikalisch unrealistische Werte führen zu einer sofortigen confidence von 0
-        if v < min_speed or v > max_speed:
-            v_confidence = 0.0
-            v_values.append(v)
-            v_confidence_values.append(v_confidence)
-            continue
-
-        # Faktor 2: speedAccuracy (Hauptfaktor, ~80% Gewicht)
-        # -> Hypothese: Sensor kennt seine eigene Unsicherheit am besten
-        mean_speedAcc = valid_accs.mean() # oder besser auch/zusätzlich median???
-        confidence_base = max(1.0 - mean_speedAcc / speedacc_scale, 0.0)
-
-        # Faktor 3: GPS-Punktanzahl (Robustheit)
-        # Einzelmessung unsicher -> je mehr GPS Punkte in einem Fenster um so genauer!
-        n_points = len(valid_speeds)
-        if n_points == 1:
-            penalty_points = penalty_1_point
-        elif n_points == 2:
-            penalty_points = penalty_2_points
-        else:
-            penalty_points = 0.0
-
-        # Faktor 4: Stabilität (Platzhalter)
-        # TODO nach MVP: Variation der Werte innerhalt eines Fensters (und ggf. Nachbarfenster)
-        # -> Problem: Bei Beschleunigung/Bremsen auch hohe Variation → false positives
-        penalty_stability = 0.0
-
-        # Aggregation
-        v_confidence = max(
-            confidence_base + penalty_points + penalty_stability,
-            0.0
-        )
+    # Aggregation
+    v_confidence = np.maximum(confidence_base + penalty_points + penalty_stability, 0.0)
 
-        v_values.append(v)
-        v_confidence_values.append(v_confidence)
+    # Faktor 1: Min/Max Speed -> Showstopper, physikalisch unrealistische Werte führen zu einer sofortigen confidence von 0
+    showstopper = has_data & ((v < min_speed) | (v > max_speed))
+    v_confidence[showstopper] = 0.0
+    # Keine validen GPS-Punkte im Fenster
+    v_confidence[~has_data] = np.nan
 
     if nan_count > 0:
-        print(f"[Warning] compute_window_velocity: {nan_count} windows had no valid GPS data.")
+        log.warning("compute_window_velocity: %s windows had no valid GPS data.", nan_count)
 
-    fdf["v"] = v_values
-    fdf["v_confidence"] = v_confidence_values
+    fdf["v"] = v
+    fdf["v_confidence"] = v_confidence
     return {**features, window_key: fdf}
 
 
-def acc_rms(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"]) -> dict[str, pd.DataFrame]:
+### Fenster-Engine für Beschleunigungs-Features
+
+# Alle Statistiken, die die Engine in einem Durchlauf berechnen kann (Spaltenname -> Kurzlabel für Warnungen)
+ACC_WINDOW_STATS: dict[str, str] = {
+    "acc_rms": "RMS",
+    "acc_std": "STD",
+    "acc_p2p": "P2P",
+    "zero_crossing_rate": "ZCR",
+    "acc_kurtosis": "Kurtosis",
+}
+
+
+def acc_window_stats(values: np.ndarray, start: np.ndarray, stop: np.ndarray, *, stats: Sequence[str] = tuple(ACC_WINDOW_STATS)) -> dict[str, np.ndarray]:
     """
-    Berechnet die Magnitude-RMS der Beschleunigung über alle Achsen pro Fenster.
-    - Maß für die mittlere Vibrationsstärke
-    --> Wie Intensiv ist die Vibration?
-    WICHTIG: Stark geschwindigkeitsabhängig
-    - Im idealisierten Modell wächst die Amplitude mit v**n mit n=2
-    - der reale Exponent wird später empirisch ermittelt. (Erwartung: n = 1,2 bis 1,8)
+    Berechnet alle Fenster-Statistiken der Beschleunigung in einem vektorisierten Durchlauf.
+    - values: (samples, achsen) float64, sortiert nach Zeit
+    - start/stop: Sample-Offsets je Fenster (halboffen, siehe shared.windows)
+    - stats: Teilmenge von ACC_WINDOW_STATS
+    Leere Fenster ergeben NaN. Pro-Sample-Größen (Magnitude, Vorzeichenwechsel) werden
+    einmal für die ganze Zeitreihe berechnet, Fenster-Momente blockweise über eine
+    gepolsterte Gather-Matrix (Speicher begrenzt durch iter_window_chunks).
+    """
+    unknown = [s for s in stats if s not in ACC_WINDOW_STATS]
+    if unknown:
+        raise ValueError(f"[acc_window_stats] Unknown stats: {unknown} | allowed: {list(ACC_WINDOW_STATS)}")
+
+    n_windows = len(start)
+    out = {s: np.full(n_windows, np.nan, dtype=np.float64) for s in stats}
+    lengths = stop - start
+    nonempty = np.flatnonzero(lengths > 0)
+    if len(nonempty) == 0:
+        return out
+    n = lengths[nonempty].astype(np.float64)
+
+    # Zero-Crossing-Rate: Vorzeichenwechsel benachbarter Samples zählen (ganzzahlig -> exakt per cumsum)
+    # Paar (k, k+1) gehört zum Fenster, wenn beide Samples drin liegen -> Paare [start, stop-1)
+    if "zero_crossing_rate" in stats:
+        changes = np.diff(np.sign(values), axis=0) != 0
+        s, e = start[nonempty], stop[nonempty]
+        counts = segment_counts(changes, s, e - 1)
+        out["zero_crossing_rate"][nonempty] = np.mean(counts / n[:, None], axis=1)
+
+    # Magnitude sqrt(x² + y² + z²) einmal pro Sample (NaN wie pandas .sum(axis=1) -> 0)
+    need_mag = "acc_std" in stats or "acc_kurtosis" in stats
+    magnitude = np.sqrt(np.nansum(values**2, axis=1)) if need_mag else None
+    need_axes = "acc_rms" in stats or "acc_p2p" in stats
+
+    for chunk in iter_window_chunks(lengths[nonempty], width=values.shape[1] + 1):
+        rows = nonempty[chunk]
+        s, e, nc = start[rows], stop[rows], n[chunk]
+
+        if need_axes:
+            block, _ = gather_windows(values, s, e)  # (fenster, max_len, achsen), Polsterung NaN
+            if "acc_rms" in stats:
+                # RMS über alle Achsen: sqrt(Summe aller Quadrate / Anzahl Samples)
+                out["acc_rms"][rows] = np.sqrt(np.nansum(np.nansum(block**2, axis=1), axis=1) / nc)
+            if "acc_p2p" in stats:
+                # Peak-to-Peak: Maximum - Minimum über alle Achsen
+                out["acc_p2p"][rows] = np.nanmax(block, axis=(1, 2)) - np.nanmin(block, axis=(1, 2))
+
+        if need_mag:
+            mag, mask = gather_windows(cast(np.ndarray, magnitude), s, e, fill=0.0)
+            mean = mag.sum(axis=1) / nc
+            centered = np.where(mask, mag - mean[:, None], 0.0)
+            m2 = (centered**2).sum(axis=1) / nc
+            if "acc_std" in stats:
+                out["acc_std"][rows] = np.sqrt(m2)
+            if "acc_kurtosis" in stats:
+                # Excess-Kurtosis wie scipy.stats.kurtosis(fisher=True, bias=True)
+                m4 = (centered**4).sum(axis=1) / nc
+                with np.errstate(all="ignore"):
+                    zero = m2 <= (np.finfo(np.float64).eps * mean) ** 2
+                    out["acc_kurtosis"][rows] = np.where(zero, np.nan, m4 / m2**2.0) - 3.0
+
+    return out
+
+
+def acc_window_features(
+    sensors: dict[str, pd.DataFrame],
+    features: dict[str, pd.DataFrame],
+    *,
+    window_key: str,
+    sensor_name: str = "Accelerometer",
+    cols: list[str] = ["x", "y", "z"],
+    stats: list[str] | None = None,
+    window_index: dict[str, WindowIndexEntry] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Berechnet die Beschleunigungs-Features (acc_rms, acc_std, acc_p2p, zero_crossing_rate,
+    acc_kurtosis) für alle Fenster in EINEM Durchlauf über die Sensordaten.
+    - Fenster werden einmalig per searchsorted auf Sample-Offsets abgebildet.
+    - stats: Auswahl der Feature-Spalten (default: alle aus ACC_WINDOW_STATS)
+    - window_index: Offsets aus der WINDOW-Stage (artifacts["window_index"][window_key]), optional
+    Die Einzel-Funktionen (acc_rms, ...) sind dünne Selektoren über diese Engine.
     """
+    stats = list(ACC_WINDOW_STATS) if stats is None else stats
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=stats, caller="acc_window_features", window_index=window_index)
+
+
+def _add_acc_window_stats(
+    sensors: dict[str, pd.DataFrame],
+    features: dict[str, pd.DataFrame],
+    *,
+    window_key: str,
+    sensor_name: str,
+    cols: list[str],
+    stats: list[str],
+    caller: str,
+    window_index: dict[str, WindowIndexEntry] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Gemeinsamer Rumpf: Sensor prüfen, Offsets bilden, Engine aufrufen, Spalten anhängen."""
     if sensor_name not in sensors:
         raise ValueError(f"Sensor '{sensor_name}' not found in sensors dict.")
-    
+
     fdf = features[window_key].copy()
     acc = sensors[sensor_name]
 
     missing_cols = [c for c in cols if c not in acc.columns]
     if missing_cols:
-        raise ValueError(f"[acc_rms] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
-    
-    rms_values = []
-    nan_count = 0
-    for i, row in fdf.iterrows(): #ggf. später ohne das "kostbare" iterrows() implementieren
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
-        window_data = acc.loc[(acc.index >= start_utc) & (acc.index < end_utc), cols]
-        if len(window_data) == 0:
-            rms_values.append(np.nan)
-            nan_count += 1
-            continue
-        rms = np.sqrt((window_data**2).sum().sum() / len(window_data))
-        rms_values.append(rms)
-        
-    if nan_count > 0:
-        print(f"[Warning] acc_rms: {nan_count} windows had no data and resulted in NaN RMS values.")    
+        raise ValueError(f"[{caller}] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
+
+    start, stop = resolve_window_bounds(acc, fdf, sensor_name=sensor_name, window_index=window_index)
+    values = acc[cols].to_numpy(dtype=np.float64)
+    results = acc_window_stats(values, start, stop, stats=stats)
 
-    fdf["acc_rms"] = rms_values
+    nan_count = int(np.count_nonzero(stop == start))
+    for stat in stats:
+        if nan_count > 0:
+            log.warning("%s: %s windows had no data and resulted in NaN %s values.", stat, nan_count, ACC_WINDOW_STATS[stat])
+        fdf[stat] = results[stat]
     return {**features, window_key: fdf}
 
-def acc_std(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"]) -> dict[str, pd.DataFrame]:
+
+def acc_rms(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"], window_index: dict[str, WindowIndexEntry] | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Berechnet die Magnitude-RMS der Beschleunigung über alle Achsen pro Fenster.
+    - Maß für die mittlere Vibrationsstärke
+    --> Wie Intensiv ist die Vibration?
+    WICHTIG: Stark geschwindigkeitsabhängig
+    - Im idealisierten Modell wächst die Amplitude mit v**n mit n=2
+    - der reale Exponent wird später empirisch ermittelt. (Erwartung: n = 1,2 bis 1,8)
+    """
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=["acc_rms"], caller="acc_rms", window_index=window_index)
+
+def acc_std(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"], window_index: dict[str, WindowIndexEntry] | None = None) -> dict[str, pd.DataFrame]:
     """
     Standardabweichung der Magnitude (Beschleunigungssenor) über alle Achsen pro Fenster
     - misst die Variabilität der Vibrationsstärke über die Zeit.
@@ -381,42 +480,10 @@ def acc_std(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame],
     - Im idealisierten Modell wächst die Amplitude mit v**n mit n=2
     - der reale Exponent wird später empirisch ermittelt. (Erwartung: n = 1,2 bis 1,8)
     """
-    if sensor_name not in sensors:
-        raise ValueError(f"Sensor '{sensor_name}' not found in sensors dict.")
-
-    fdf = features[window_key].copy()
-    acc = sensors[sensor_name]
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=["acc_std"], caller="acc_std", window_index=window_index)
 
-    missing_cols = [c for c in cols if c not in acc.columns]
-    if missing_cols:
-        raise ValueError(f"[acc_std] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
-
-    std_values = []
-    nan_count = 0
-    for i, row in fdf.iterrows(): #ggf. später ohne das "kostbare" iterrows() implementieren
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
-        window_data = acc.loc[(acc.index >= start_utc) & (acc.index < end_utc), cols]
-        if len(window_data) == 0:
-            std_values.append(np.nan)
-            nan_count += 1
-            continue
-
-        # Magnitude berechnen: sqrt(x² + y² + z²) pro Zeitpunkt
-        magnitude = np.sqrt((window_data[cols]**2).sum(axis=1))
-
-        # Standardabweichung der Magnitude-Zeitreihe
-        std = np.std(magnitude)
-        std_values.append(std)
 
-    if nan_count > 0:
-        print(f"[Warning] acc_std: {nan_count} windows had no data and resulted in NaN STD values.")
-
-    fdf["acc_std"] = std_values
-    return {**features, window_key: fdf}
-
-
-def acc_p2p(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"]) -> dict[str, pd.DataFrame]:
+def acc_p2p(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"], window_index: dict[str, WindowIndexEntry] | None = None) -> dict[str, pd.DataFrame]:
     """
     Größten Peak im Fenster über alle Achsen berechnen (Maximum - Minimum).
     - Gut für Anomalie erkennung und Debugging, weniger für das Clustering
@@ -425,91 +492,23 @@ def acc_p2p(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame],
     - der reale Exponent wird später empirisch ermittelt. (Erwartung: n = 1,2 bis 1,8)
     """
     ### TODO Was ist bei diagonalem Vektor?
-    if sensor_name not in sensors:
-        raise ValueError(f"Sensor '{sensor_name}' not found in sensors dict.")
-
-    fdf = features[window_key].copy()
-    acc = sensors[sensor_name]
-
-    missing_cols = [c for c in cols if c not in acc.columns]
-    if missing_cols:
-        raise ValueError(f"[acc_p2p] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
-
-    p2p_values = []
-    nan_count = 0
-    for i, row in fdf.iterrows(): #ggf. später ohne das "kostbare" iterrows() implementieren
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
-        window_data = acc.loc[(acc.index >= start_utc) & (acc.index < end_utc), cols]
-        if len(window_data) == 0:
-            p2p_values.append(np.nan)
-            nan_count += 1
-            continue
-
-        # Peak-to-Peak: Maximum - Minimum über alle Achsen
-        max_val = window_data.max().max()  # Größter Wert in allen Spalten
-        min_val = window_data.min().min()  # Kleinster Wert in allen Spalten
-        p2p = max_val - min_val
-
-        p2p_values.append(p2p)
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=["acc_p2p"], caller="acc_p2p", window_index=window_index)
 
-    if nan_count > 0:
-        print(f"[Warning] acc_p2p: {nan_count} windows had no data and resulted in NaN P2P values.")
-
-    fdf["acc_p2p"] = p2p_values
-    return {**features, window_key: fdf}
 
-
-def zero_crossing_rate(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"]) -> dict[str, pd.DataFrame]:
+def zero_crossing_rate(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"], window_index: dict[str, WindowIndexEntry] | None = None) -> dict[str, pd.DataFrame]:
     """
     Zero-Crossing-Rate (ZCR) berechnen: mittlere Vorzeichenwechsel-Rate über alle Achsen.
     -> Freqenz der Vibration
+    - ZCR pro Achse (nicht über alle Achsen gemischt!), normalisiert auf Sample-Anzahl,
+      danach Durchschnitt über alle Achsen
 
     WICHTIG: annähernd linear geschwindigkeitsabhängig (v**n mit n=1)
     - auch hier kann der reale Wert leicht abweichen. (Erwartung: n = 1)
     """
-    if sensor_name not in sensors:
-        raise ValueError(f"Sensor '{sensor_name}' not found in sensors dict.")
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=["zero_crossing_rate"], caller="zero_crossing_rate", window_index=window_index)
 
-    fdf = features[window_key].copy()
-    acc = sensors[sensor_name]
 
-    missing_cols = [c for c in cols if c not in acc.columns]
-    if missing_cols:
-        raise ValueError(f"[zero_crossing_rate] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
-
-    zcr_values = []
-    nan_count = 0
-    for i, row in fdf.iterrows():
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
-        window_data = acc.loc[(acc.index >= start_utc) & (acc.index < end_utc), cols]
-        if len(window_data) == 0:
-            zcr_values.append(np.nan)
-            nan_count += 1
-            continue
-
-        # ZCR pro Achse berechnen (nicht über alle Achsen gemischt!)
-        zcr_per_axis = []
-        for col in cols:
-            signal = np.asarray(window_data[col].values)  # Explizit zu numpy array
-            # Vorzeichenwechsel zählen
-            sign_changes = np.sum(np.diff(np.sign(signal)) != 0)
-            zcr = sign_changes / len(signal)  # RATE: normalisiert auf Sample-Anzahl
-            zcr_per_axis.append(zcr)
-
-        # Durchschnitt über alle Achsen → durchschnittliche Frequenz-Charakteristik
-        zcr_mean = np.mean(zcr_per_axis)
-        zcr_values.append(zcr_mean)
-
-    if nan_count > 0:
-        print(f"[Warning] zero_crossing_rate: {nan_count} windows had no data and resulted in NaN ZCR values.")
-
-    fdf["zero_crossing_rate"] = zcr_values
-    return {**features, window_key: fdf}
-
-
-def acc_kurtosis(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"]) -> dict[str, pd.DataFrame]:
+def acc_kurtosis(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], *, window_key: str, sensor_name: str = "Accelerometer", cols: list[str] = ["x", "y", "z"], window_index: dict[str, WindowIndexEntry] | None = None) -> dict[str, pd.DataFrame]:
     """
     Excess-Kurtosis (Kurtosis - 3) der Magnitude über alle Achsen pro Fenster berechnen.
     - Misst die Häufigkeit von Extremwerten in der Vibrationsstärke:
@@ -525,40 +524,7 @@ def acc_kurtosis(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFr
     - in der realität warscheinlich auch leicht v-Abhängig, ich hoffe aber nicht maßgeblich.
     --> kann daher als direkter Feeature genutzt werden
     """
-    if sensor_name not in sensors:
-        raise ValueError(f"Sensor '{sensor_name}' not found in sensors dict.")
-
-    fdf = features[window_key].copy()
-    acc = sensors[sensor_name]
-
-    missing_cols = [c for c in cols if c not in acc.columns]
-    if missing_cols:
-        raise ValueError(f"[acc_kurtosis] Im Sensor '{sensor_name}' fehlen Spalten: {missing_cols}")
-
-    kurt_values = []
-    nan_count = 0
-    for i, row in fdf.iterrows():
-        start_utc = row["start_utc"]
-        end_utc = row["end_utc"]
-        window_data = acc.loc[(acc.index >= start_utc) & (acc.index < end_utc), cols]
-        if len(window_data) == 0:
-            kurt_values.append(np.nan)
-            nan_count += 1
-            continue
-
-        # Magnitude berechnen: sqrt(x² + y² + z²) pro Zeitpunkt
-        magnitude = np.sqrt((window_data[cols]**2).sum(axis=1))
-
-        # Kurtosis der Magnitude-Zeitreihe (Excess: fisher=True)
-        kurt = scipy_kurtosis(magnitude, fisher=True, nan_policy='propagate')
-
-        kurt_values.append(kurt)
-
-    if nan_count > 0:
-        print(f"[Warning] acc_kurtosis: {nan_count} windows had no data and resulted in NaN Kurtosis values.")
-
-    fdf["acc_kurtosis"] = kurt_values
-    return {**features, window_key: fdf}
+    return _add_acc_window_stats(sensors, features, window_key=window_key, sensor_name=sensor_name, cols=cols, stats=["acc_kurtosis"], caller="acc_kurtosis", window_index=window_index)
 
 
 def normalize_features_by_velocity(
@@ -607,7 +573,7 @@ def normalize_features_by_velocity(
         # velocity_exponent wird NICHT aus Config gelesen (Pipeline-Parameter!)
         # feature_columns wird NICHT aus Config gelesen (Pipeline-Parameter!)
     else:
-        print("[Info] normalize_features_by_velocity: No 'velocity_normalization' config found, using default parameters.")
+        log.info("normalize_features_by_velocity: No 'velocity_normalization' config found, using default parameters.")
 
     fdf = features[window_key].copy()
 
@@ -650,21 +616,19 @@ def normalize_features_by_velocity(
 
     # Falls keine Features ausgewählt wurden, keine Normalisierung -> vorzeitiger Return der oroginalen Features
     if feature_columns is None:
-        print(
-            f"[Info] normalize_features_by_velocity: No feature-columns-list provided -> skipping normalization for window_key='{window_key}'"
-        )
+        log.info("normalize_features_by_velocity: No feature-columns-list provided -> skipping normalization for window_key='%s'", window_key)
         return features
     
     # Prüfen, ob alle feature_columns im Feature_DF vorhanden sind
     missing_cols = [c for c in feature_columns if c not in fdf.columns]
     if missing_cols:
-        print(f"[Warning] normalize_features_by_velocity: The following feature_columns were not found in the DataFrame and will be skipped: {missing_cols}")
+        log.warning("normalize_features_by_velocity: The following feature_columns were not found in the DataFrame and will be skipped: %s", missing_cols)
         # feature_columns neu setzen mit nur vorhandenen Features!
         feature_columns = [c for c in feature_columns if c in fdf.columns]
-        print(f"[Info] normalize_features_by_velocity: Updated feature_columns: {feature_columns}. (If empty -> skipping normalization)")
+        log.info("normalize_features_by_velocity: Updated feature_columns: %s. (If empty -> skipping normalization)", feature_columns)
         # keine Feature-columns -> vorzeitiger Return!
         if not feature_columns:
-            print(f"[Info] skipped!")
+            log.info("skipped!")
             return features
 
 
@@ -683,17 +647,14 @@ def normalize_features_by_velocity(
     # Warnings
     low_conf_count = (fdf["v_confidence"] < v_confidence_threshold).sum()
     if low_conf_count > 0:
-        print(
-            f"[Warning] normalize_features_by_velocity: {low_conf_count}/{len(fdf)} windows "
-            f"have confidence < {v_confidence_threshold}. Setting vnorm=NaN for these."
+        log.warning(
+            "normalize_features_by_velocity: %s/%s windows have confidence < %s. Setting vnorm=NaN for these.",
+            low_conf_count, len(fdf), v_confidence_threshold,
         )
 
     nan_v_count = fdf["v"].isna().sum()
     if nan_v_count > 0:
-        print(
-            f"[Warning] normalize_features_by_velocity: {nan_v_count}/{len(fdf)} windows "
-            f"have NaN velocity. vnorm will also be NaN."
-        )
+        log.warning("normalize_features_by_velocity: %s/%s windows have NaN velocity. vnorm will also be NaN.", nan_v_count, len(fdf))
 
     return {**features, window_key: fdf}
 
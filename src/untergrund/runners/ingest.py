@@ -1,28 +1,137 @@
-﻿from typing import Any
+﻿import json
+import re
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterator
 
+import numpy as np
 import pandas as pd
 
 from ..context import Ctx
 from ..pipeline import CtxPipeline, bridge
+from ..log import get_logger
+from ..shared.cache import cache_key, file_digest, has_frames, load_frames, save_frames
+
+log = get_logger("ingest")
 
 
 ### run ingest Pipeline
 
 def run_ingest(ctx: "Ctx") -> "Ctx":
-    sensors_step = bridge(
-        lambda cfg: cfg["input_path"],
-        read_json,
-        build_sensor_dict,
-        name="config->sensors",
-    )
+    ingest_cfg = ctx.config.get("ingest", {})
+    engine = ingest_cfg.get("engine", "pandas")
+    # Projection-Pushdown: nur sensor_list (+ Metadata) einlesen, Rest schon beim Parsen verwerfen
+    sensors = ingest_projection(ctx.config)
+    if engine == "stream":
+        # Streaming: Records direkt in Spaltenpuffer pro Sensor
+        sensors_step = bridge(
+            lambda cfg: cfg["input_path"],
+            partial(
+                read_json_stream,
+                sensor_list=sensors,
+                chunk_size=ingest_cfg.get("chunk_size", 1 << 20),
+                block_size=ingest_cfg.get("block_size", 1 << 16),
+            ),
+            name="config->sensors(stream)",
+        )
+    elif engine == "pandas":
+        sensors_step = bridge(
+            lambda cfg: cfg["input_path"],
+            read_json,
+            partial(filter_sensor_records, sensor_list=sensors),
+            build_sensor_dict,
+            name="config->sensors",
+        )
+    else:
+        raise ValueError(f"Unknown ingest engine '{engine}' (expected 'pandas' or 'stream').")
+
+    if ingest_cfg.get("cache", False):
+        # Inhaltsadressierter Cache: gleicher Input-Hash + gleiche Parameter -> Sensor-Dict direkt laden
+        sensors_step = cached_sensors_step(
+            sensors_step,
+            cache_dir=ingest_cfg.get("cache_dir", ".cache/ingest"),
+            params=ingest_cache_params(ctx.config),
+        )
 
     pipeline = (
-        CtxPipeline()
+        CtxPipeline.from_config(ctx.config, name="INGEST")
         .add(sensors_step, source="config", dest="sensors")
         .add(extract_metadata, source="sensors", dest="meta")
         .add(drop_metadata_sensor, source="sensors")
+        .add(ingest_provenance, source=["config", "artifacts"], dest="artifacts")
+    )
+    return pipeline.record_reports(pipeline(ctx))
+
+
+def ingest_projection(cfg: dict[str, Any]) -> list[str] | None:
+    '''Sensoren, die beim Einlesen behalten werden (Projection-Pushdown).
+       -> cfg["ingest"]["pushdown"] = True: sensor_list + "Metadata"
+       -> sonst None (alle Sensoren, Auswahl erst in SELECT)
+    '''
+    if not cfg.get("ingest", {}).get("pushdown", False):
+        return None
+    return [*dict.fromkeys([*cfg["sensor_list"], "Metadata"])]
+
+
+def ingest_cache_params(cfg: dict[str, Any]) -> dict[str, Any]:
+    '''Parameter, die das Ergebnis des Ingest beeinflussen (Teil des Cache-Schlüssels).
+       -> chunk_size/block_size ändern nur Speicher/Laufzeit, nicht das Ergebnis
+    '''
+    return {
+        "engine": cfg.get("ingest", {}).get("engine", "pandas"),
+        "sensors": ingest_projection(cfg),
+    }
+
+
+def cached_sensors_step(
+    read_step: Callable[[dict[str, Any]], dict[str, pd.DataFrame]],
+    *,
+    cache_dir: str,
+    params: dict[str, Any],
+) -> Callable[[dict[str, Any]], dict[str, pd.DataFrame]]:
+    '''Umhüllt den Ingest-Step (config -> sensors) mit dem Ingest-Cache.
+       -> Schlüssel: Hash der Eingabedatei + ingest_cache_params
+       -> Treffer: Sensor-Dict (inkl. "Metadata") aus dem Frame-Store laden
+       -> sonst: read_step ausführen und Ergebnis ablegen
+    '''
+    def _cached(cfg: dict[str, Any]) -> dict[str, pd.DataFrame]:
+        path = cfg["input_path"]
+        digest = file_digest(path)
+        entry = Path(cache_dir) / cache_key(digest, params)
+        if has_frames(entry):
+            log.info("Ingest cache hit for %s (%s).", path, entry.name)
+            return load_frames(entry)
+        sensors = read_step(cfg)
+        save_frames(entry, sensors, extra={"input_path": str(path), "input_digest": digest, "params": params})
+        log.info("Ingest cache stored for %s (%s).", path, entry.name)
+        return sensors
+
+    _cached.__name__ = f"cached({getattr(read_step, '__name__', 'ingest')})"
+    return _cached
+
+
+def ingest_provenance(cfg: dict[str, Any], artifacts: dict[str, Any]) -> dict[str, Any]:
+    '''Reporter: Input-Pfad + Inhalts-Hash (und ggf. Cache-Schlüssel) nach artifacts["input"].'''
+    path = cfg["input_path"]
+    digest = file_digest(path)
+    info = {"path": str(path), "digest": digest}
+    if cfg.get("ingest", {}).get("cache", False):
+        info["cache_key"] = cache_key(digest, ingest_cache_params(cfg))
+    return {**artifacts, "input": info}
+
+
+def ingested_ctx(cfg: dict[str, Any], sensors: dict[str, pd.DataFrame], *, source: str = "push") -> "Ctx":
+    '''Ctx wie nach INGEST aus einem bereits vorliegenden Sensor-Dict (inkl. "Metadata"),
+       z. B. per HTTP-Push empfangen -> weiter ab SELECT (run_stages(ctx, start=Stage.SELECT)).
+       -> artifacts["input"]: input_path als Fahrt-Kennung, kein Datei-Hash
+       -> sensor_store aus: dessen Pfad/Fingerprint hängt am Hash der Eingabedatei
+    '''
+    return Ctx(
+        sensors=drop_metadata_sensor(sensors),
+        meta=extract_metadata(sensors),
+        config={**cfg, "sensor_store": {**cfg.get("sensor_store", {}), "enabled": False}},
+        artifacts={"input": {"path": str(cfg["input_path"]), "digest": None, "source": source}},
     )
-    return pipeline(ctx)
 
 
 ### JSON --> DF
@@ -34,10 +143,245 @@ def read_json(path) -> pd.DataFrame:
     except Exception:
         raise RuntimeError(f"JSON kann nicht eingelesen werden ({path})")
     if "sensor" not in df.columns:
-        print("keine Sensoren im DF")
+        log.warning("keine Sensoren im DF")
     return df
 
 
+def filter_sensor_records(df: pd.DataFrame, *, sensor_list: Collection[str] | None = None) -> pd.DataFrame:
+    '''Behält nur Zeilen der Sensoren aus sensor_list (None = alle).
+       -> pandas-Engine: vor groupby, damit nicht benötigte Sensoren nicht gesplittet/kopiert werden
+    '''
+    if sensor_list is None or "sensor" not in df.columns:
+        return df
+    return df[df["sensor"].isin(list(sensor_list))]
+
+
+### JSON (Stream) --> Dict[Sensor, DF]
+
+# Spalten, die als int64 geparst werden (ns-Zeitstempel verlieren als float64 Präzision)
+_INT64_COLUMNS = frozenset({"time"})
+
+# SensorLogger-Record mit führendem "sensor"-Key (Name ohne Escapes) bzw. flaches Objekt bis "}"
+_SENSOR_PREFIX_RE = re.compile(r'\{\s*"sensor"\s*:\s*"([^"\\]*)"')
+_FLAT_OBJECT_RE = re.compile(r'\{(?:[^{}\[\]"]++|"(?:[^"\\]++|\\.)*+")*+\}')
+
+
+def iter_json_array(path, *, chunk_size: int = 1 << 20, keep_sensors: Collection[str] | None = None) -> Iterator[Any]:
+    '''Liest ein JSON-Top-Level-Array inkrementell und liefert die Elemente einzeln.
+       -> Datei wird blockweise (chunk_size Zeichen) gelesen, nie komplett im Speicher
+       -> jedes Element wird per json.JSONDecoder.raw_decode dekodiert
+       -> keep_sensors: flache Records, deren erster Key "sensor" nicht enthalten ist,
+          werden per Regex übersprungen, ohne dekodiert zu werden (Projection-Pushdown)
+    '''
+    keep = None if keep_sensors is None else set(keep_sensors)
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as f:
+        buf = f.read(chunk_size)
+        pos = 0
+        eof = len(buf) < chunk_size
+
+        def skip_ws(pos: int) -> int:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            return pos
+
+        def refill(pos: int) -> tuple[str, int, bool]:
+            more = f.read(chunk_size)
+            return buf[pos:] + more, 0, len(more) < chunk_size
+
+        # öffnende Klammer
+        pos = skip_ws(pos)
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"JSON must be a top-level array ({path})")
+        pos += 1
+
+        expect_value = True  # erstes Element oder nach ","
+        first = True
+        while True:
+            pos = skip_ws(pos)
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"Unexpected end of JSON array ({path})")
+                buf, pos, eof = refill(pos)
+                continue
+            ch = buf[pos]
+            if ch == "]" and (first or not expect_value):
+                return
+            if ch == "," and not expect_value:
+                expect_value = True
+                pos += 1
+                continue
+            if not expect_value:
+                raise ValueError(f"Expected ',' or ']' at offset {pos} ({path})")
+            if keep is not None:
+                prefix = _SENSOR_PREFIX_RE.match(buf, pos)
+                if prefix is not None and prefix.group(1) not in keep:
+                    record = _FLAT_OBJECT_RE.match(buf, pos)
+                    if record is not None:
+                        pos = record.end()
+                        expect_value = False
+                        first = False
+                        continue
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                buf, pos, eof = refill(pos)
+                continue
+            if end == len(buf) and not eof:
+                # Zahl/Literal könnte am Blockende abgeschnitten sein -> nachladen und neu dekodieren
+                buf, pos, eof = refill(pos)
+                continue
+            yield item
+            pos = end
+            expect_value = False
+            first = False
+
+
+def _typed_column(name: str, values: list[Any]) -> np.ndarray:
+    '''Rohwerte (str/Zahl/None) -> int64 (nur ns-Zeitspalten), float64 oder object.'''
+    if name in _INT64_COLUMNS:
+        try:
+            return np.array(values, dtype=np.int64)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+class _SensorColumns:
+    '''Spaltenpuffer eines Sensors.
+       -> Rohwerte werden pro Spalte gesammelt und alle block_size Records
+          in typisierte NumPy-Arrays umgewandelt (keine Python-Objekte pro Wert)
+       -> fehlende Keys werden mit None (-> NaN) aufgefüllt
+    '''
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self.pending: dict[str, list[Any]] = {}
+        self.n_pending = 0
+        self.blocks: dict[str, list[tuple[int, np.ndarray]]] = {}
+        self.n_rows = 0
+
+    def append(self, record: dict[str, Any]) -> None:
+        pending = self.pending
+        for key, value in record.items():
+            col = pending.get(key)
+            if col is None:
+                col = pending[key] = [None] * self.n_pending
+            col.append(value)
+        self.n_pending += 1
+        if len(record) < len(pending):
+            for col in pending.values():
+                if len(col) < self.n_pending:
+                    col.append(None)
+        if self.n_pending >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.n_pending == 0:
+            return
+        for key, values in self.pending.items():
+            self.blocks.setdefault(key, []).append((self.n_rows, _typed_column(key, values)))
+        self.n_rows += self.n_pending
+        self.pending = {key: [] for key in self.pending}
+        self.n_pending = 0
+
+    def to_columns(self) -> dict[str, np.ndarray]:
+        self.flush()
+        columns = {}
+        for key, blocks in self.blocks.items():
+            arrays = [arr for _, arr in blocks]
+            if blocks[0][0] == 0:
+                col = np.concatenate(arrays) if len(arrays) > 1 else arrays[0]
+            else:
+                # Spalte taucht erst später auf -> vorne mit NaN/None auffüllen
+                numeric = all(arr.dtype != object for arr in arrays)
+                col = np.full(self.n_rows, np.nan) if numeric else np.full(self.n_rows, None, dtype=object)
+                for offset, arr in blocks:
+                    col[offset:offset + len(arr)] = arr
+            if col.dtype == object and not any(v is not None for v in col):
+                continue  # nur None -> wie dropna(how="all")
+            if col.dtype == np.float64 and np.isnan(col).all():
+                continue
+            columns[key] = col
+        return columns
+
+
+class SensorBuffers:
+    '''Verteilt SensorLogger-Records auf Spaltenpuffer pro Sensor (read_json_stream, HTTP-Push).
+       -> append() nimmt Records einzeln an (auch über mehrere Pushes verteilt); der Key
+          "sensor" wird dabei aus dem Record entfernt (keine Kopie je Record)
+       -> keep: nur diese Sensoren puffern, Rest verwerfen (None = alle)
+       -> to_frames() ergibt die Form von build_sensor_dict: Spalte "sensor",
+          RangeIndex, reine NaN-Spalten entfernt, Spaltenreihenfolge wie beim ersten Auftreten
+    '''
+
+    def __init__(self, *, block_size: int = 1 << 16, keep: Collection[str] | None = None):
+        self.block_size = block_size
+        self.keep = None if keep is None else set(keep)
+        self.buffers: dict[str, _SensorColumns] = {}
+        self.column_order: dict[str, None] = {"sensor": None}
+        self.n_records = 0
+
+    def append(self, record: Any) -> None:
+        if not isinstance(record, dict) or "sensor" not in record:
+            return
+        sensor = str(record.pop("sensor"))
+        if self.keep is not None and sensor not in self.keep:
+            return  # Records mit "sensor" nicht als erstem Key
+        buffer = self.buffers.get(sensor)
+        if buffer is None:
+            buffer = self.buffers[sensor] = _SensorColumns(self.block_size)
+        n_cols = len(buffer.pending)
+        buffer.append(record)
+        self.n_records += 1
+        if len(buffer.pending) > n_cols:  # neue Spalte -> globale Reihenfolge wie pd.read_json
+            self.column_order.update(dict.fromkeys(record))
+
+    def to_frames(self) -> dict[str, pd.DataFrame]:
+        sensor_dfs = {}
+        for sensor in sorted(self.buffers):
+            buffer = self.buffers[sensor]
+            columns = buffer.to_columns()
+            data = {"sensor": np.full(buffer.n_rows, sensor, dtype=object)}
+            data.update((key, columns[key]) for key in self.column_order if key in columns)
+            sensor_dfs[sensor] = pd.DataFrame(data)
+        return sensor_dfs
+
+
+def read_json_stream(
+    path,
+    *,
+    sensor_list: Collection[str] | None = None,
+    chunk_size: int = 1 << 20,
+    block_size: int = 1 << 16,
+) -> dict[str, pd.DataFrame]:
+    '''Streaming-Ingest einer SensorLogger-JSON direkt in ein Sensor-Dict.
+       -> kein kombiniertes (breites, object-dtype) DataFrame wie bei read_json
+       -> Records werden beim Parsen auf Spaltenpuffer pro Sensor verteilt (SensorBuffers)
+       -> sensor_list: nur diese Sensoren (+ "Metadata") werden dekodiert/gepuffert, Rest beim Parsen übersprungen
+       Ergebnis entspricht build_sensor_dict(read_json(path)): Spalte "sensor",
+       RangeIndex, reine NaN-Spalten entfernt, Spaltenreihenfolge wie in der Datei.
+       Unterschied: "time" ist int64 (ns, verlustfrei) statt float64.
+    '''
+    keep = None if sensor_list is None else {*sensor_list, "Metadata"}
+    buffers = SensorBuffers(block_size=block_size, keep=keep)
+    try:
+        for record in iter_json_array(path, chunk_size=chunk_size, keep_sensors=keep):
+            buffers.append(record)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"JSON kann nicht eingelesen werden ({path})") from e
+
+    if not buffers.buffers:
+        log.warning("keine Sensoren im DF")
+    log.info("Streaming ingest: %s (pushdown: %s)", sorted(buffers.buffers), sorted(keep) if keep is not None else 'off')
+    return buffers.to_frames()
+
+
 ### DF --> Dict[Sensor, DF]
 
 def build_sensor_dict(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
@@ -63,7 +407,7 @@ def extract_metadata(sensor_dfs: dict[str, pd.DataFrame]) -> dict[str, Any]:
     if "Metadata" in sensor_dfs:
         meta = sensor_dfs["Metadata"].iloc[0].to_dict()
     else:
-        print("keine Metadaten vorhanden!?")
+        log.warning("keine Metadaten vorhanden!?")
     return meta
 
 
@@ -1,6 +1,241 @@
 from src.untergrund.context import Ctx
+from ..pipeline import CtxPipeline
+from ..log import get_logger
+from .features import select_window_key
+from dataclasses import replace
+from typing import Any, Callable, Iterable, Iterator, Sequence
+import numpy as np
+import pandas as pd
+
+log = get_logger("model")
+
+# Modell-Eintrag (klein, picklebar -> artifacts/Checkpoint):
+# {"columns": [...], "mean": f32[d], "scale": f32[d], "centers": f32[k, d],
+#  "algorithm": str, "n_samples": int, "inertia": float | None}
+type ClusterModel = dict[str, Any]
+
+# Spalten außer *_vnorm, die immer ins Clustering gehen (geschwindigkeitsunabhängig)
+_EXTRA_COLUMNS: tuple[str, ...] = ("acc_kurtosis",)
 
 
 def run_model(ctx: "Ctx") -> "Ctx":
-    print("+++LOCAL_CLUSTERING+++") # Platzhalter für die Pipeline
-    return ctx
\ No newline at end of file
+    """
+    K-Means über die Fenster-Features einer Fahrt -> ctx.preds[window_key].
+    - liegt bereits ein Modell in ctx.artifacts["cluster_model"] (z. B. saisonweit per
+      fit_cluster_model trainiert), werden die Fenster nur zugeordnet
+    - sonst Fit auf dieser Fahrt (KMeans bzw. MiniBatchKMeans, siehe fit_ride_model)
+    """
+    w_key = select_window_key(ctx, "cluster")
+    model_cfg = ctx.config.get("model", {})
+
+    model = ctx.artifacts.get("cluster_model")
+    if model is None:
+        model = fit_ride_model(ctx.features[w_key], **model_cfg)
+        if model is None:
+            return ctx
+        ctx = replace(ctx, artifacts={**ctx.artifacts, "cluster_model": model})
+    else:
+        log.info("run_model: Verwende vorhandenes Modell (%s Cluster, %s Samples)", len(model["centers"]), model["n_samples"])
+
+    pipeline = CtxPipeline.from_config(ctx.config, name="MODEL")
+    pipeline.add(assign_clusters, source=["features", "preds"], dest="preds", fn_kwargs={"window_key": w_key, "model": model})
+    log.debug("Model-Pipeline Repr:\n%s", pipeline)
+    return pipeline.record_reports(pipeline(ctx))
+
+
+### Feature-Matrix
+
+def select_model_columns(fdf: pd.DataFrame, columns: Sequence[str] | None = None) -> list[str]:
+    """
+    Spalten für das Clustering: explizit `columns`, sonst alle *_vnorm-Spalten + acc_kurtosis.
+    Rohe Amplituden-Features (acc_rms, ...) bleiben außen vor, da sie mit v skalieren.
+    """
+    if columns is not None:
+        missing = [c for c in columns if c not in fdf.columns]
+        if missing:
+            raise ValueError(f"select_model_columns: Spalten {missing} fehlen im Feature-DataFrame.")
+        return list(columns)
+    selected = [c for c in fdf.columns if c.endswith("_vnorm")] + [c for c in _EXTRA_COLUMNS if c in fdf.columns]
+    if not selected:
+        raise ValueError("select_model_columns: Keine *_vnorm- oder Kurtosis-Spalten gefunden (FEATURES gelaufen?).")
+    return selected
+
+
+def feature_matrix(fdf: pd.DataFrame, columns: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    float32-Matrix (n_valid x d) + boolesche Maske der gültigen Fenster (ohne NaN/inf).
+    float32 halbiert den Speicher gegenüber float64; scikit-learn rechnet durchgängig in float32.
+    """
+    X = fdf[list(columns)].to_numpy(dtype=np.float32)
+    valid = np.isfinite(X).all(axis=1)
+    return X[valid], valid
+
+
+def _standardize(X: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    return (X - mean) / scale
+
+
+def _safe_scale(std: np.ndarray) -> np.ndarray:
+    # konstante Spalten nicht durch 0 teilen
+    return np.where(std > 0, std, 1.0).astype(np.float32)
+
+
+### Fit: eine Fahrt
+
+def fit_ride_model(
+    fdf: pd.DataFrame,
+    *,
+    n_clusters: int = 4,
+    algorithm: str = "auto",
+    minibatch_threshold: int = 100_000,
+    batch_size: int = 4096,
+    seed: int = 0,
+    n_init: int = 3,
+    max_iter: int = 300,
+    columns: Sequence[str] | None = None,
+) -> ClusterModel | None:
+    """
+    Fit auf den Fenstern einer Fahrt (z-standardisiert, k-means++, fester Seed -> deterministisch).
+    - algorithm: "kmeans" | "minibatch" | "auto" (MiniBatchKMeans ab `minibatch_threshold` Fenstern)
+    Gibt None zurück (mit Warnung), wenn weniger gültige Fenster als Cluster vorliegen.
+    """
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if algorithm not in ("auto", "kmeans", "minibatch"):
+        raise ValueError(f"fit_ride_model: Unbekannter algorithm '{algorithm}' (erwartet 'auto', 'kmeans' oder 'minibatch').")
+
+    cols = select_model_columns(fdf, columns)
+    X, valid = feature_matrix(fdf, cols)
+    if len(X) < n_clusters:
+        log.warning("fit_ride_model: Nur %s gültige Fenster für %s Cluster -> kein Clustering", len(X), n_clusters)
+        return None
+
+    mean = X.mean(axis=0)
+    scale = _safe_scale(X.std(axis=0))
+    Z = _standardize(X, mean, scale)
+
+    if algorithm == "auto":
+        algorithm = "minibatch" if len(Z) >= minibatch_threshold else "kmeans"
+    if algorithm == "minibatch":
+        km = MiniBatchKMeans(n_clusters=n_clusters, init="k-means++", batch_size=batch_size, n_init=n_init, max_iter=max_iter, random_state=seed)
+    else:
+        km = KMeans(n_clusters=n_clusters, init="k-means++", n_init=n_init, max_iter=max_iter, random_state=seed)
+    km.fit(Z)
+
+    log.info("fit_ride_model: %s Cluster über %s/%s Fenster, Spalten=%s (%s)", n_clusters, len(Z), len(valid), cols, algorithm)
+    return {
+        "columns": cols,
+        "mean": mean,
+        "scale": scale,
+        "centers": km.cluster_centers_.astype(np.float32),
+        "algorithm": algorithm,
+        "n_samples": int(len(Z)),
+        "inertia": float(km.inertia_),
+    }
+
+
+### Fit: viele Fahrten (inkrementell)
+
+def _iter_batches(frames: Iterable[pd.DataFrame], columns: Sequence[str], batch_size: int) -> Iterator[np.ndarray]:
+    """Gültige Zeilen aller Frames als float32-Blöcke mit genau `batch_size` Zeilen (Rest am Ende)."""
+    pending: list[np.ndarray] = []
+    n_pending = 0
+    for fdf in frames:
+        X, _ = feature_matrix(fdf, columns)
+        if len(X) == 0:
+            continue
+        pending.append(X)
+        n_pending += len(X)
+        while n_pending >= batch_size:
+            block = np.concatenate(pending)
+            yield block[:batch_size]
+            rest = block[batch_size:]
+            pending, n_pending = ([rest] if len(rest) else []), len(rest)
+    if n_pending:
+        yield np.concatenate(pending)
+
+
+def fit_cluster_model(
+    frames: Callable[[], Iterable[pd.DataFrame]],
+    *,
+    n_clusters: int = 4,
+    batch_size: int = 4096,
+    seed: int = 0,
+    n_epochs: int = 1,
+    columns: Sequence[str] | None = None,
+) -> ClusterModel:
+    """
+    Saisonweiter Fit über viele Fahrten, ohne alle Fenster gleichzeitig zu laden.
+    - frames: Callable, das bei jedem Aufruf einen frischen Iterator über Feature-DataFrames
+      liefert (z. B. Generator über exportierte Fahrten) – wird 1 + n_epochs mal durchlaufen
+    - Durchlauf 1: Mittelwert/Streuung je Spalte (StandardScaler.partial_fit)
+    - danach: MiniBatchKMeans.partial_fit je Block; k-means++ auf dem ersten Block, fester Seed
+    Speicher: O(batch_size x d) statt O(alle Fenster x d).
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.preprocessing import StandardScaler
+
+    cols: list[str] | None = list(columns) if columns is not None else None
+    scaler = StandardScaler()
+    for fdf in frames():
+        if cols is None:
+            cols = select_model_columns(fdf)
+        X, _ = feature_matrix(fdf, cols)
+        if len(X):
+            scaler.partial_fit(X)
+    n_samples = int(getattr(scaler, "n_samples_seen_", 0))
+    if cols is None or n_samples < n_clusters:
+        raise ValueError(f"fit_cluster_model: Nur {n_samples} gültige Fenster für {n_clusters} Cluster.")
+
+    mean = scaler.mean_.astype(np.float32)
+    scale = _safe_scale(np.sqrt(scaler.var_))
+    # erster Block muss für k-means++ mindestens n_clusters Zeilen haben
+    batch_size = max(batch_size, n_clusters)
+    km = MiniBatchKMeans(n_clusters=n_clusters, init="k-means++", batch_size=batch_size, random_state=seed)
+    for _ in range(n_epochs):
+        for X in _iter_batches(frames(), cols, batch_size):
+            if len(X) < n_clusters and not hasattr(km, "cluster_centers_"):
+                continue
+            km.partial_fit(_standardize(X, mean, scale))
+
+    log.info("fit_cluster_model: %s Cluster über %s Fenster (%s Epoche(n)), Spalten=%s", n_clusters, n_samples, n_epochs, cols)
+    return {
+        "columns": cols,
+        "mean": mean,
+        "scale": scale,
+        "centers": km.cluster_centers_.astype(np.float32),
+        "algorithm": "minibatch-incremental",
+        "n_samples": n_samples,
+        "inertia": None,
+    }
+
+
+### Zuordnung
+
+def predict_clusters(fdf: pd.DataFrame, model: ClusterModel) -> pd.Series:
+    """
+    Nächstes Zentrum je Fenster (euklidisch im standardisierten Raum).
+    Fenster mit NaN in einer Modellspalte erhalten Label -1.
+    """
+    X, valid = feature_matrix(fdf, select_model_columns(fdf, model["columns"]))
+    Z = _standardize(X, model["mean"], model["scale"])
+    centers = model["centers"]
+    # ||z - c||² = ||z||² - 2 z·c + ||c||²  (||z||² ist je Zeile konstant)
+    dist = (centers * centers).sum(axis=1) - 2.0 * (Z @ centers.T)
+    labels = np.full(len(fdf), -1, dtype=np.int32)
+    labels[valid] = dist.argmin(axis=1) if len(Z) else []
+    return pd.Series(labels, index=fdf.index, name="cluster")
+
+
+def assign_clusters(
+    features: dict[str, pd.DataFrame],
+    preds: dict[str, pd.Series],
+    *,
+    window_key: str,
+    model: ClusterModel,
+) -> dict[str, pd.Series]:
+    """Pipeline-Schritt: ordnet die Fenster `features[window_key]` zu -> preds[window_key]."""
+    labels = predict_clusters(features[window_key], model)
+    counts = labels.value_counts().sort_index()
+    log.info("assign_clusters: Fenster je Cluster %s", counts.to_dict())
+    return {**preds, window_key: labels}
@@ -1,17 +1,30 @@
 from typing import Any, cast, Literal, Callable
 from ..pipeline import CtxPipeline
+from ..log import get_logger
 from ..shared.inspect import row_col_nan_dur_freq, head_tail, print_info, print_description, start_end
 from ..shared.sensors import transform_all_sensors
+from ..shared.filters import butter_design, zero_phase_filter, chunked_zero_phase_filter, FilterDesign
+from ..shared.sensor_store import write_sensor_store, sensor_store_path
+from ..shared.resample import resample_block, AggFunc, InterpMethod, ResampleMethod
 from ..context import Ctx
 import pandas as pd
 import numpy as np
-from scipy.signal import butter, sosfiltfilt
+
+log = get_logger("preprocess")
 
 
 
 ### run preprocess Pipeline
 def run_preprocess(ctx: "Ctx") -> "Ctx":
-    pipeline = CtxPipeline()
+    # Ausführungs-Policy: teure Per-Sensor-Steps optional parallel (Thread-Pool)
+    parallel = ctx.config.get("parallel_sensors", False)
+    def policy(step):
+        return step.parallel() if parallel else step
+    # fusionierte IMU-Aufbereitung statt einzelner AA-/Resample-/HP-Steps
+    fused_imu = ctx.config.get("fused_imu", False)
+
+    # Speicher-Audit/Profiling je Step, View-sichere Steps ohne defensive Kopien (siehe CtxPipeline)
+    pipeline = CtxPipeline.from_config(ctx.config, name="PREPROCESS")
     pipeline.add(time_to_index, source="sensors")
     pipeline.tap(row_col_nan_dur_freq, source="sensors")
     pipeline.tap(head_tail, source="sensors")
@@ -21,49 +34,62 @@ def run_preprocess(ctx: "Ctx") -> "Ctx":
     pipeline.add(nan_handling, source="sensors", fn_kwargs={"method":"drop", "warn_threshold":0.01})
     pipeline.add(drop_columns, source="sensors", fn_kwargs={"columns_to_drop":["seconds_elapsed"]})
     pipeline.add(handle_nat_in_index, source="sensors", fn_kwargs={"gap_len":2})
-    pipeline.add(sort_sensors_by_time_index, source="sensors")
-    pipeline.add(group_duplicate_timeindex, source="sensors")
-    pipeline.add(anti_aliasing_lowpass_filter.select(include=["Accelerometer", "Gyroscope"]), source="sensors", fn_kwargs={"cfg": ctx.config}) #GameOrientation?
-    pipeline.add(resample_imu_sensors.select(exclude=["Location", "Gyroscope"]), source="sensors", fn_kwargs={"cfg": ctx.config})
-    pipeline.add(resample_imu_sensors.select(include=["Gyroscope"]), source="sensors", fn_kwargs={"cfg": ctx.config, "target_rate":100}) #später ggf. "target_rate":50
+    pipeline.add(policy(sort_sensors_by_time_index), source="sensors")
+    pipeline.add(policy(group_duplicate_timeindex), source="sensors")
+    if fused_imu:
+        # Tiefpass -> Resampling -> Hochpass in einem Step auf NumPy-Arrays
+        pipeline.add(policy(condition_imu_sensors.select(include=["Accelerometer", "Gyroscope"])), source="sensors", fn_kwargs={"cfg": ctx.config})
+        pipeline.add(policy(resample_imu_sensors.select(exclude=["Location", "Accelerometer", "Gyroscope"])), source="sensors", fn_kwargs={"cfg": ctx.config})
+    else:
+        pipeline.add(policy(anti_aliasing_lowpass_filter.select(include=["Accelerometer", "Gyroscope"])), source="sensors", fn_kwargs={"cfg": ctx.config}) #GameOrientation?
+        pipeline.add(policy(resample_imu_sensors.select(exclude=["Location", "Gyroscope"])), source="sensors", fn_kwargs={"cfg": ctx.config})
+        pipeline.add(resample_imu_sensors.select(include=["Gyroscope"]), source="sensors", fn_kwargs={"cfg": ctx.config, "target_rate":100}) #später ggf. "target_rate":50
     pipeline.add(resample_location_sensors.select(include=["Location"]), source="sensors", fn_kwargs={"cfg": ctx.config})
     pipeline.add(trim_to_common_timeframe, source="sensors", fn_kwargs={"cfg": ctx.config})
     pipeline.add(validate_basic_preprocessing, source="sensors")
-    pipeline.add(high_pass_filter.select(include=["Accelerometer", "Gyroscope"]), source="sensors", fn_kwargs={"cfg": ctx.config}) #exclude Location wenn GameOrientation in der Config ist
+    if not fused_imu:
+        pipeline.add(policy(high_pass_filter.select(include=["Accelerometer", "Gyroscope"])), source="sensors", fn_kwargs={"cfg": ctx.config}) #exclude Location wenn GameOrientation in der Config ist
+    if ctx.config.get("sensor_store", {}).get("enabled", False):
+        # Sensoren auf Platte ablegen, WINDOW/FEATURES lesen memory-mapped
+        pipeline.add(write_sensor_store, source="sensors", fn_kwargs={"directory": str(sensor_store_path(ctx.config))})
     pipeline.tap(row_col_nan_dur_freq, source="sensors")
     pipeline.tap(head_tail, source="sensors")
     pipeline.tap(print_info, source="sensors")
     pipeline.tap(print_description, source="sensors")
     pipeline.tap(start_end, source="sensors")
-    print("\nPreprocessing-Pipeline Repr:")
-    print(pipeline)
-    return pipeline(ctx)
+    log.debug("Preprocessing-Pipeline Repr:\n%s", pipeline)
+    return pipeline.record_reports(pipeline(ctx))
 
 
 
 ### Zeitstempel -> Zeitindex
 @transform_all_sensors
-def time_to_index(df: pd.DataFrame, *, sensor_name:str | None = None, time_col:str="time") -> pd.DataFrame:
+def time_to_index(df: pd.DataFrame, *, sensor_name:str | None = None, time_col:str="time", copy: bool = True) -> pd.DataFrame:
     """
     Wandelt 'time' Spalte (ns seit 1970-01-01 UTC) in DatetimeIndex um.
     - Erwartet Spalte time_col:str="time" in Nanosekunden.
     - Setzt Indexname auf 'time_utc' und Zeitzone auf UTC (tz-aware).
+    - copy=False: Datenspalten bleiben Views auf df (keine Kopie)
     """
     if df.empty:
-        print(f"[Warning] DataFrame {sensor_name} is empty, nothing to index.")
+        log.warning("DataFrame %s is empty, nothing to index.", sensor_name)
         return df
     if time_col not in df.columns:
         raise ValueError(f"DataFrame {sensor_name} must contain a '{time_col}' column to convert to index.")
 
-    df_time_index = df.copy()
-    df_time_index.set_index(pd.to_datetime(df_time_index[time_col], unit="ns", utc=True, errors="coerce"), inplace=True)
-    df_time_index.index.name = "time_utc"
-    df_time_index.drop(columns=time_col, inplace=True)
+    if copy:
+        df_time_index = df.copy()
+        df_time_index.set_index(pd.to_datetime(df_time_index[time_col], unit="ns", utc=True, errors="coerce"), inplace=True)
+        df_time_index.index.name = "time_utc"
+        df_time_index.drop(columns=time_col, inplace=True)
+    else:
+        index = pd.DatetimeIndex(pd.to_datetime(df[time_col], unit="ns", utc=True, errors="coerce"), name="time_utc")
+        df_time_index = _column_view(df, [col for col in df.columns if col != time_col], index=index)
 
     time_nans = df[time_col].isna().sum()
     time_nats = df_time_index.index.isna().sum()
     if time_nans != time_nats:
-        print(f"[Warning] DataFrame {sensor_name}: {time_nans} NaN values in '{time_col}' column, but {time_nats} NaT values in index.")
+        log.warning("DataFrame %s: %s NaN values in '%s' column, but %s NaT values in index.", sensor_name, time_nans, time_col, time_nats)
     if not isinstance(df_time_index.index, pd.DatetimeIndex):
         raise ValueError(f"DataFrame {sensor_name} index conversion to DatetimeIndex failed.")
     return df_time_index
@@ -89,12 +115,12 @@ def nan_handling(
 
     # Ausgaben
     if sum_nans == 0:
-        print(f"[Info] DataFrame {sensor_name} has no NaN values. No handling needed.")
+        log.info("DataFrame %s has no NaN values. No handling needed.", sensor_name)
         return df
     else:
-        print(f"[Info] DataFrame {sensor_name} contains {sum_nans} NaN values. -> Applying {method} to handle them.")
+        log.info("DataFrame %s contains %s NaN values. -> Applying %s to handle them.", sensor_name, sum_nans, method)
     if sum_nans / size > warn_threshold:
-        print(f"[Warning] DataFrame {sensor_name} has more than {warn_threshold * 100}% NaN values ({sum_nans} NaNs in {size} total).")
+        log.warning("DataFrame %s has more than %s%% NaN values (%s NaNs in %s total).", sensor_name, warn_threshold * 100, sum_nans, size)
 
     # TODO: längere gaps erkennen und warnen
     # TODO: ggf. intelligente Methodik verwenden
@@ -116,27 +142,30 @@ def nan_handling(
 
 ### Bestimmte Spalten entfernen
 @transform_all_sensors
-def drop_columns(df: pd.DataFrame, *, sensor_name:str | None = None, columns_to_drop:list[str]|None=None) -> pd.DataFrame:
+def drop_columns(df: pd.DataFrame, *, sensor_name:str | None = None, columns_to_drop:list[str]|None=None, copy: bool = True) -> pd.DataFrame:
     """
     Entfernt bestimmte Spalten aus jedem Sensor-DataFrame.
     - Standardmäßig wird die Spalte "seconds_elapsed" entfernt.
+    - copy=False: verbleibende Spalten bleiben Views auf df (keine Kopie)
     TODO: Config unterstützung einbauen
     """
     columns_to_drop = columns_to_drop or ["seconds_elapsed"]
     if df.empty:
-        print(f"[Warning] DataFrame {sensor_name} is empty, nothing to drop.")
+        log.warning("DataFrame %s is empty, nothing to drop.", sensor_name)
         return df
-    df_out = df.copy()
-    
-    existing_cols_set = set(df_out.columns)
+    existing_cols_set = set(df.columns)
     columns_to_drop_set = existing_cols_set & set(columns_to_drop)
     expected_cols_count = len(existing_cols_set - columns_to_drop_set)
     # drop
-    df_out.drop(columns=columns_to_drop_set, errors="ignore", inplace=True)
+    if copy:
+        df_out = df.copy()
+        df_out.drop(columns=columns_to_drop_set, errors="ignore", inplace=True)
+    else:
+        df_out = _column_view(df, [col for col in df.columns if col not in columns_to_drop_set])
     if len(set(df_out.columns)) == 0:
-        print(f"[Warning] DataFrame {sensor_name} has no columns left after dropping {columns_to_drop}.")
+        log.warning("DataFrame %s has no columns left after dropping %s.", sensor_name, columns_to_drop)
     if len(set(df_out.columns)) != expected_cols_count:
-        print(f"[Warning] DataFrame {sensor_name}: Expected {expected_cols_count} columns after dropping, but got {len(df_out.columns)}.")
+        log.warning("DataFrame %s: Expected %s columns after dropping, but got %s.", sensor_name, expected_cols_count, len(df_out.columns))
     return df_out
 
 ### NaT Handling
@@ -150,12 +179,12 @@ def handle_nat_in_index(df: pd.DataFrame, *, sensor_name:str | None = None, gap_
         raise ValueError(f"DataFrame {sensor_name} index must be a DatetimeIndex")
     
     if not df.index.hasnans:
-        print(f"[Info] DataFrame {sensor_name} has no NaT values in index. Returning original DataFrame.")
+        log.info("DataFrame %s has no NaT values in index. Returning original DataFrame.", sensor_name)
         return df
         
     nat_series = pd.Series(df.index.isna(), index=df.index) #Pandas Series statt numpy Array, damit groupby funktioniert
     nat_count = int(nat_series.sum())
-    print(f"[Warning] DataFrame {sensor_name} index contains {nat_count} NaT values. Initial shape: {df.shape}")
+    log.warning("DataFrame %s index contains %s NaT values. Initial shape: %s", sensor_name, nat_count, df.shape)
     
     # Zusammenhängende NaT-Cluster erkennen
     switch_points = (nat_series != nat_series.shift()) # Wert mit vorherigem Wert (shift()) vergleichen -> wechselpunkte zwischen True/False
@@ -168,13 +197,13 @@ def handle_nat_in_index(df: pd.DataFrame, *, sensor_name:str | None = None, gap_
     # Warnung bei langem NaT-Cluster
     if gap_count > 0:
         longest_gap = int(group_sizes.max())
-        print(f"[Warning] DataFrame {sensor_name} found {gap_count} NaT blocks with length >= {gap_len}! longest={longest_gap}.")
+        log.warning("DataFrame %s found %s NaT blocks with length >= %s! longest=%s.", sensor_name, gap_count, gap_len, longest_gap)
         
     # Entfernen der NaT-Zeilen
     df_cleaned = df[~nat_series]
-    print(f"[Info] DataFrame {sensor_name} removed {nat_count} NaT rows, resulting shape: {df_cleaned.shape}")
+    log.info("DataFrame %s removed %s NaT rows, resulting shape: %s", sensor_name, nat_count, df_cleaned.shape)
     if df_cleaned.shape[0] != df.shape[0] - nat_count:
-        print(f"[Warning] DataFrame {sensor_name}: After removing NaT rows, expected {df.shape[0] - nat_count} rows but got {df_cleaned.shape[0]} rows.")
+        log.warning("DataFrame %s: After removing NaT rows, expected %s rows but got %s rows.", sensor_name, df.shape[0] - nat_count, df_cleaned.shape[0])
     return df_cleaned
     
         
@@ -197,20 +226,20 @@ def sort_sensors_by_time_index(df: pd.DataFrame, *, sensor_name:str | None = Non
     # vor dem Sortieren prüfen
     rows_in_df = df.shape[0]
     if rows_in_df == 0:
-        print(f"[Warning] DataFrame {sensor_name} is empty, nothing to sort.")
+        log.warning("DataFrame %s is empty, nothing to sort.", sensor_name)
         return df # leeres DF
     if df.index.is_monotonic_increasing:
-        print(f"[Info] DataFrame {sensor_name} is already sorted by time index.")
+        log.info("DataFrame %s is already sorted by time index.", sensor_name)
         return df # schon sortiert
     if df.index.has_duplicates:
-        print(f"[Warning] DataFrame {sensor_name} index has duplicate time entries.")
+        log.warning("DataFrame %s index has duplicate time entries.", sensor_name)
     if df.index.hasnans:
         nat_count = df.index.isna().sum()
-        print(f"[Warning] DataFrame {sensor_name} index contains {nat_count} NaT values.")
+        log.warning("DataFrame %s index contains %s NaT values.", sensor_name, nat_count)
 
     # Sortieren
     df_sorted = df.sort_index(na_position="last", kind="stable") # stabil = Reihenfolge bei gleichen Zeitstempeln bleibt erhalten
-    print(f"[Info] DataFrame {sensor_name} sorted by time index.")
+    log.info("DataFrame %s sorted by time index.", sensor_name)
 
     return df_sorted
 
@@ -231,13 +260,13 @@ def group_duplicate_timeindex(df: pd.DataFrame , *, sensor_name:str | None = Non
     if df.index.has_duplicates:
         rows_in = df.shape[0]
         dup_timestamps = df.index.duplicated(keep="first")
-        print(f"[Info] DataFrame {sensor_name}: {dup_timestamps.sum()} duplicate timestamps found")
+        log.info("DataFrame %s: %s duplicate timestamps found", sensor_name, dup_timestamps.sum())
         rows_out = rows_in - dup_timestamps.sum()
-        print(f"[Info] DataFrame {sensor_name}: estimated: reducing rows from {rows_in} to {rows_out}")
+        log.info("DataFrame %s: estimated: reducing rows from %s to %s", sensor_name, rows_in, rows_out)
 
         # Anzahl Gruppen
         count_groups = df.index[dup_timestamps].nunique()
-        print(f"[Info] DataFrame {sensor_name}: {count_groups} unique duplicate timestamp groups found")
+        log.info("DataFrame %s: %s unique duplicate timestamp groups found", sensor_name, count_groups)
 
         # Gruppen bilden getrennt nach numerischen und nicht-numerischen Spalten
         df_numeric = pd.DataFrame(index=df.index)
@@ -263,18 +292,18 @@ def group_duplicate_timeindex(df: pd.DataFrame , *, sensor_name:str | None = Non
 
         # kurze Validierung
         if not df_grouped.index.is_monotonic_increasing:
-            print(f"[Warning] Grouped DataFrame {sensor_name}: index is not sorted!")
+            log.warning("Grouped DataFrame %s: index is not sorted!", sensor_name)
         rows_removed = rows_in - df_grouped.shape[0]
         if not rows_removed == dup_timestamps.sum():
-            print(f"[Warning] Grouped DataFrame {sensor_name}: removed {rows_removed} rows, but expected to remove {dup_timestamps.sum()} rows!")
+            log.warning("Grouped DataFrame %s: removed %s rows, but expected to remove %s rows!", sensor_name, rows_removed, dup_timestamps.sum())
         if not df_grouped.shape[0] == rows_out:
-            print(f"[Warning] Grouped DataFrame {sensor_name}: has {df_grouped.shape[0]} rows, expected {rows_out} rows!")
+            log.warning("Grouped DataFrame %s: has %s rows, expected %s rows!", sensor_name, df_grouped.shape[0], rows_out)
 
-        print(f"[Info] Grouped DataFrame {sensor_name}: all columns grouped, resulting shape: {df_grouped.shape}")
+        log.info("Grouped DataFrame %s: all columns grouped, resulting shape: %s", sensor_name, df_grouped.shape)
         return df_grouped
     
     else:
-        print(f"[Info] DataFrame {sensor_name}: No duplicate timestamps found, no grouping needed.")
+        log.info("DataFrame %s: No duplicate timestamps found, no grouping needed.", sensor_name)
         return df
     
 ### Validierung der Basisfunktionen des Preprocessings
@@ -319,24 +348,24 @@ def validate_basic_preprocessing(df: pd.DataFrame, *, sensor_name: str) -> pd.Da
     ## Infos und Warnungen
     #shape
     if df.empty:
-        print(f"[Warning] Sensor '{sensor_name}' is empty.")
+        log.warning("Sensor '%s' is empty.", sensor_name)
     if df.shape[1] == 0:
-        print(f"[Warning] Sensor '{sensor_name}' has no columns.")
+        log.warning("Sensor '%s' has no columns.", sensor_name)
     if df.shape[0] < 10:
-        print(f"[Info] Sensor '{sensor_name}' has only {df.shape[0]} rows, very little data.")
+        log.info("Sensor '%s' has only %s rows, very little data.", sensor_name, df.shape[0])
     if df.select_dtypes(include="number").shape[1] == 0:
-        print(f"[Warning] Sensor '{sensor_name}' has no numerical columns.")
+        log.warning("Sensor '%s' has no numerical columns.", sensor_name)
     # Indexname
     if df.index.name != "time_utc":
-        print(f"[Warning] Sensor '{sensor_name}' index name is '{df.index.name}', expected 'time_utc'.")
+        log.warning("Sensor '%s' index name is '%s', expected 'time_utc'.", sensor_name, df.index.name)
     # Frequenz inferieren
     ifq = pd.infer_freq(df.index)
     if ifq is None or len(df.index) < 3:
-        print(f"[Warning] DataFrame '{sensor_name}' frequency could not be inferred!")
+        log.warning("DataFrame '%s' frequency could not be inferred!", sensor_name)
     else:
-        print(f"[Info] DataFrame '{sensor_name}' frequency inferred as: {ifq}")
+        log.info("DataFrame '%s' frequency inferred as: %s", sensor_name, ifq)
     # alle Prüfungen bestanden
-    print(f"[Info] DataFrame '{sensor_name}' passed all basic preprocessing validations.")
+    log.info("DataFrame '%s' passed all basic preprocessing validations.", sensor_name)
     return df   
 
 ### Anti-Aliasing Tiefpassfilter
@@ -349,10 +378,14 @@ def anti_aliasing_lowpass_filter(df: pd.DataFrame,
                                 target_rate: float = 100.0, # Ziel Samplingrate nach Resampling
                                 order: int = 6,
                                 safety_factor: float = 0.8,
-                                include_columns: list[str] | None = None
+                                include_columns: list[str] | None = None,
+                                chunk_size: int | None = None,
+                                copy: bool = True
                                 ) -> pd.DataFrame:
     """
     Wendet einen Butterworth-Tiefpassfilter zur Anti-Aliasing-Filterung an.
+    - chunk_size: blockweise Nullphasen-Filterung (gleiches Ergebnis, Speicher O(chunk_size))
+    - copy=False: ungefilterte Spalten bleiben Views auf df
     """
     # Parameter aus config laden, falls vorhanden -> fallback auf Default-Parameter
     if cfg and sensor_name in cfg.get("anti_aliasing_lowpass", {}):
@@ -360,15 +393,16 @@ def anti_aliasing_lowpass_filter(df: pd.DataFrame,
         target_rate = sensor_cfg.get("target_rate", target_rate)
         order = sensor_cfg.get("order", order)
         include_columns = sensor_cfg.get("include_columns", include_columns)
+        chunk_size = sensor_cfg.get("chunk_size", chunk_size)
     else:
-        print("[Info] No 'anti_aliasing_lowpass' config found, using default parameters.")
+        log.info("No 'anti_aliasing_lowpass' config found, using default parameters.")
 
     # target_rate gegen samplingrate aus resampling prüfen
     if cfg and "resample_imu" in cfg:
         resample_cfg = cfg["resample_imu"]
         sample_rate_from_resampling = resample_cfg.get("target_rate", None)
         if sample_rate_from_resampling is not None and not np.isclose(sample_rate_from_resampling, target_rate):
-            print(f"[Warning] DataFrame '{sensor_name}': target_rate from anti_aliasing_lowpass ({target_rate} Hz) does not match target_rate from resample_imu ({sample_rate_from_resampling} Hz). Use the same target_rate for both steps!")
+            log.warning("DataFrame '%s': target_rate from anti_aliasing_lowpass (%s Hz) does not match target_rate from resample_imu (%s Hz). Use the same target_rate for both steps!", sensor_name, target_rate, sample_rate_from_resampling)
 
     # Cutoff-Frequenz bestimmen
     if cutoff_freq is None:
@@ -401,7 +435,7 @@ def anti_aliasing_lowpass_filter(df: pd.DataFrame,
     
     # Prüfen, ob AA-Filterung überhaupt erforderlich ist
     if current_rate <= target_rate:
-        print(f"[Info] DataFrame '{sensor_name}': Current rate {current_rate:.2f} Hz <= target rate {target_rate:.2f} Hz, no lowpass filtering needed.")
+        log.info("DataFrame '%s': Current rate %.2f Hz <= target rate %.2f Hz, no lowpass filtering needed.", sensor_name, current_rate, target_rate)
         return df
 
     # Normalisierte Grenzfrequenz berechnen
@@ -418,7 +452,7 @@ def anti_aliasing_lowpass_filter(df: pd.DataFrame,
     
     # Zu filternde Spalten auswählen
     if include_columns is None:
-        df_to_filter = df.select_dtypes(include="number").astype("float64").copy() # alle numerischen Spalten
+        df_to_filter = df.select_dtypes(include="number").astype("float64", copy=copy) # alle numerischen Spalten
     else:
         if not all(col in df.columns for col in include_columns):
             missing_cols = [col for col in include_columns if col not in df.columns]
@@ -426,22 +460,25 @@ def anti_aliasing_lowpass_filter(df: pd.DataFrame,
         num_cols = df[include_columns].select_dtypes(include="number").columns
         if len(num_cols) != len(include_columns):
             raise ValueError(f"DataFrame {sensor_name}: include_columns contains non-numerical columns.")
-        df_to_filter = df[include_columns].astype("float64").copy() # nur angegebene Spalten
+        df_to_filter = df[include_columns].astype("float64", copy=copy) # nur angegebene Spalten
     # prüfen, ob noch Spalten zum Filtern übrig sind
     if df_to_filter.empty:
             raise ValueError(f"DataFrame {sensor_name} has no more numerical columns to apply the AA filter.")
 
     ###
     # Filter erstellen und anwenden
-    sos = butter(order, wn, btype='lowpass', output='sos')
-    filtered = sosfiltfilt(sos, df_to_filter.to_numpy(), axis=0)
+    design = butter_design(order, cutoff_freq, current_rate, "lowpass")
+    values = df_to_filter.to_numpy(copy=chunk_size is not None)
+    filter_columns = df_to_filter.columns
+    del df_to_filter  # blockweise: nur noch values im Speicher
+    filtered = _zero_phase(design, values, chunk_size)
     
     # Plausibilitätscheck
     if not np.isfinite(filtered).all():
-        print(f"[WARNING] {sensor_name}: Filtering produced non-finite values (NaN/Inf).")
+        log.warning("%s: Filtering produced non-finite values (NaN/Inf).", sensor_name)
 
-    aa_df = df.copy()
-    aa_df[df_to_filter.columns] = filtered
+    aa_df = df.copy(deep=copy)  # Spaltenzuweisung ersetzt Arrays, df bleibt unverändert
+    aa_df[filter_columns] = filtered
     return aa_df
 
 ### Resample IMU Sensoren auf einheitliche Abtastrate
@@ -452,7 +489,10 @@ def resample_imu_sensors(df: pd.DataFrame,
                          cfg: dict[str, Any] | None = None, 
                          target_rate: int = 100, 
                          agg_func: Literal["mean","median","first","last"] = "mean", 
-                         interp_method: Literal["linear","time","nearest","pad"] = "time"
+                         interp_method: Literal["linear","time","nearest","pad"] = "time",
+                         method: ResampleMethod = "bin",
+                         jitter_tolerance: float = 0.05,
+                         copy: bool = True
                          ) -> pd.DataFrame:
     """
     Alle IMU-Sensoren auf eine einheitliche Abtastrate resamplen.
@@ -468,44 +508,45 @@ def resample_imu_sensors(df: pd.DataFrame,
         - time: zeitbasierte Interpolation
         - nearest: nächster Wert
         - pad: vorheriger Wert (Vorwärtsfüllung)
+    - method: Resampling-Pfad (siehe shared/resample.py)
+        - bin: Aggregation (agg_func) + Interpolation (interp_method) über pandas resample
+        - interp: Jitter-Korrektur per np.interp auf das Zielraster
+        - poly: Downsampling per resample_poly (Polyphasen-FIR)
+        - auto: interp, wenn Quellrate ≈ Zielrate (± jitter_tolerance), sonst poly
+    - copy=False: keine Kopie der numerischen Spalten vor dem Resampling
     * cfg optional: Konfigurationsdictionary, um Parameter zu überschreiben
     """
-    # TODO [Resampling-Refactor]:
-    # Aktuell werden IMU-Signale unabhängig von der tatsächlichen Aufnahmefrequenz
-    # durch .resample(...).agg(...)+.interpolate() auf ein gleichmäßiges Zeitraster gebracht.
-    # Das funktioniert, ist aber ein Mischfall aus "Jitter-Korrektur" und "echtem Downsampling".
-    # Langfristig sollte die Funktion zwei klar getrennte Pfade unterstützen:
-    #   (A) Jitter-Korrektur: Wenn Aufnahmefrequenz ≈ Zielrate (z. B. ±5 % Abweichung),
-    #       dann KEINE Aggregation und KEIN Anti-Aliasing — nur reindex() + interpolate("time"),
-    #       um leichte Unregelmäßigkeiten im Zeitraster zu glätten, ohne das Spektrum zu verändern.
-    #   (B) Downsampling: Wenn tatsächlich auf niedrigere Zielrate reduziert wird,
-    #       dann VORHER einen echten Anti-Aliasing-Tiefpass (z. B. Butterworth 4.–6. Ordnung)
-    #       anwenden, um Frequenzen oberhalb der neuen Nyquist-Grenze zu entfernen.
-    #       Danach decimieren/resample_poly statt mean-aggregation.
-    # Hintergrund:
-    #   Das aktuelle Vorgehen mittelt auch im Jitter-Fall leicht über Fenster → unnötige Glättung,
-    #   während beim echten Downsampling ohne vorgeschalteten Tiefpass Aliasing entstehen kann.
-    #   Diese Trennung erhöht sowohl Signalreinheit als auch Reproduzierbarkeit der Features.
-
     # TODO: resample/interpolate für nicht numerische Spalten implementieren?
     # Nur numerische Spalten weiterverarbeiten (restliche Spalten gehen verloren!)
-    df = df.select_dtypes(include="number").copy()
+    df = df.select_dtypes(include="number")
+    if copy:
+        df = df.copy()
     # Parameter aus config laden, falls vorhanden -> fallback auf Default-Parameter
     if cfg and "resample_imu" in cfg:
         target_rate = cfg["resample_imu"].get("target_rate", target_rate)
         agg_func = cfg["resample_imu"].get("agg_func", agg_func)
         interp_method = cfg["resample_imu"].get("interp_method", interp_method)
+        method = cfg["resample_imu"].get("method", method)
+        jitter_tolerance = cfg["resample_imu"].get("jitter_tolerance", jitter_tolerance)
     else:
-        print("[Info] No 'resample_imu' config found, using default parameters.")
+        log.info("No 'resample_imu' config found, using default parameters.")
 
     # target_rate gegen target_rate aus anti_aliasing_lowpass prüfen
     if cfg and sensor_name in cfg.get("anti_aliasing_lowpass", {}):
         aa_cfg = cfg["anti_aliasing_lowpass"][sensor_name]
         target_rate_from_aa = aa_cfg.get("target_rate", None)
         if target_rate_from_aa is not None and not np.isclose(target_rate_from_aa, target_rate):
-            print(f"[Warning] DataFrame '{sensor_name}': target_rate from high_pass_filter ({target_rate} Hz) does not match target_rate from anti_aliasing_lowpass ({target_rate_from_aa} Hz). Use the same rate for both steps!")
+            log.warning("DataFrame '%s': target_rate from high_pass_filter (%s Hz) does not match target_rate from anti_aliasing_lowpass (%s Hz). Use the same rate for both steps!", sensor_name, target_rate, target_rate_from_aa)
     # von Hz in ms
     step = pd.to_timedelta(1 / target_rate, unit='s')
+    # interp/poly/auto: NumPy-Pfad auf int64-ns-Zeitstempeln
+    if method != "bin":
+        if df.isna().any().any():
+            raise ValueError(f"DataFrame {sensor_name} contains NaN values. Please handle them before resampling with method '{method}'.")
+        idx = cast(pd.DatetimeIndex, df.index)
+        grid_ns, values, path = resample_block(idx.asi8, df.to_numpy(dtype=np.float64), step.value, method=method, jitter_tolerance=jitter_tolerance)
+        log.info("DataFrame '%s': resampled to %s Hz via '%s' path.", sensor_name, target_rate, path)
+        return pd.DataFrame(values, index=_grid_index(grid_ns, step.value, like=idx), columns=df.columns, copy=False)
     # Resampling
     out = df.resample(step, origin="epoch", label="left", closed="left").agg(agg_func)
     # Interpolation
@@ -539,7 +580,7 @@ def resample_location_sensors(df: pd.DataFrame, *, cfg: dict[str, Any] | None =
         fill_method = cfg["resample_location"].get("fill_method", fill_method)
         limit = cfg["resample_location"].get("limit", limit)
     else:
-        print("[Info] No 'resample_location' config found, using default parameters.")
+        log.info("No 'resample_location' config found, using default parameters.")
     # von Hz in ms
     step = pd.to_timedelta(1 / target_rate, unit='s')
     # Resampling
@@ -557,7 +598,7 @@ def resample_location_sensors(df: pd.DataFrame, *, cfg: dict[str, Any] | None =
 
 ### Auf einheitlichen Start/Ende trimmen
 # keine @transform_all_sensors, da alle Sensoren zusammen betrachtet werden müssen
-def trim_to_common_timeframe(sensors_dict: dict[str, pd.DataFrame], *, cfg: dict[str, Any] | None = None, align_to_sensor: str | None = None,warn_if_cut_seconds: int | None = None) -> dict[str, pd.DataFrame]:
+def trim_to_common_timeframe(sensors_dict: dict[str, pd.DataFrame], *, cfg: dict[str, Any] | None = None, align_to_sensor: str | None = None,warn_if_cut_seconds: int | None = None, copy: bool = True) -> dict[str, pd.DataFrame]:
     """
     Trimmt alle Sensoren auf den gemeinsamen Zeitrahmen.
     - Findet den spätesten Startzeitpunkt und den frühesten Endzeitpunkt aller Sensoren.
@@ -571,6 +612,7 @@ def trim_to_common_timeframe(sensors_dict: dict[str, pd.DataFrame], *, cfg: dict
         - monoton aufsteigend sind
         - keine NaT-Werte im Index haben
          -> NaT-Werte werden bis zum nächsten validen Timestamp übersprungen (ggf. simple variante mit df.index[0])
+    - copy=False: Zeitbereichs-Slices bleiben Views auf die Eingabe
     """
     if not isinstance(sensors_dict, dict):
         raise ValueError("sensors_dict must be a dictionary")
@@ -591,7 +633,7 @@ def trim_to_common_timeframe(sensors_dict: dict[str, pd.DataFrame], *, cfg: dict
         align_to_sensor = cfg["trim_to_common_timeframe"].get("align_to_sensor", align_to_sensor)
         warn_if_cut_seconds = cfg["trim_to_common_timeframe"].get("warn_if_cut_seconds", warn_if_cut_seconds)    
     else:
-        print("[Info] No 'trim_to_common_timeframe' config found, using default parameters.")
+        log.info("No 'trim_to_common_timeframe' config found, using default parameters.")
 
 
     # Start und Ende bestimmen
@@ -639,11 +681,13 @@ def start_end_align_to_sensor(d: dict[str, pd.DataFrame], ats: str) -> tuple[pd.
         trimmed_from_start = (start - earliest).total_seconds()
         trimmed_from_end = (latest - end).total_seconds()
         if trimmed_from_start >= warn_if_cut_seconds:
-            print(f"[Warning] Trimming {trimmed_from_start} seconds from the start.")
+            log.warning("Trimming %s seconds from the start.", trimmed_from_start)
         if trimmed_from_end >= warn_if_cut_seconds:
-            print(f"[Warning] Trimming {trimmed_from_end} seconds from the end.")
+            log.warning("Trimming %s seconds from the end.", trimmed_from_end)
 
     # zuschneiden aller Sensoren
+    if not copy:
+        return {sensor_name: sensor_df.loc[start:end] for sensor_name, sensor_df in sensors_dict.items()}
     return {sensor_name: sensor_df.loc[start:end].copy() for sensor_name, sensor_df in sensors_dict.items()} # copy(), nur zur sicherheit
 
 
@@ -656,10 +700,14 @@ def high_pass_filter(df: pd.DataFrame,
                     cutoff_freq: float = 2,
                     sample_rate: float = 100.0,
                     order: int = 4,
-                    include_columns: list[str] | None = None
+                    include_columns: list[str] | None = None,
+                    chunk_size: int | None = None,
+                    copy: bool = True
                     ) -> pd.DataFrame:
     """
     Wendet einen Hochpassfilter auf alle oder ausgewählte numerischen Spalten des DataFrames an.
+    - chunk_size: blockweise Nullphasen-Filterung (gleiches Ergebnis, Speicher O(chunk_size))
+    - copy=False: ungefilterte Spalten bleiben Views auf df
     Wir gehen davon aus:
     - keine NaN-Werte (oder Inf-Werte) im DataFrame
     - keine duplikate im Index
@@ -678,6 +726,7 @@ def high_pass_filter(df: pd.DataFrame,
         sample_rate = sensor_cfg.get("sample_rate", sample_rate)
         order = sensor_cfg.get("order", order)
         include_columns = sensor_cfg.get("include_columns", include_columns)
+        chunk_size = sensor_cfg.get("chunk_size", chunk_size)
 
     # Normalisierte Grenzfrequenz berechnen
     wn = cutoff_freq / (sample_rate/2)
@@ -693,7 +742,7 @@ def high_pass_filter(df: pd.DataFrame,
 
     # Zu filternde Spalten auswählen
     if include_columns is None:
-        df_to_filter = df.select_dtypes(include="number").astype("float64").copy() # alle numerischen Spalten
+        df_to_filter = df.select_dtypes(include="number").astype("float64", copy=copy) # alle numerischen Spalten
     else:
         if not all(col in df.columns for col in include_columns):
             missing_cols = [col for col in include_columns if col not in df.columns]
@@ -701,25 +750,198 @@ def high_pass_filter(df: pd.DataFrame,
         num_cols = df[include_columns].select_dtypes(include="number").columns
         if len(num_cols) != len(include_columns):
             raise ValueError(f"DataFrame {sensor_name}: include_columns contains non-numerical columns.")
-        df_to_filter = df[include_columns].astype("float64").copy() # nur angegebene Spalten
+        df_to_filter = df[include_columns].astype("float64", copy=copy) # nur angegebene Spalten
 
     # prüfen, ob noch Spalten zum Filtern übrig sind
     if df_to_filter.empty:
             raise ValueError(f"DataFrame {sensor_name} has no more numerical columns to apply the high-pass filter.")
     
     # Filter erstellen und anwenden
-    sos = butter(order, wn, btype='highpass', output='sos')
-    filtered = sosfiltfilt(sos, df_to_filter.to_numpy(), axis=0)
+    design = butter_design(order, cutoff_freq, sample_rate, "highpass")
+    values = df_to_filter.to_numpy(copy=chunk_size is not None)
+    filter_columns = df_to_filter.columns
+    del df_to_filter  # blockweise: nur noch values im Speicher
+    filtered = _zero_phase(design, values, chunk_size)
 
     # Plausibilitätscheck
     if not np.isfinite(filtered).all():
-        print(f"[WARNING] {sensor_name}: Filtering produced non-finite values (NaN/Inf).")
+        log.warning("%s: Filtering produced non-finite values (NaN/Inf).", sensor_name)
     # TODO: weitere Plausibilitätschecks:
     # - Mittelwerte vor/nach Filterung vergleichen -> nahe 0?
     # - Varianzen vor/nach Filterung vergleichen -> Varianz kleiner?
     # - Spalten nahezu konstant? -> Parameter anpassen?
 
     # Ergebnis zusammenbauen
-    hp_df = df.copy()
-    hp_df[df_to_filter.columns] = filtered
-    return hp_df
\ No newline at end of file
+    hp_df = df.copy(deep=copy)  # Spaltenzuweisung ersetzt Arrays, df bleibt unverändert
+    hp_df[filter_columns] = filtered
+    return hp_df
+
+### Fusionierte IMU-Aufbereitung (Tiefpass -> Resampling -> Hochpass)
+@transform_all_sensors
+def condition_imu_sensors(df: pd.DataFrame,
+                          *,
+                          sensor_name: str,
+                          cfg: dict[str, Any] | None = None,
+                          target_rate: float = 100.0,
+                          lowpass_order: int = 6,
+                          safety_factor: float = 0.8,
+                          lowpass_columns: list[str] | None = None,
+                          agg_func: AggFunc = "mean",
+                          interp_method: InterpMethod = "time",
+                          method: ResampleMethod = "bin",
+                          jitter_tolerance: float = 0.05,
+                          highpass_cutoff_freq: float = 2,
+                          highpass_order: int = 4,
+                          highpass_columns: list[str] | None = None,
+                          lowpass_chunk_size: int | None = None,
+                          highpass_chunk_size: int | None = None
+                          ) -> pd.DataFrame:
+    """
+    Fusionierte Variante von anti_aliasing_lowpass_filter -> resample_imu_sensors -> high_pass_filter.
+    - gleiche Config-Keys ("anti_aliasing_lowpass", "resample_imu", "hp_filters") und Defaults
+    - numerische Spalten werden einmal als float64-Block entnommen, alle drei Schritte laufen
+      auf NumPy-Arrays, am Ende entsteht genau ein neuer DataFrame
+    -> Nicht-numerische Spalten werden entfernt (wie resample_imu_sensors)
+    - Unterschied zur Step-Variante: der Hochpass läuft vor trim_to_common_timeframe,
+      nur die Filter-Randbereiche am Fahrtanfang/-ende weichen leicht ab
+    """
+    # Parameter aus config laden, falls vorhanden -> fallback auf Default-Parameter
+    if cfg and sensor_name in cfg.get("anti_aliasing_lowpass", {}):
+        aa_cfg = cfg["anti_aliasing_lowpass"][sensor_name]
+        lowpass_target_rate = aa_cfg.get("target_rate", target_rate)
+        lowpass_order = aa_cfg.get("order", lowpass_order)
+        lowpass_columns = aa_cfg.get("include_columns", lowpass_columns)
+        lowpass_chunk_size = aa_cfg.get("chunk_size", lowpass_chunk_size)
+    else:
+        lowpass_target_rate = target_rate
+        log.info("No 'anti_aliasing_lowpass' config found, using default parameters.")
+    if cfg and "resample_imu" in cfg:
+        target_rate = cfg["resample_imu"].get("target_rate", target_rate)
+        agg_func = cfg["resample_imu"].get("agg_func", agg_func)
+        interp_method = cfg["resample_imu"].get("interp_method", interp_method)
+        method = cfg["resample_imu"].get("method", method)
+        jitter_tolerance = cfg["resample_imu"].get("jitter_tolerance", jitter_tolerance)
+    else:
+        log.info("No 'resample_imu' config found, using default parameters.")
+    highpass_rate = target_rate
+    if cfg and sensor_name in cfg.get("hp_filters", {}):
+        hp_cfg = cfg["hp_filters"][sensor_name]
+        highpass_cutoff_freq = hp_cfg.get("cutoff_freq", highpass_cutoff_freq)
+        highpass_rate = hp_cfg.get("sample_rate", highpass_rate)
+        highpass_order = hp_cfg.get("order", highpass_order)
+        highpass_columns = hp_cfg.get("include_columns", highpass_columns)
+        highpass_chunk_size = hp_cfg.get("chunk_size", highpass_chunk_size)
+
+    if not np.isclose(lowpass_target_rate, target_rate):
+        log.warning("DataFrame '%s': target_rate from anti_aliasing_lowpass (%s Hz) does not match target_rate from resample_imu (%s Hz). Use the same target_rate for both steps!", sensor_name, lowpass_target_rate, target_rate)
+    if not np.isclose(highpass_rate, target_rate):
+        log.warning("DataFrame '%s': sample_rate from hp_filters (%s Hz) does not match target_rate from resample_imu (%s Hz).", sensor_name, highpass_rate, target_rate)
+
+    # Voraussetzungen prüfen
+    if len(df) < 2:
+        raise ValueError(f"{sensor_name}: not enough samples to estimate sampling rate.")
+    numeric = df.select_dtypes(include="number")
+    lp_pos = _filter_column_positions(numeric, df, lowpass_columns, sensor_name=sensor_name, purpose="aa filter")
+    hp_pos = _filter_column_positions(numeric, df, highpass_columns, sensor_name=sensor_name, purpose="high-pass filter")
+
+    # einmalige Entnahme: Zeitstempel (int64 ns) + zusammenhängender float64-Block
+    idx = cast(pd.DatetimeIndex, df.index)
+    t_ns = idx.asi8
+    block = np.array(numeric.to_numpy(dtype=np.float64), order="C")
+    if np.isnan(block).any():
+        raise ValueError(f"DataFrame {sensor_name} contains NaN values. Please handle them before applying the IMU conditioning.")
+
+    # (1) Anti-Aliasing Tiefpass (nur wenn aktuelle Rate > Zielrate)
+    current_rate = 1e9 / np.median(np.diff(t_ns))
+    if current_rate <= lowpass_target_rate:
+        log.info("DataFrame '%s': Current rate %.2f Hz <= target rate %.2f Hz, no lowpass filtering needed.", sensor_name, current_rate, lowpass_target_rate)
+    else:
+        lowpass_cutoff = safety_factor * (lowpass_target_rate / 2)
+        wn = lowpass_cutoff / (current_rate / 2)
+        if not 0.02 <= wn <= 0.9:
+            raise ValueError(f"Normalized cutoff frequency wn={wn} out of valid range.")
+        if block.shape[0] < 3 * (lowpass_order + 1):
+            raise ValueError(f"DataFrame {sensor_name} has too few samples ({block.shape[0]}) for filtering. Reduce order or resample to higher sample_rate. (len(df) < 3 * (order + 1))")
+        design = butter_design(lowpass_order, lowpass_cutoff, current_rate, "lowpass")
+        block = _filter_block(design, block, lp_pos, chunk_size=lowpass_chunk_size)
+
+    # (2) Resampling auf das Epoch-Raster der Zielrate (Pfad über resample_imu.method)
+    step_ns = pd.to_timedelta(1 / target_rate, unit="s").value
+    grid_ns, out, path = resample_block(t_ns, block, step_ns, method=method, agg_func=agg_func,
+                                        interp_method=interp_method, jitter_tolerance=jitter_tolerance)
+    del block
+    if method != "bin":
+        log.info("DataFrame '%s': resampled to %s Hz via '%s' path.", sensor_name, target_rate, path)
+
+    # (3) Hochpass auf dem gleichmäßigen Raster
+    wn = highpass_cutoff_freq / (highpass_rate / 2)
+    if not 0.02 <= wn <= 0.8:
+        raise ValueError(f"Normalized cutoff frequency wn={wn} out of valid range.")
+    if out.shape[0] < 3 * (highpass_order + 1):
+        raise ValueError(f"DataFrame {sensor_name} has too few samples ({out.shape[0]}) for filtering. Reduce order or resample to higher sample_rate. (len(df) < 3 * (order + 1))")
+    design = butter_design(highpass_order, highpass_cutoff_freq, highpass_rate, "highpass")
+    out = _filter_block(design, out, hp_pos, chunk_size=highpass_chunk_size)
+
+    # Plausibilitätscheck
+    if not np.isfinite(out).all():
+        log.warning("%s: Filtering produced non-finite values (NaN/Inf).", sensor_name)
+
+    return pd.DataFrame(out, index=_grid_index(grid_ns, step_ns, like=idx), columns=numeric.columns, copy=False)
+
+
+def _column_view(df: pd.DataFrame, columns: list[str], *, index: pd.Index | None = None) -> pd.DataFrame:
+    """
+    Neuer DataFrame aus den Spalten von df (keine Datenkopie; Blöcke bleiben unkonsolidiert).
+    Series statt Arrays: keine Typ-Inferenz (bei object-Spalten sonst eine temporäre Kopie).
+    """
+    if not columns:
+        return pd.DataFrame(index=df.index if index is None else index)
+    view = pd.DataFrame({col: df[col] for col in columns}, copy=False)
+    if index is not None:
+        view.index = index
+    return view
+
+
+def _grid_index(grid_ns: np.ndarray, step_ns: int, *, like: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """DatetimeIndex (Name/Zeitzone wie `like`, freq=step) aus einem int64-ns-Raster."""
+    index = pd.DatetimeIndex(grid_ns.view("datetime64[ns]"), freq=pd.Timedelta(step_ns, unit="ns"), name=like.name).tz_localize("UTC")
+    return index.tz_convert(like.tz) if like.tz is not None else index.tz_localize(None)
+
+
+def _zero_phase(design: FilterDesign, values: np.ndarray, chunk_size: int | None) -> np.ndarray:
+    """Nullphasen-Filter; mit chunk_size blockweise und in-place (values wird überschrieben)."""
+    if chunk_size is None:
+        return zero_phase_filter(design, values)
+    return chunked_zero_phase_filter(design, values, chunk_size=chunk_size, out=values)
+
+
+def _filter_block(design: FilterDesign, block: np.ndarray, positions: list[int], *, chunk_size: int | None = None) -> np.ndarray:
+    """
+    Nullphasen-Filter auf ausgewählten Spalten des Blocks.
+    - chunk_size: spaltenweise in-place, blockweise (keine Kopie in Blockgröße)
+    - sonst: alle Spalten -> Ergebnis ersetzt den Block (keine Zusatzkopie)
+    """
+    if chunk_size is not None:
+        for j in positions:
+            chunked_zero_phase_filter(design, block[:, j], chunk_size=chunk_size, out=block[:, j])
+        return block
+    if len(positions) == block.shape[1]:
+        return zero_phase_filter(design, block)
+    block[:, positions] = zero_phase_filter(design, block[:, positions])
+    return block
+
+
+def _filter_column_positions(numeric: pd.DataFrame, df: pd.DataFrame, include_columns: list[str] | None, *, sensor_name: str, purpose: str) -> list[int]:
+    """Spaltenpositionen (im numerischen Block) der zu filternden Spalten; None = alle numerischen."""
+    if include_columns is None:
+        if numeric.columns.empty:
+            raise ValueError(f"DataFrame {sensor_name} has no more numerical columns to apply the {purpose}.")
+        return list(range(len(numeric.columns)))
+    missing_cols = [col for col in include_columns if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"DataFrame {sensor_name} is missing columns for {purpose}: {missing_cols}")
+    if not all(col in numeric.columns for col in include_columns):
+        raise ValueError(f"DataFrame {sensor_name}: include_columns contains non-numerical columns.")
+    if not include_columns:
+        raise ValueError(f"DataFrame {sensor_name} has no more numerical columns to apply the {purpose}.")
+    return [numeric.columns.get_loc(col) for col in include_columns]
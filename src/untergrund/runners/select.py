@@ -1,13 +1,16 @@
 from typing import Any
 from ..context import Ctx
 from ..pipeline import CtxPipeline
+from ..log import get_logger
 import pandas as pd
 
+log = get_logger("select")
+
 ### run select Pipeline
 def run_select(ctx: "Ctx") -> "Ctx":
-    pipeline = CtxPipeline()
+    pipeline = CtxPipeline.from_config(ctx.config, name="SELECT")
     pipeline.add(select_sensors, source=["sensors", "config"], dest="sensors")
-    return pipeline(ctx)
+    return pipeline.record_reports(pipeline(ctx))
 
 ### Sensoren auswählen
 def select_sensors(sensor_dfs: dict[str, pd.DataFrame], cfg: dict[str, Any]) -> dict[str, pd.DataFrame]:
@@ -16,5 +19,5 @@ def select_sensors(sensor_dfs: dict[str, pd.DataFrame], cfg: dict[str, Any]) ->
     selected_sensors = {sensor: data for sensor, data in sensor_dfs.items() if sensor in sensor_list}
     missing_sensors = [s for s in sensor_list if s not in selected_sensors]
     if missing_sensors:
-        print(f"Folgende Sensoren fehlen in der Aufnahme: {missing_sensors}")
+        log.warning("Folgende Sensoren fehlen in der Aufnahme: %s", missing_sensors)
     return selected_sensors
\ No newline at end of file
@@ -1,18 +1,23 @@
 from typing import Any
 from ..context import Ctx
 from ..pipeline import CtxPipeline
+from ..log import get_logger
 from ..shared.inspect import row_col_nan_dur_freq, head_tail, print_info, print_description, start_end
+from ..shared.windows import build_window_index
 import pandas as pd
 
+log = get_logger("window")
+
 def run_window(ctx: "Ctx") -> "Ctx":
-    pipeline = CtxPipeline()
+    pipeline = CtxPipeline.from_config(ctx.config, name="WINDOW")
     pipeline.add(windowing,source="sensors", dest="features", fn_kwargs={"cfg": ctx.config, "window_key": "cluster"})
+    pipeline.add(window_sample_index, source=["sensors", "features", "artifacts"], dest="artifacts", fn_kwargs={"window_key": "cluster"})
     pipeline.tap(row_col_nan_dur_freq, source="features")
     pipeline.tap(head_tail, source="features")
     pipeline.tap(print_info, source="features")
     pipeline.tap(print_description, source="features")
     pipeline.tap(start_end, source="features")
-    return pipeline(ctx)
+    return pipeline.record_reports(pipeline(ctx))
 
 def windowing(sensors: dict[str, pd.DataFrame], *, cfg: dict[str, Any], duration_s: int = 4, hop_s: int = 2, window_key: str = "default") -> dict[str, pd.DataFrame]:
     """
@@ -28,17 +33,7 @@ def windowing(sensors: dict[str, pd.DataFrame], *, cfg: dict[str, Any], duration
     Returns:
         pd.DataFrame mit Fenster-Informationen (start_utc, end_utc, center_utc)
     """
-    # Konfig werte laden
-    if cfg.get("window_duration_s") is not None:
-        duration_s = cfg["window_duration_s"]
-        print(f"[Info] Using configured window_duration_s={duration_s}s")
-    else:
-        print(f"[Info] Using default window_duration_s={duration_s}s")
-    if cfg.get("window_hop_s") is not None:
-        hop_s = cfg["window_hop_s"]
-        print(f"[Info] Using configured window_hop_s={hop_s}s")
-    else:
-        print(f"[Info] Using default window_hop_s={hop_s}s")
+    duration_s, hop_s = window_params(cfg, duration_s=duration_s, hop_s=hop_s)
 
     # param checks
     if sensors is None or len(sensors) == 0:
@@ -47,36 +42,75 @@ def windowing(sensors: dict[str, pd.DataFrame], *, cfg: dict[str, Any], duration
         raise ValueError("All sensor DataFrames must have at least one row")
     if not all(isinstance(df.index, pd.DatetimeIndex) for df in sensors.values()):
         raise ValueError("All sensor DataFrames must have a DatetimeIndex")
-    if duration_s <= 0 or hop_s <= 0:
-        raise ValueError("duration_s and hop_s must be positive values")
-    if hop_s > duration_s:
-        raise ValueError("hop_s must be less than or equal to duration_s")
-    if duration_s % hop_s != 0:
-        print(f"[Warning] duration should be a multiple of hop for consistent windowing.")
-    
     
     # gemeinsame Zeitspanne aller Sensoren ermitteln (sollte vorher eigentlich schon getrimmt sein)
     t_min: pd.Timestamp = min(df.index.min() for df in sensors.values())
     t_max: pd.Timestamp = max(df.index.max() for df in sensors.values())
-    time_range: pd.DatetimeIndex = pd.date_range(start = t_min, end = t_max - pd.Timedelta(duration_s, 's'), freq=pd.Timedelta(hop_s, unit='s'))
 
     # t min/max checks
     if t_min >= t_max:
         raise ValueError("Invalid sensor data: t_min >= t_max")
     if duration_s > (t_max - t_min).total_seconds():
         raise ValueError("duration_s is larger than the total time range of the sensor data")
-    
+
+    window_df = window_frame(t_min, t_max, duration_s=duration_s, hop_s=hop_s)
+    log.info("Created %s windows from %s to %s with duration %ss and hop %ss.", len(window_df), t_min, t_max, duration_s, hop_s)
+    # TODO: Struktur des window_df gegenüber der Erwartung prüfen
+    return {window_key: window_df}
+
+
+def window_params(cfg: dict[str, Any], *, duration_s: int = 4, hop_s: int = 2) -> tuple[int, int]:
+    """Fensterlänge/-abstand (Sekunden) aus cfg ("window_duration_s"/"window_hop_s"), sonst Defaults; geprüft."""
+    if cfg.get("window_duration_s") is not None:
+        duration_s = cfg["window_duration_s"]
+        log.info("Using configured window_duration_s=%ss", duration_s)
+    else:
+        log.info("Using default window_duration_s=%ss", duration_s)
+    if cfg.get("window_hop_s") is not None:
+        hop_s = cfg["window_hop_s"]
+        log.info("Using configured window_hop_s=%ss", hop_s)
+    else:
+        log.info("Using default window_hop_s=%ss", hop_s)
+
+    if duration_s <= 0 or hop_s <= 0:
+        raise ValueError("duration_s and hop_s must be positive values")
+    if hop_s > duration_s:
+        raise ValueError("hop_s must be less than or equal to duration_s")
+    if duration_s % hop_s != 0:
+        log.warning("duration should be a multiple of hop for consistent windowing.")
+    return duration_s, hop_s
+
+
+def window_frame(start: pd.Timestamp, t_max: pd.Timestamp, *, duration_s: int, hop_s: int, first_id: int = 0) -> pd.DataFrame:
+    """
+    Fenster [start + k*hop, start + k*hop + duration) mit end_utc <= t_max.
+    - Index: fortlaufender Integer (window_id) ab first_id -> Fortsetzung eines bestehenden Rasters
+    - Spalten start_utc, end_utc, center_utc; leer, wenn kein vollständiges Fenster passt
+    """
+    time_range: pd.DatetimeIndex = pd.date_range(start = start, end = t_max - pd.Timedelta(duration_s, 's'), freq=pd.Timedelta(hop_s, unit='s'))
+
     # Fenster-DataFrame erstellen
     window_df = pd.DataFrame()
     window_df.index = time_range 
     window_df["start_utc"] = window_df.index
     window_df["end_utc"] = window_df.index + pd.Timedelta(duration_s, unit='s')
     window_df["center_utc"] = window_df.index + pd.Timedelta(duration_s / 2, unit='s')
-    window_df.index.name = "window_id"
-    window_df.reset_index(drop=True, inplace=True) # index als fortlaufenden Integer("window_id")
+    window_df.index = pd.RangeIndex(first_id, first_id + len(window_df)) # index als fortlaufenden Integer("window_id")
 
     # letztes Fenster  droppen, wenn es unvollständig ist
-    window_df = window_df[window_df["end_utc"] <= t_max]
-    print(f"[Info] Created {len(window_df)} windows from {t_min} to {t_max} with duration {duration_s}s and hop {hop_s}s.")
-    # TODO: Struktur des window_df gegenüber der Erwartung prüfen
-    return {window_key: window_df}
\ No newline at end of file
+    return window_df[window_df["end_utc"] <= t_max]
+
+
+def window_sample_index(sensors: dict[str, pd.DataFrame], features: dict[str, pd.DataFrame], artifacts: dict[str, Any], *, window_key: str = "default") -> dict[str, Any]:
+    """
+    Reporter: bildet jedes Fenster einmalig (searchsorted) auf Sample-Offsets pro Sensor ab.
+    - Ergebnis: artifacts["window_index"][window_key][sensor_name] = {"start", "stop", "n_rows"}
+    - FEATURES schneidet damit per iloc[start:stop] statt per boolescher Maske über die ganze Zeitreihe.
+    - nur kleine int64-Arrays (2 x Anzahl Fenster pro Sensor), keine Sensordaten.
+    """
+    if window_key not in features:
+        raise ValueError(f"window_key '{window_key}' not found in features.")
+    index_map = build_window_index(sensors, features[window_key])
+    log.info("Built window index for %s windows and sensors %s.", len(features[window_key]), list(index_map))
+    window_index = {**artifacts.get("window_index", {}), window_key: index_map}
+    return {**artifacts, "window_index": window_index}
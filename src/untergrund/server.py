@@ -0,0 +1,471 @@
+# server.py
+"""
+Untergrundklassifizierung – HTTP-Ingest für SensorLogger-Push (Flotte)
+
+Zweck
+-----
+Handys schicken ihre Messungen per HTTP-Push (SensorLogger "HTTP Push") an einen Collector.
+IngestServer (asyncio, nur Standardbibliothek) nimmt die Pushes an und verarbeitet
+fertige Fahrten im Hintergrund:
+- POST /push[?session=<id>]          SensorLogger-Push ({"sessionId", "deviceId", "payload": [...]})
+                                     oder Liste flacher Records wie im JSON-Export
+- POST /rides/<id>/finish            Fahrt abschließen -> Verarbeitungs-Queue
+- GET  /rides/<id>                   Status (receiving | queued | running | ok | failed) + Ergebnis
+- GET  /status                       Sessions, Queue-Länge, laufende Fahrten
+Records werden beim Empfang auf Spaltenpuffer pro Sensor verteilt (runners.ingest.SensorBuffers);
+eine abgeschlossene Fahrt ergibt dasselbe Sensor-Dict wie read_json_stream und läuft über
+batch.run_ride (ab SELECT) in einem Worker-Pool.
+
+Backpressure
+------------
+- Queue mit höchstens queue_size Fahrten; in Arbeit sind höchstens max_in_flight
+  (Default: workers). Ist die Queue voll, wartet /finish bis zu put_timeout_s und
+  antwortet sonst 503 + Retry-After; die Fahrt bleibt gepuffert, der Client wiederholt /finish.
+- Puffern offene Sessions mehr als max_buffered_records Records, wird /push mit 503 abgelehnt.
+- Request-Bodies > max_body_bytes -> 413; ohne Content-Length -> 411; ungültige Content-Length -> 400.
+- Sessions ohne Push seit idle_s werden automatisch abgeschlossen.
+- Scheitert die Übergabe an den Pool (oder stirbt ein Worker), gilt die Fahrt als failed und
+  der Slot wird frei; ein defekter eigener ProcessPool wird durch einen neuen ersetzt (wie batch._run_pool).
+
+Verträge
+--------
+- Eine Session = eine Fahrt; input_path der Fahrt-Config ist die Session-ID (Export: ride=<id>).
+- Push-Namen werden auf die Sensor-Namen des Exports abgebildet ("accelerometer" -> "Accelerometer").
+- Ergebnisse (kleine Zusammenfassung wie im Batch) bleiben bis zum Prozessende abrufbar;
+  persistiert werden Fahrten über die EXPORT-Stage.
+
+Aufruf
+------
+    python -m src.untergrund.server --config config.json --port 8000
+
+Config
+------
+    "server": {"host": "127.0.0.1", "port": 8000, "workers": 2, "queue_size": 4, "put_timeout_s": 1.0,
+               "idle_s": 300, "max_body_bytes": 16777216, "max_buffered_records": 5000000, "log_dir": null}
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import _failed, ride_config, run_ride
+from .config import validate_config
+from .log import get_logger
+from .runners.ingest import SensorBuffers, ingest_projection
+
+log = get_logger("server")
+
+SERVER_DEFAULTS: dict[str, Any] = {
+    "host": "127.0.0.1",
+    "port": 8000,
+    "workers": 2,
+    "max_in_flight": None,
+    "queue_size": 4,
+    "put_timeout_s": 1.0,
+    "idle_s": 300,
+    "max_body_bytes": 16 << 20,
+    "max_buffered_records": 5_000_000,
+    "block_size": 1 << 16,
+    "log_dir": None,
+}
+
+# Push-Namen (SensorLogger HTTP Push) -> Sensor-Namen im JSON-Export
+PUSH_SENSOR_NAMES: dict[str, str] = {
+    "accelerometer": "Accelerometer",
+    "accelerometeruncalibrated": "AccelerometerUncalibrated",
+    "gyroscope": "Gyroscope",
+    "gyroscopeuncalibrated": "GyroscopeUncalibrated",
+    "gravity": "Gravity",
+    "orientation": "Orientation",
+    "magnetometer": "Magnetometer",
+    "magnetometeruncalibrated": "MagnetometerUncalibrated",
+    "barometer": "Barometer",
+    "location": "Location",
+    "totalacceleration": "TotalAcceleration",
+}
+
+
+class HTTPError(Exception):
+    """Fehlerantwort (Status + Meldung) aus einem Handler; close=True beendet die Verbindung (Body nicht gelesen)."""
+
+    def __init__(self, status: int, message: str, *, retry_after: float | None = None, close: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.close = close or status in (411, 413)
+
+
+# ---------- Payload ------------------------------------------------------
+
+def push_records(body: Any) -> tuple[str | None, list[dict[str, Any]]]:
+    """
+    (sessionId oder None, flache Records {"sensor", "time", ...}) aus einem Push-Body.
+    - SensorLogger-Push: {"sessionId", "deviceId", "payload": [{"name", "time", "values": {...}}]}
+      -> zusätzlich ein "Metadata"-Record (deviceId, sessionId) am Anfang
+    - Liste flacher Records (Export-Format) -> unverändert
+    """
+    if isinstance(body, list):
+        return None, [rec for rec in body if isinstance(rec, dict)]
+    if not isinstance(body, dict) or not isinstance(body.get("payload"), list):
+        raise ValueError("Push body must be a SensorLogger push object with a 'payload' list or a list of records.")
+    session = body.get("sessionId")
+    records: list[dict[str, Any]] = [{"sensor": "Metadata", "deviceId": body.get("deviceId"), "sessionId": session}]
+    for item in body["payload"]:
+        if not isinstance(item, dict):
+            continue
+        if "sensor" in item:
+            records.append(item)
+            continue
+        name = str(item.get("name", ""))
+        record = {"sensor": PUSH_SENSOR_NAMES.get(name.lower(), name[:1].upper() + name[1:]), "time": item.get("time")}
+        values = item.get("values")
+        if isinstance(values, dict):
+            record.update(values)
+        records.append(record)
+    return None if session is None else str(session), records
+
+
+@dataclass
+class RideSession:
+    """Eine empfangene Fahrt: Spaltenpuffer bis /finish, danach Status + Ergebnis."""
+    session_id: str
+    buffers: SensorBuffers | None
+    last_push: float
+    status: str = "receiving"
+    has_metadata: bool = False
+    result: dict[str, Any] | None = None
+    n_records: int = 0
+
+    def info(self) -> dict[str, Any]:
+        return {"session": self.session_id, "status": self.status, "records": self.n_records, "result": self.result}
+
+
+# ---------- Server -------------------------------------------------------
+
+class IngestServer:
+    """
+    asyncio-HTTP-Server (HTTP/1.1, keep-alive, JSON) mit begrenzter Verarbeitungs-Queue.
+    - executor: Worker-Pool (Default: ProcessPoolExecutor mit server.workers Prozessen, "spawn")
+    - process: Verarbeitung einer Fahrt, (cfg, *, log_path, sensors) -> Zusammenfassung (Default: batch.run_ride)
+    Nutzung:
+        async with IngestServer(cfg) as server:
+            host, port = server.address
+            await server.serve_forever()
+    """
+
+    def __init__(self, cfg: dict[str, Any], *, executor: Executor | None = None, process: Callable[..., dict[str, Any]] = run_ride):
+        self.cfg = cfg
+        self.params = {**SERVER_DEFAULTS, **cfg.get("server", {})}
+        workers = self.params["workers"]
+        if workers < 1:
+            raise ValueError(f"server.workers must be >= 1, got {workers}")
+        if self.params["queue_size"] < 1:
+            raise ValueError(f"server.queue_size must be >= 1, got {self.params['queue_size']}")
+        self.max_in_flight = max(self.params["max_in_flight"] or workers, 1)
+        self._own_executor = executor is None
+        self.executor = executor or self._new_executor()
+        self.process = process
+        self.keep = ingest_projection(cfg)
+        self.sessions: dict[str, RideSession] = {}
+        self.queue: asyncio.Queue[RideSession] | None = None
+        self.in_flight = 0
+        self.address: tuple[str, int] | None = None
+        self._server: asyncio.Server | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def _new_executor(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.params["workers"], mp_context=multiprocessing.get_context("spawn"))
+
+    async def __aenter__(self) -> "IngestServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def start(self) -> tuple[str, int]:
+        self.queue = asyncio.Queue(maxsize=self.params["queue_size"])
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._server = await asyncio.start_server(self._handle_connection, self.params["host"], self.params["port"])
+        self.address = self._server.sockets[0].getsockname()[:2]
+        self._tasks = [asyncio.create_task(self._dispatch()), asyncio.create_task(self._reap_idle())]
+        log.info("Ingest server listening on http://%s:%s (queue %s, in flight %s)", *self.address, self.params["queue_size"], self.max_in_flight)
+        return self.address
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None, "start() first"
+        await self._server.serve_forever()
+
+    async def close(self, *, drain: bool = True) -> None:
+        """Keine neuen Verbindungen; drain=True wartet auf alle eingereihten Fahrten."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if drain and self.queue is not None:
+            await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._own_executor:
+            self.executor.shutdown(wait=drain, cancel_futures=not drain)
+
+    # Sessions
+    def push(self, body: Any, *, session: str | None = None) -> RideSession:
+        session_id, records = push_records(body)
+        session_id = session_id or session
+        if not session_id:
+            raise HTTPError(400, "Missing session id (sessionId in body or ?session=).")
+        ride = self.sessions.get(session_id)
+        if ride is None:
+            ride = self.sessions[session_id] = RideSession(
+                session_id, SensorBuffers(block_size=self.params["block_size"], keep=self.keep), asyncio.get_running_loop().time()
+            )
+        if ride.status != "receiving":
+            raise HTTPError(409, f"Session '{session_id}' is already {ride.status}.")
+        if self.buffered_records() + len(records) > self.params["max_buffered_records"]:
+            raise HTTPError(503, "Too many buffered records, retry later.", retry_after=self.params["put_timeout_s"])
+
+        assert ride.buffers is not None
+        for record in records:
+            if record.get("sensor") == "Metadata":
+                if ride.has_metadata:
+                    continue   # je Push ein Metadata-Record -> nur den ersten behalten
+                ride.has_metadata = True
+            ride.buffers.append(record)
+        ride.n_records = ride.buffers.n_records
+        ride.last_push = asyncio.get_running_loop().time()
+        return ride
+
+    def buffered_records(self) -> int:
+        return sum(s.buffers.n_records for s in self.sessions.values() if s.buffers is not None)
+
+    async def finish(self, session_id: str) -> RideSession:
+        """Fahrt in die Queue; wartet höchstens put_timeout_s auf einen freien Platz (sonst 503)."""
+        assert self.queue is not None
+        ride = self.sessions.get(session_id)
+        if ride is None:
+            raise HTTPError(404, f"Unknown session '{session_id}'.")
+        if ride.status != "receiving":
+            return ride   # idempotent (Client-Wiederholung)
+        if ride.n_records == 0:
+            raise HTTPError(400, f"Session '{session_id}' has no records.")
+        ride.status = "queued"
+        try:
+            await asyncio.wait_for(self.queue.put(ride), timeout=self.params["put_timeout_s"])
+        except TimeoutError:
+            ride.status = "receiving"
+            raise HTTPError(503, "Processing queue is full, retry later.", retry_after=self.params["put_timeout_s"]) from None
+        log.info("Session %s queued (%s records, queue %s/%s).", session_id, ride.n_records, self.queue.qsize(), self.queue.maxsize)
+        return ride
+
+    def status(self) -> dict[str, Any]:
+        assert self.queue is not None
+        counts: dict[str, int] = {}
+        for ride in self.sessions.values():
+            counts[ride.status] = counts.get(ride.status, 0) + 1
+        return {"sessions": counts, "queued": self.queue.qsize(), "queue_size": self.queue.maxsize,
+                "in_flight": self.in_flight, "buffered_records": self.buffered_records()}
+
+    # Verarbeitung
+    async def _dispatch(self) -> None:
+        """Queue -> Worker-Pool, höchstens max_in_flight gleichzeitig (sonst staut sich die Queue)."""
+        assert self.queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()   # erst bei freiem Worker aus der Queue nehmen
+            ride = await self.queue.get()
+            ride.status = "running"
+            self.in_flight += 1
+            buffers, ride.buffers = ride.buffers, None
+            assert buffers is not None
+            executor = self.executor
+            try:
+                sensors = await asyncio.to_thread(buffers.to_frames)
+                log_dir = self.params["log_dir"]
+                log_path = os.fspath(Path(log_dir) / f"{ride.session_id}.log") if log_dir is not None else None
+                future = loop.run_in_executor(executor, partial(self.process, ride_config(self.cfg, ride.session_id), log_path=log_path, sensors=sensors))
+            except Exception as e:   # Übergabe gescheitert -> Slot und Queue-Eintrag trotzdem freigeben
+                self._complete(ride, self._failure(ride, executor, e))
+                continue
+            future.add_done_callback(partial(self._finished, ride, executor))
+
+    def _finished(self, ride: RideSession, executor: Executor, future: asyncio.Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:   # z. B. BrokenProcessPool
+            result = self._failure(ride, executor, e)
+        self._complete(ride, result)
+
+    def _failure(self, ride: RideSession, executor: Executor, error: Exception) -> dict[str, Any]:
+        """Ergebnis einer gescheiterten Fahrt; ersetzt einen defekten eigenen ProcessPool (einmal je Pool)."""
+        if isinstance(error, BrokenProcessPool) and executor is self.executor:
+            if self._own_executor:
+                log.warning("Worker pool broke (session %s), starting a new pool.", ride.session_id)
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._new_executor()
+            else:
+                log.error("Worker pool broke (session %s); the executor was passed in and cannot be replaced.", ride.session_id)
+        return _failed(ride.session_id, f"{type(error).__name__}: {error}")
+
+    def _complete(self, ride: RideSession, result: dict[str, Any]) -> None:
+        assert self.queue is not None and self._slots is not None
+        ride.result = result
+        ride.status = ride.result["status"]
+        self.in_flight -= 1
+        self._slots.release()
+        self.queue.task_done()
+        log.info("Session %s: %s in %.2f s (%s windows)", ride.session_id, ride.status, ride.result.get("total_s", 0.0), ride.result.get("n_windows", 0))
+
+    async def _reap_idle(self) -> None:
+        """Sessions ohne Push seit idle_s abschließen (bei voller Queue beim nächsten Durchlauf)."""
+        assert self.queue is not None
+        idle_s = self.params["idle_s"]
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(idle_s, 5.0))
+            for ride in list(self.sessions.values()):
+                if ride.status == "receiving" and ride.n_records and loop.time() - ride.last_push >= idle_s:
+                    try:
+                        self.queue.put_nowait(ride)
+                    except asyncio.QueueFull:
+                        break
+                    ride.status = "queued"
+                    log.info("Session %s idle for %s s, queued.", ride.session_id, idle_s)
+
+    # HTTP
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await _read_request(reader, max_body=self.params["max_body_bytes"])
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload, extra = await self._route(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    extra = {"Retry-After": str(max(int(-(-e.retry_after // 1)), 1))} if e.retry_after is not None else {}
+                    keep_alive = keep_alive and not e.close
+                writer.write(_response(status, payload, headers=extra, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(self, method: str, target: str, body: bytes) -> tuple[int, dict[str, Any], dict[str, str]]:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        if method == "POST" and parts == ["push"]:
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON: {e}") from None
+            try:
+                ride = self.push(data, session=parse_qs(url.query).get("session", [None])[0])
+            except ValueError as e:
+                raise HTTPError(400, str(e)) from None
+            return 200, {"session": ride.session_id, "records": ride.n_records}, {}
+        if method == "POST" and len(parts) == 3 and parts[0] == "rides" and parts[2] == "finish":
+            ride = await self.finish(parts[1])
+            return 202, ride.info(), {}
+        if method == "GET" and len(parts) == 2 and parts[0] == "rides":
+            ride = self.sessions.get(parts[1])
+            if ride is None:
+                raise HTTPError(404, f"Unknown session '{parts[1]}'.")
+            return 200, ride.info(), {}
+        if method == "GET" and parts == ["status"]:
+            return 200, self.status(), {}
+        raise HTTPError(404, f"No route for {method} {url.path}")
+
+
+async def _read_request(reader: asyncio.StreamReader, *, max_body: int) -> tuple[str, str, dict[str, str], bytes] | None:
+    """Request-Zeile, Header (klein geschrieben) und Body (Content-Length); None bei Verbindungsende."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.") from None
+    headers: dict[str, str] = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = header.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(411, "Chunked bodies are not supported, send Content-Length.")
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length.", close=True)
+    if length > max_body:
+        raise HTTPError(413, f"Body of {length} bytes exceeds max_body_bytes={max_body}.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _response(status: int, payload: dict[str, Any], *, headers: dict[str, str], keep_alive: bool) -> bytes:
+    body = json.dumps(payload, default=str).encode("utf-8")
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        *(f"{k}: {v}" for k, v in headers.items()),
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+# ---------- CLI ----------------------------------------------------------
+
+async def serve(cfg: dict[str, Any]) -> None:
+    async with IngestServer(cfg) as server:
+        await server.serve_forever()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Collect SensorLogger HTTP pushes and process finished rides.")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    validate_config(cfg)
+    overrides = {k: v for k, v in (("host", args.host), ("port", args.port), ("workers", args.workers)) if v is not None}
+    cfg["server"] = {**cfg.get("server", {}), **overrides}
+    try:
+        asyncio.run(serve(cfg))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
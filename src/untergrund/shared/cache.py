@@ -0,0 +1,194 @@
+# cache.py
+"""
+Untergrundklassifizierung – Spaltenbasierter Frame-Store (Cache)
+
+Zweck
+-----
+Persistiert ein Dict[str, DataFrame] (z. B. das Sensor-Dict nach INGEST)
+spaltenweise als `.npy`-Dateien plus `schema.json` und lädt es wieder.
+- Laden ist ein reiner Binär-Read pro Spalte (optional per np.memmap),
+  kein erneutes JSON-Parsen.
+- Ablage inhaltsadressiert: der Schlüssel ergibt sich aus dem Hash der
+  Eingabedatei und den Parametern, die das Ergebnis beeinflussen.
+
+Layout
+------
+<cache_dir>/<key>/
+    schema.json          Frames, Spalten, Dtypes, Index, Zusatzinfos
+    f<i>/c<j>.npy        Spalte j von Frame i (numerisch / int64-ns)
+    f<i>/index.npy       Index (nur wenn kein RangeIndex)
+
+Verträge
+--------
+- Numerische Spalten und (tz-aware) Datetime-Spalten/-Indizes werden binär
+  gespeichert; object-Spalten nur, wenn konstant oder JSON-serialisierbar
+  (z. B. Spalte "sensor", Metadaten) – sonst ValueError.
+- Schreiben ist atomar (temporäres Verzeichnis + os.replace).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+_FORMAT_VERSION = 1
+
+type MmapMode = Literal["r", "r+", "c"] | None
+
+
+# ---------- Hashes -------------------------------------------------------
+
+def file_digest(path: str | os.PathLike) -> str:
+    """
+    Inhalts-Hash (BLAKE2b, 128 bit, hex) einer Datei.
+    - pro (Pfad, Größe, mtime) nur einmal berechnet (große Rides werden nicht mehrfach gelesen)
+    """
+    st = os.stat(path)
+    return _file_digest(os.fspath(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def cache_key(digest: str, params: dict[str, Any]) -> str:
+    """Schlüssel aus Input-Hash + ergebnisrelevanten Parametern (JSON, sortiert)."""
+    payload = json.dumps({"digest": digest, "params": params}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ---------- Spalten kodieren ---------------------------------------------
+
+def _save_array(folder: Path, stem: str, values: Any) -> dict[str, Any]:
+    """Schreibt eine Spalte/einen Index und gibt den Schema-Eintrag zurück."""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        tz = str(values.dtype.tz) if isinstance(values.dtype, pd.DatetimeTZDtype) else None
+        ns = pd.DatetimeIndex(values).as_unit("ns").asi8
+        np.save(folder / f"{stem}.npy", ns)
+        freq = values.freqstr if isinstance(values, pd.DatetimeIndex) else None
+        return {"kind": "datetime", "tz": tz, "freq": freq}
+
+    arr = np.asarray(values)
+    if arr.dtype != object:
+        np.save(folder / f"{stem}.npy", arr, allow_pickle=False)
+        return {"kind": "array", "dtype": arr.dtype.str}
+
+    # object: konstant -> nur ein Wert, sonst (kleine) JSON-Liste
+    if len(arr) > 0 and (arr == arr[0]).all():
+        return {"kind": "const", "value": arr[0].item() if isinstance(arr[0], np.generic) else arr[0]}
+    try:
+        values_list = [v.item() if isinstance(v, np.generic) else v for v in arr]
+        json.dumps(values_list)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Column '{stem}' with object dtype cannot be cached.") from e
+    return {"kind": "list", "values": values_list}
+
+
+def _load_array(folder: Path, stem: str, spec: dict[str, Any], n_rows: int, mmap_mode: MmapMode) -> Any:
+    kind = spec["kind"]
+    if kind == "datetime":
+        ns = np.load(folder / f"{stem}.npy")
+        index = pd.DatetimeIndex(ns.view("datetime64[ns]"), freq=spec.get("freq"))
+        return index.tz_localize("UTC").tz_convert(spec["tz"]) if spec["tz"] else index
+    if kind == "array":
+        return np.load(folder / f"{stem}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+    if kind == "const":
+        return np.full(n_rows, spec["value"], dtype=object)
+    if kind == "list":
+        return np.array(spec["values"], dtype=object)
+    raise ValueError(f"Unknown column kind '{kind}' in cache schema.")
+
+
+# ---------- Frames speichern / laden -------------------------------------
+
+def save_frames(
+    directory: str | os.PathLike,
+    frames: dict[str, pd.DataFrame],
+    *,
+    extra: dict[str, Any] | None = None,
+    overwrite: bool = True,
+) -> Path:
+    """
+    Speichert frames spaltenweise unter directory (atomar).
+    - extra: zusätzliche (JSON-fähige) Infos für schema.json, z. B. Input-Pfad/Hash
+    - overwrite=False: ein vollständiger Eintrag unter directory bleibt stehen (inhaltsadressierte
+      Einträge, parallele Writer) -> die eigene Kopie wird verworfen
+    """
+    target = Path(directory)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    schema: dict[str, Any] = {"format": _FORMAT_VERSION, "frames": [], "extra": extra or {}}
+    try:
+        for i, (name, df) in enumerate(frames.items()):
+            folder = tmp / f"f{i}"
+            folder.mkdir()
+            if isinstance(df.index, pd.RangeIndex):
+                index_spec = {"kind": "range", "start": df.index.start, "step": df.index.step}
+            else:
+                index_spec = _save_array(folder, "index", df.index)
+            index_spec["name"] = df.index.name
+            columns = []
+            for j, col in enumerate(df.columns):
+                spec = _save_array(folder, f"c{j}", df[col])
+                columns.append({"name": col, **spec})
+            schema["frames"].append({"name": name, "n_rows": len(df), "index": index_spec, "columns": columns})
+        (tmp / "schema.json").write_text(json.dumps(schema, indent=1, default=str), encoding="utf-8")
+        if target.exists() and (overwrite or not has_frames(target)):
+            shutil.rmtree(target)
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            if overwrite or not has_frames(target):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)   # ein anderer Writer war schneller
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return target
+
+
+def load_frames(directory: str | os.PathLike, *, mmap_mode: MmapMode = None) -> dict[str, pd.DataFrame]:
+    """
+    Lädt ein mit save_frames gespeichertes Dict[str, DataFrame].
+    - mmap_mode="r": numerische Spalten als np.memmap (read-only, lazy)
+    """
+    source = Path(directory)
+    schema = read_schema(source)
+    frames: dict[str, pd.DataFrame] = {}
+    for i, frame in enumerate(schema["frames"]):
+        folder = source / f"f{i}"
+        n_rows = frame["n_rows"]
+        index_spec = frame["index"]
+        if index_spec["kind"] == "range":
+            start, step = index_spec["start"], index_spec["step"]
+            index = pd.RangeIndex(start, start + n_rows * step, step)
+        else:
+            index = pd.Index(_load_array(folder, "index", index_spec, n_rows, mmap_mode))
+        index.name = index_spec["name"]
+        data = {col["name"]: _load_array(folder, f"c{j}", col, n_rows, mmap_mode) for j, col in enumerate(frame["columns"])}
+        frames[frame["name"]] = pd.DataFrame(data, index=index, columns=[col["name"] for col in frame["columns"]], copy=False)
+    return frames
+
+
+def read_schema(directory: str | os.PathLike) -> dict[str, Any]:
+    """Liest schema.json eines Cache-Eintrags (ValueError bei fremdem Format)."""
+    schema = json.loads((Path(directory) / "schema.json").read_text(encoding="utf-8"))
+    if schema.get("format") != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache format {schema.get('format')} in {directory}")
+    return schema
+
+
+def has_frames(directory: str | os.PathLike) -> bool:
+    """True, wenn unter directory ein vollständiger Cache-Eintrag liegt."""
+    return (Path(directory) / "schema.json").is_file()
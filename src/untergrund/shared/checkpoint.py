@@ -0,0 +1,119 @@
+# checkpoint.py
+"""
+Untergrundklassifizierung – Stage-Checkpoints
+
+Zweck
+-----
+Jede Stage ist eine reine Funktion (Ctx_vorher, config) -> Ctx. Daher lässt
+sich ihr Ergebnis eindeutig über einen Fingerprint adressieren:
+
+    fp(stage) = hash(fp(vorherige Stage), relevante Config-Keys der Stage, Code-Hash)
+
+INGEST nimmt zusätzlich den Inhalts-Hash der Eingabedatei auf. Ändert sich
+z. B. nur `window_duration_s`, bleiben die Fingerprints bis PREPROCESS gleich
+und der Orchestrator setzt nach dem PREPROCESS-Checkpoint wieder auf.
+
+Ablage
+------
+<checkpoint_dir>/<STAGE>-<fp>/
+    sensors/     Frame-Store (shared.cache)
+    features/    Frame-Store (shared.cache)
+    state.pkl    meta, preds, artifacts (kleine Objekte)
+
+`config` wird nie gespeichert, sondern immer aus dem aktuellen Lauf übernommen.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from ..context import Ctx
+from ..stages import Stage
+from .cache import MmapMode, file_digest, has_frames, load_frames, save_frames
+
+# Config-Keys, die das Ergebnis einer Stage beeinflussen (Rest wirkt erst später)
+STAGE_CONFIG_KEYS: dict[Stage, tuple[str, ...]] = {
+    Stage.INGEST: ("input_path", "sensor_list", "ingest"),
+    Stage.SELECT: ("sensor_list",),
+    Stage.PREPROCESS: ("fused_imu", "anti_aliasing_lowpass", "resample_imu", "resample_location", "trim_to_common_timeframe", "hp_filters"),
+    Stage.WINDOW: ("window_duration_s", "window_hop_s"),
+    Stage.FEATURES: ("velocity_normalization",),
+    Stage.MODEL: ("model",),
+}
+
+# EXPORT hat Seiteneffekte (Dateien) und läuft immer
+CHECKPOINT_STAGES: tuple[Stage, ...] = tuple(STAGE_CONFIG_KEYS)
+
+
+@lru_cache(maxsize=1)
+def code_digest() -> str:
+    """Hash über alle Quelldateien des Pakets -> Code-Änderungen invalidieren Checkpoints."""
+    root = Path(__file__).resolve().parent.parent
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted(root.rglob("*.py")):
+        h.update(path.relative_to(root).as_posix().encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def stage_fingerprints(cfg: dict[str, Any]) -> dict[Stage, str]:
+    """Verketteter Fingerprint pro Stage (nur CHECKPOINT_STAGES)."""
+    fps: dict[Stage, str] = {}
+    upstream = code_digest()
+    for stage in CHECKPOINT_STAGES:
+        subset = {key: cfg.get(key) for key in STAGE_CONFIG_KEYS[stage]}
+        if stage is Stage.INGEST:
+            subset["input_digest"] = file_digest(cfg["input_path"])
+        payload = json.dumps({"stage": stage.name, "upstream": upstream, "config": subset}, sort_keys=True, default=str)
+        upstream = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+        fps[stage] = upstream
+    return fps
+
+
+def checkpoint_path(checkpoint_dir: str | os.PathLike, stage: Stage, fingerprint: str) -> Path:
+    return Path(checkpoint_dir) / f"{stage.name}-{fingerprint}"
+
+
+def has_checkpoint(path: str | os.PathLike) -> bool:
+    """True, wenn der Checkpoint vollständig geschrieben wurde."""
+    return (Path(path) / "state.pkl").is_file()
+
+
+def save_checkpoint(path: str | os.PathLike, ctx: Ctx) -> Path:
+    """Schreibt sensors/features als Frame-Store, meta/preds/artifacts per pickle (atomar)."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    try:
+        save_frames(tmp / "sensors", ctx.sensors)
+        save_frames(tmp / "features", ctx.features)
+        with open(tmp / "state.pkl", "wb") as f:
+            pickle.dump({"meta": ctx.meta, "preds": ctx.preds, "artifacts": ctx.artifacts}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(tmp, target)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return target
+
+
+def load_checkpoint(path: str | os.PathLike, *, config: dict[str, Any], mmap_mode: MmapMode = None) -> Ctx:
+    """
+    Lädt einen Checkpoint als Ctx; config kommt aus dem aktuellen Lauf.
+    - mmap_mode="r": Sensor-Spalten memory-mapped (wie der Sensor-Store)
+    """
+    source = Path(path)
+    with open(source / "state.pkl", "rb") as f:
+        state = pickle.load(f)
+    sensors = load_frames(source / "sensors", mmap_mode=mmap_mode) if has_frames(source / "sensors") else {}
+    features = load_frames(source / "features") if has_frames(source / "features") else {}
+    return replace(Ctx(config=config), sensors=sensors, features=features, **state)
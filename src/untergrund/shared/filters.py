@@ -0,0 +1,154 @@
+# filters.py
+"""
+Untergrundklassifizierung – Filter-Design-Registry
+
+Zweck
+-----
+Butterworth-SOS-Entwürfe werden pro (order, cutoff_freq, sample_rate, btype)
+genau einmal berechnet (lru_cache) und zusammen mit den Anfangsbedingungen
+(sosfilt_zi) wiederverwendet – über Sensoren, Fahrten (Batch) und
+Notebook-Läufe hinweg sowie später pro Chunk beim Streaming.
+
+Verträge
+--------
+- Entwürfe sind geteilt und daher read-only (sos/zi nicht beschreibbar);
+  scipy.sosfilt verlangt beschreibbare Koeffizienten -> writable_sos() (3x6-Kopie).
+- zero_phase_filter entspricht exakt scipy.signal.sosfiltfilt
+  (padtype="odd", Standard-padlen), nutzt aber die vorberechneten zi.
+- chunked_zero_phase_filter liefert dasselbe Ergebnis blockweise: der
+  IIR-Zustand wird zwischen den Blöcken weitergereicht (kein Überlappungsfehler),
+  Speicherbedarf O(chunk_size); Ein-/Ausgabe dürfen np.memmap sein.
+- causal_filter (Streaming) filtert nur vorwärts (sosfilt) und reicht den Zustand
+  von Block zu Block weiter: blockweise == am Stück, aber mit Phasenverzug.
+- Gefiltert wird immer entlang axis=0 (Samples x Spalten).
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+type BType = Literal["lowpass", "highpass"]
+
+
+@dataclass(frozen=True, slots=True)
+class FilterDesign:
+    """Butterworth-Entwurf als SOS inkl. sosfilt-Anfangsbedingungen."""
+    sos: np.ndarray         # (n_sections, 6)
+    zi: np.ndarray          # (n_sections, 2), Anfangszustand für Sprungantwort 1
+    order: int
+    wn: float               # normierte Grenzfrequenz (Nyquist = 1)
+    btype: str
+    padlen: int             # Randfortsetzung wie sosfiltfilt
+
+
+@lru_cache(maxsize=256)
+def butter_design(order: int, cutoff_freq: float, sample_rate: float, btype: BType) -> FilterDesign:
+    """
+    Memoisierter Butterworth-Entwurf.
+    - wn = cutoff_freq / (sample_rate / 2), Gültigkeit prüft der Aufrufer
+    """
+    wn = cutoff_freq / (sample_rate / 2)
+    sos = butter(order, wn, btype=btype, output="sos")
+    zi = sosfilt_zi(sos)
+    ntaps = 2 * len(sos) + 1 - min(int((sos[:, 2] == 0).sum()), int((sos[:, 5] == 0).sum()))
+    sos.setflags(write=False)
+    zi.setflags(write=False)
+    return FilterDesign(sos=sos, zi=zi, order=order, wn=wn, btype=btype, padlen=3 * ntaps)
+
+
+def writable_sos(design: FilterDesign) -> np.ndarray:
+    """Beschreibbare Kopie der SOS-Koeffizienten für scipy.signal-Funktionen."""
+    return np.array(design.sos)
+
+
+def filter_design_cache_info():
+    """Trefferstatistik der Registry (functools-CacheInfo)."""
+    return butter_design.cache_info()
+
+
+def _odd_ext(x: np.ndarray, n: int) -> np.ndarray:
+    """Punktsymmetrische Fortsetzung um n Samples an beiden Enden (wie scipy odd_ext)."""
+    left = 2 * x[:1] - x[n:0:-1]
+    right = 2 * x[-1:] - x[-2:-(n + 2):-1]
+    return np.concatenate((left, x, right), axis=0)
+
+
+def zero_phase_filter(design: FilterDesign, x: np.ndarray) -> np.ndarray:
+    """
+    Vorwärts-Rückwärts-Filterung (Nullphase) entlang axis=0, identisch zu
+    sosfiltfilt(design.sos, x, axis=0), aber mit dem vorberechneten zi.
+    """
+    edge = design.padlen
+    if x.shape[0] <= edge:
+        raise ValueError(f"The length of the input vector x must be greater than padlen, which is {edge}.")
+    sos = writable_sos(design)
+    ext = _odd_ext(x, edge)
+    zi = design.zi.reshape((len(sos), 2) + (1,) * (x.ndim - 1))
+    y, _ = sosfilt(sos, ext, axis=0, zi=zi * ext[:1])
+    y, _ = sosfilt(sos, y[::-1], axis=0, zi=zi * y[-1:])
+    return y[::-1][edge:-edge]
+
+
+def chunked_zero_phase_filter(
+    design: FilterDesign,
+    x: np.ndarray,
+    *,
+    chunk_size: int = 1 << 16,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Nullphasen-Filterung in Blöcken von chunk_size Samples (entlang axis=0).
+    - Vorwärtslauf: Blöcke aufsteigend, Zustand zf -> zi des nächsten Blocks, Ergebnis nach out
+    - Rückwärtslauf: Blöcke absteigend über out (in-place), Zustand analog
+    - Randfortsetzung (odd, padlen) wie sosfiltfilt -> Ergebnis identisch zu zero_phase_filter
+    - out: Zielarray gleicher Form (z. B. np.memmap); out=x filtert in-place
+    """
+    n = x.shape[0]
+    edge = design.padlen
+    if n <= edge:
+        raise ValueError(f"The length of the input vector x must be greater than padlen, which is {edge}.")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    if out is None:
+        out = np.empty(x.shape, dtype=np.float64)
+    elif out.shape != x.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {x.shape}")
+
+    sos = writable_sos(design)
+    zi = design.zi.reshape((len(sos), 2) + (1,) * (x.ndim - 1))
+    # Randfortsetzungen vorab aus dem Original (out darf x sein)
+    head = np.asarray(x[: edge + 1], dtype=np.float64)
+    tail = np.asarray(x[n - edge - 1:], dtype=np.float64)
+    left = 2 * head[:1] - head[edge:0:-1]
+    right = 2 * tail[-1:] - tail[-2::-1]
+
+    # Vorwärts
+    _, z = sosfilt(sos, left, axis=0, zi=zi * left[:1])
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        out[start:stop], z = sosfilt(sos, np.asarray(x[start:stop], dtype=np.float64), axis=0, zi=z)
+    y_right, _ = sosfilt(sos, right, axis=0, zi=z)
+
+    # Rückwärts (über die rechte Fortsetzung in den Hauptteil hinein)
+    _, z = sosfilt(sos, y_right[::-1], axis=0, zi=zi * y_right[-1:])
+    for stop in range(n, 0, -chunk_size):
+        start = max(stop - chunk_size, 0)
+        y, z = sosfilt(sos, np.asarray(out[start:stop])[::-1], axis=0, zi=z)
+        out[start:stop] = y[::-1]
+    return out
+
+
+def causal_filter(design: FilterDesign, x: np.ndarray, z: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Kausale Filterung eines Blocks entlang axis=0 (sosfilt, nur vorwärts) für Live-Daten.
+    - z=None: eingeschwungener Start auf x[0] (zi * x[0]), sonst Endzustand des vorigen Blocks
+    Gibt (y, zf) zurück; zf ist der Zustand für den nächsten Block.
+    """
+    sos = writable_sos(design)
+    if z is None:
+        zi = design.zi.reshape((len(sos), 2) + (1,) * (x.ndim - 1))
+        z = zi * x[:1]
+    return sosfilt(sos, x, axis=0, zi=z)
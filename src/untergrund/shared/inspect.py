@@ -1,11 +1,21 @@
 
 from typing import cast, Optional
+import io
 import pandas as pd
+from ..log import diagnostic, get_logger
+from ..pipeline import readonly_tap
 from ..shared.sensors import inspect_all_sensors
 
+# Alle Inspektoren sind Diagnose-Ausgaben (DEBUG): CtxPipeline.tap überspringt sie
+# samt Kopie, solange config["log_level"] nicht "DEBUG" ist. Aktiv erhalten sie
+# read-only Views statt einer tiefen Kopie (@readonly_tap).
+log = get_logger("inspect")
+
 
 ### Zeilen, Spalten, NaNs, Frequenz pro Sensor ausgeben
 @inspect_all_sensors
+@diagnostic
+@readonly_tap
 def row_col_nan_dur_freq(sensor: pd.DataFrame, *, sensor_name: str) -> None:
     '''TAP FUNKTION: Gibt Details zu jedem Sensor als Tabelle aus.'''
     # Alternative Frequenzschätzung, falls pd.infer_freq nicht inferieren kann
@@ -45,45 +55,48 @@ def estimate_freq_alternative(index: pd.DatetimeIndex, exact: bool = False) -> s
         else:
             freq = "not inferable"
 
-    print("++" + "-"*22 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*17 + "+" + "-"*26 + "++")
-    print(f"||  {sensor_name:<20}|  rows={row:>7}  |  cols={col:>7}  |  NaNs={nan_count:>7}  |  dur={dur:>9}  |  freq={freq:<17}  ||")
-    print("++" + "-"*22 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*17 + "+" + "-"*26 + "++")
+    border = "++" + "-"*22 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*16 + "+" + "-"*17 + "+" + "-"*26 + "++"
+    row_line = f"||  {sensor_name:<20}|  rows={row:>7}  |  cols={col:>7}  |  NaNs={nan_count:>7}  |  dur={dur:>9}  |  freq={freq:<17}  ||"
+    log.debug("\n%s\n%s\n%s", border, row_line, border)
     return None
 
 @inspect_all_sensors
+@diagnostic
+@readonly_tap
 def head_tail(sensor: pd.DataFrame, *, sensor_name: str, n: int = 3) -> None:
     '''TAP FUNKTION: Gibt die ersten und letzten n=3 Zeilen jedes Sensors aus.'''
     len_name = len(sensor_name) + 20
-    print(f"===== Sensor: {sensor_name} =====")
-    print(sensor.head(n))
-    print(sensor.tail(n))
-    print("-"*len_name)
+    log.debug("===== Sensor: %s =====\n%s\n%s\n%s", sensor_name, sensor.head(n), sensor.tail(n), "-"*len_name)
     return None
 
 @inspect_all_sensors
+@diagnostic
+@readonly_tap
 def print_info(sensor: pd.DataFrame, *, sensor_name: str) -> None:
     '''TAP FUNKTION: Gibt info() zu jedem Sensor aus.'''
     len_name = len(sensor_name) + 20
-    print(f"===== Sensor: {sensor_name} =====")
-    print(sensor.info())
-    print("-"*len_name)
+    buffer = io.StringIO()
+    sensor.info(buf=buffer)
+    log.debug("===== Sensor: %s =====\n%s%s", sensor_name, buffer.getvalue(), "-"*len_name)
     return None
 
 @inspect_all_sensors
+@diagnostic
+@readonly_tap
 def print_description(sensor: pd.DataFrame, *, sensor_name: str) -> None:
     '''TAP FUNKTION: Gibt describe() zu jedem Sensor aus.'''
     len_name = len(sensor_name) + 20
-    print(f"===== Sensor: {sensor_name} =====")
-    print(sensor.describe())
-    print("-"*len_name)
+    log.debug("===== Sensor: %s =====\n%s\n%s", sensor_name, sensor.describe(), "-"*len_name)
     return None
 
 @inspect_all_sensors
+@diagnostic
+@readonly_tap
 def start_end(sensor: pd.DataFrame, *, sensor_name: str) -> None:
     '''TAP FUNKTION: Gibt Start- und Endzeitpunkt jedes Sensors aus.'''
     start = str(sensor.index[0])
     end = str(sensor.index[-1])
     length = str(sensor.index[-1] - sensor.index[0]).split()[-1].strip()
-    print(f"Sensor: {sensor_name:<20} Start= {start:<37} Ende= {end:<37} Länge= {length}")
+    log.debug("Sensor: %-20s Start= %-37s Ende= %-37s Länge= %s", sensor_name, start, end, length)
     return None
 
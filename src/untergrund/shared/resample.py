@@ -0,0 +1,194 @@
+# resample.py
+"""
+Untergrundklassifizierung – Resampling auf NumPy-Arrays
+
+Zweck
+-----
+Resampling-Kerne für die IMU-Aufbereitung: arbeiten direkt auf
+int64-Nanosekunden-Zeitstempeln und einem float64-Block (Samples x Spalten)
+statt auf pandas-Resample-Groupern.
+
+Pfade (resample_imu.method)
+---------------------------
+- "bin":    Bin-Aggregation + Interpolation leerer Bins (bisheriges Verhalten)
+- "interp": Jitter-Korrektur, np.interp auf das Zielraster (keine Glättung)
+- "poly":   echtes Downsampling, Jitter-Korrektur auf ein ganzzahliges Vielfaches
+            der Zielrate + scipy.signal.resample_poly (Polyphasen-FIR als Anti-Aliasing)
+- "auto":   "interp", wenn Quellrate ≈ Zielrate (± jitter_tolerance) oder Upsampling,
+            sonst "poly"
+
+Verträge
+--------
+- Zeitstempel: int64 ns seit Epoch (UTC), streng monoton steigend.
+- Werte: 2D float64 (Samples x Spalten), keine NaN.
+- Zielraster: Vielfache von step_ns ab Epoch (entspricht origin="epoch").
+"""
+
+from typing import Literal, cast
+
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.signal import resample_poly
+
+type AggFunc = Literal["mean", "median", "first", "last"]
+type InterpMethod = Literal["linear", "time", "nearest", "pad"]
+type ResampleMethod = Literal["bin", "interp", "poly", "auto"]
+
+RESAMPLE_METHODS: tuple[str, ...] = ("bin", "interp", "poly", "auto")
+
+
+def bin_resample(
+    t_ns: np.ndarray,
+    values: np.ndarray,
+    step_ns: int,
+    *,
+    agg_func: AggFunc = "mean",
+    interp_method: InterpMethod = "time",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregiert Samples in Bins [k*step, (k+1)*step) und füllt leere Bins.
+    - entspricht df.resample(step, origin="epoch", label="left", closed="left").agg(agg_func)
+      gefolgt von .interpolate(interp_method)
+    Gibt (grid_ns, out) zurück; out hat Form (len(grid_ns), values.shape[1]).
+    """
+    if len(t_ns) == 0:
+        raise ValueError("bin_resample: no samples to resample")
+    bins = np.floor_divide(t_ns, step_ns)
+    codes = bins - bins[0]
+    n_bins = int(codes[-1]) + 1
+    grid_ns = (bins[0] + np.arange(n_bins, dtype=np.int64)) * step_ns
+
+    # Bin-Grenzen (Zeitstempel sind sortiert -> Bins sind zusammenhängend)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    filled = codes[starts]
+
+    if agg_func == "mean":
+        counts = np.diff(np.r_[starts, len(codes)])
+        binned = np.add.reduceat(values, starts, axis=0) / counts[:, None]
+    elif agg_func == "first":
+        binned = values[starts]
+    elif agg_func == "last":
+        binned = values[np.r_[starts[1:] - 1, len(codes) - 1]]
+    elif agg_func == "median":
+        binned = pd.DataFrame(values).groupby(codes, sort=False).median().to_numpy()
+    else:
+        raise ValueError(f"Unknown aggregation method: {agg_func}")
+
+    if len(filled) == n_bins:
+        return grid_ns, np.ascontiguousarray(binned, dtype=np.float64)
+
+    out = np.empty((n_bins, values.shape[1]), dtype=np.float64)
+    out[filled] = binned
+    missing = np.ones(n_bins, dtype=bool)
+    missing[filled] = False
+    if interp_method in ("time", "linear"):
+        # gleichmäßiges Raster -> "linear" und "time" sind identisch; Bin-Positionen statt ns
+        # (float64 kann ns-Zeitstempel ab 2^53 nicht exakt darstellen)
+        pos = np.flatnonzero(missing)
+        for j in range(out.shape[1]):
+            out[missing, j] = np.interp(pos, filled, binned[:, j])
+    elif interp_method == "pad":
+        # erster Bin ist immer belegt -> vorheriger belegter Bin existiert
+        prev = np.searchsorted(filled, np.flatnonzero(missing), side="right") - 1
+        out[missing] = binned[prev]
+    elif interp_method == "nearest":
+        pos = np.flatnonzero(missing)
+        right = np.searchsorted(filled, pos, side="left")
+        left = right - 1
+        use_right = (filled[right] - pos) < (pos - filled[left])
+        out[missing] = binned[np.where(use_right, right, left)]
+    else:
+        raise ValueError(f"Unknown interpolation method: {interp_method}")
+    return grid_ns, out
+
+
+def source_rate(t_ns: np.ndarray) -> float:
+    """Nominale Abtastrate in Hz (Median der Zeitabstände)."""
+    if len(t_ns) < 2:
+        raise ValueError("source_rate: not enough samples to estimate sampling rate")
+    return 1e9 / float(np.median(np.diff(t_ns)))
+
+
+def interp_columns(t_ns: np.ndarray, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Lineare Interpolation aller Spalten an den Zeitpunkten t_ns[0] + offsets (ns, float64).
+    - t_ns: int64 ns, streng monoton; values: (Samples x Spalten) float64
+    - Ergebnis: (len(offsets) x Spalten) float64; außerhalb [t_ns[0], t_ns[-1]] Randwerte (np.interp)
+    Relativ zu t_ns[0] gerechnet, da float64 absolute ns-Zeitstempel nicht exakt darstellt.
+    Gemeinsamer Kern von interp_resample/poly_resample und dem blockweisen
+    Online-Resampling (streaming.OnlineResampler).
+    """
+    xp = (t_ns - t_ns[0]).astype(np.float64)
+    out = np.empty((len(offsets), values.shape[1]), dtype=np.float64)
+    for j in range(values.shape[1]):
+        out[:, j] = np.interp(offsets, xp, values[:, j])
+    return out
+
+
+def interp_resample(t_ns: np.ndarray, values: np.ndarray, step_ns: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Jitter-Korrektur: lineare Interpolation auf das Epoch-Raster innerhalb [t_first, t_last].
+    Keine Aggregation -> das Spektrum bleibt (bis auf Interpolation) unverändert.
+    """
+    first = -(-int(t_ns[0]) // step_ns)   # ceil
+    last = int(t_ns[-1]) // step_ns
+    if last < first:
+        raise ValueError("interp_resample: time span shorter than one target step")
+    grid_ns = np.arange(first, last + 1, dtype=np.int64) * step_ns
+    return grid_ns, interp_columns(t_ns, values, (grid_ns - t_ns[0]).astype(np.float64))
+
+
+def poly_resample(t_ns: np.ndarray, values: np.ndarray, step_ns: int, *, jitter_tolerance: float = 0.05) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsampling: Jitter-Korrektur auf das `down`-fache der Zielrate (ausgerichtet am
+    Epoch-Raster), danach resample_poly(up=1, down). Ausgabe-Sample i liegt exakt auf
+    grid_ns[i]; der Polyphasen-FIR übernimmt das Anti-Aliasing.
+    """
+    target_rate = 1e9 / step_ns
+    down = max(math.ceil(source_rate(t_ns) / target_rate - jitter_tolerance), 1)
+    first = -(-int(t_ns[0]) // step_ns)
+    fine_step = step_ns / down
+    n_fine = int((t_ns[-1] - first * step_ns) // fine_step) + 1
+    if n_fine < 1:
+        raise ValueError("poly_resample: time span shorter than one target step")
+    # Zwischenraster relativ zu t_ns[0] (Schritt ggf. nicht ganzzahlig in ns)
+    fine = (first * step_ns - int(t_ns[0])) + np.arange(n_fine, dtype=np.float64) * fine_step
+    regular = interp_columns(t_ns, values, fine)
+    out = regular if down == 1 else resample_poly(regular, 1, down, axis=0, padtype="line")
+    grid_ns = (first + np.arange(out.shape[0], dtype=np.int64)) * step_ns
+    return grid_ns, np.ascontiguousarray(out, dtype=np.float64)
+
+
+def select_resample_path(rate: float, target_rate: float, *, jitter_tolerance: float = 0.05) -> str:
+    """Pfad für method="auto": "interp" bei Jitter/Upsampling, sonst "poly"."""
+    if rate <= target_rate * (1 + jitter_tolerance):
+        return "interp"
+    return "poly"
+
+
+def resample_block(
+    t_ns: np.ndarray,
+    values: np.ndarray,
+    step_ns: int,
+    *,
+    method: ResampleMethod = "bin",
+    agg_func: AggFunc = "mean",
+    interp_method: InterpMethod = "time",
+    jitter_tolerance: float = 0.05,
+) -> tuple[np.ndarray, np.ndarray, str]:
+    """
+    Einstiegspunkt für alle Pfade. Gibt (grid_ns, out, verwendeter Pfad) zurück.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resample method: {method} (expected one of {RESAMPLE_METHODS})")
+    if method == "auto":
+        method = cast(ResampleMethod, select_resample_path(source_rate(t_ns), 1e9 / step_ns, jitter_tolerance=jitter_tolerance))
+    if method == "bin":
+        grid_ns, out = bin_resample(t_ns, values, step_ns, agg_func=agg_func, interp_method=interp_method)
+    elif method == "interp":
+        grid_ns, out = interp_resample(t_ns, values, step_ns)
+    else:
+        grid_ns, out = poly_resample(t_ns, values, step_ns, jitter_tolerance=jitter_tolerance)
+    return grid_ns, out, method
@@ -0,0 +1,83 @@
+# sensor_store.py
+"""
+Untergrundklassifizierung – Memory-mapped Sensor-Store
+
+Zweck
+-----
+Optionale Ablage von Ctx.sensors auf der Platte am Ende von PREPROCESS
+(config["sensor_store"]["enabled"]). Danach referenzieren die DataFrames in
+Ctx.sensors read-only np.memmap-Spalten:
+- WINDOW/FEATURES lesen Slices direkt aus dem Page-Cache (kein zweites Exemplar im RAM)
+- Fahrten größer als der Arbeitsspeicher werden möglich
+- parallele Worker, die denselben Store öffnen, teilen sich eine physische Kopie
+
+Layout
+------
+<store_dir>/<fingerprint>/   Frame-Store aus shared.cache (eine .npy pro Spalte,
+                             Zeitindex als int64 ns)
+fingerprint = PREPROCESS-Fingerprint aus shared.checkpoint
+(Input-Hash + relevante Config + Code-Hash).
+
+Verträge
+--------
+- Spalten sind read-only; Steps nach PREPROCESS dürfen Sensor-Frames nicht in-place ändern
+  (entspricht dem Immutability-Vertrag von Ctx).
+- Der tz-aware DatetimeIndex wird geladen (pandas kopiert beim Setzen der Zeitzone),
+  nur die Datenspalten bleiben gemappt.
+- Ein vorhandener Store wird nie überschrieben (gleicher Fingerprint = gleicher Inhalt):
+  Worker öffnen ihn, statt ihn anderen Workern unter den Füßen wegzulöschen.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..log import get_logger
+from ..stages import Stage
+from .cache import has_frames, load_frames, save_frames
+from .checkpoint import stage_fingerprints
+
+log = get_logger("sensor_store")
+
+
+def sensor_store_path(cfg: dict[str, Any]) -> Path:
+    """Store-Verzeichnis eines Laufs: <sensor_store.dir>/<PREPROCESS-Fingerprint>."""
+    store_dir = cfg.get("sensor_store", {}).get("dir", ".cache/sensors")
+    return Path(store_dir) / stage_fingerprints(cfg)[Stage.PREPROCESS]
+
+
+def open_sensor_store(directory: str | os.PathLike) -> dict[str, pd.DataFrame]:
+    """Öffnet einen Store: Datenspalten als read-only np.memmap."""
+    if not has_frames(directory):
+        raise ValueError(f"No sensor store found in {directory}")
+    return load_frames(directory, mmap_mode="r")
+
+
+def write_sensor_store(sensors_dict: dict[str, pd.DataFrame], *, directory: str | os.PathLike) -> dict[str, pd.DataFrame]:
+    """
+    Schreibt alle Sensoren spaltenweise nach directory und gibt sie memory-mapped zurück.
+    Liegt dort schon ein vollständiger Store, wird er nur geöffnet.
+    Als Step nutzbar: pipeline.add(write_sensor_store, source="sensors", fn_kwargs={"directory": ...})
+    """
+    if has_frames(directory):
+        log.info("Sensor store: reusing %s", directory)
+    else:
+        save_frames(directory, sensors_dict, overwrite=False)
+    mapped = open_sensor_store(directory)
+    nbytes = sum(int(df.memory_usage(index=False).sum()) for df in mapped.values())
+    log.info("Sensor store: %s sensors (%.1f MB) memory-mapped from %s", len(mapped), nbytes / 1e6, directory)
+    return mapped
+
+
+def is_memory_mapped(df: pd.DataFrame) -> bool:
+    """True, wenn alle Spalten des DataFrames auf einem np.memmap liegen."""
+    def mapped(arr: np.ndarray) -> bool:
+        while arr is not None:
+            if isinstance(arr, np.memmap):
+                return True
+            arr = arr.base if isinstance(arr.base, np.ndarray) else None
+        return False
+    return len(df.columns) > 0 and all(mapped(df[col].to_numpy()) for col in df.columns)
@@ -6,8 +6,9 @@
 -----
 Hebt Einzelfunktionen f: T -> T bzw. f: T -> None auf Broadcast-Form
 über Sensor-Dictionaries an – isomorph (T->T, dict[str,T]->dict[str,T]).
-Ergänzt eine Selektor-API (.select(...)) und eine Parametrisierung
-(.with_kwargs(**kw)) mit früher Validierung und defensiver Kopie.
+Ergänzt eine Selektor-API (.select(...)), eine Parametrisierung
+(.with_kwargs(**kw)) mit früher Validierung und defensiver Kopie sowie eine
+Ausführungs-Policy (.parallel(...)) für Transform-Steps.
 
 Wichtige Verträge
 -----------------
@@ -22,7 +23,10 @@
 from typing import Callable, Iterable, Protocol, cast, Any
 from inspect import signature, Parameter
 from functools import wraps
+from concurrent.futures import Executor, ThreadPoolExecutor
+import os
 import re
+import threading
 
 import pandas as pd
 
@@ -47,6 +51,8 @@ def select(
     core: Callable[..., Any]  # type: ignore[assignment]
     # Parametrisierung der Core über Keyword-Argumente
     def with_kwargs(self, **kw: Any) -> "SensorStep[T]": ...  # type: ignore[misc]
+    # Ausführungs-Policy: Sensoren parallel (Thread-Pool) statt sequentiell
+    def parallel(self, *, executor: Executor | None = None) -> "SensorStep[T]": ...
 
 
 class SensorInspector[T](Protocol):
@@ -66,6 +72,38 @@ def with_kwargs(self, **kw: Any) -> "SensorInspector[T]": ...  # type: ignore[mi
 
 # ---------- Utilities ----------------------------------------------------
 
+_default_executor: ThreadPoolExecutor | None = None
+_default_executor_lock = threading.Lock()
+
+
+def default_sensor_executor() -> ThreadPoolExecutor:
+    """
+    Prozessweiter Thread-Pool für .parallel() ohne eigenen Executor (lazy).
+    Threads statt Prozesse: SciPy-Filter und NumPy/pandas-Kerne geben den GIL
+    frei, DataFrames müssen nicht serialisiert werden.
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="sensors"
+            )
+        return _default_executor
+
+
+def _map_sensors[T](
+    apply: Callable[[SensorName, T], T],
+    x: dict[str, T],
+    is_selected: Callable[[str, T], bool] | None,
+    executor: Executor | None,
+) -> dict[str, T]:
+    """Wendet apply key-weise an (Reihenfolge bleibt erhalten); parallel, falls executor gesetzt."""
+    selected = [name for name, value in x.items() if is_selected is None or is_selected(name, value)]
+    if executor is None or len(selected) < 2:
+        return {name: (apply(name, value) if name in selected else value) for name, value in x.items()}
+    futures = {name: executor.submit(apply, name, x[name]) for name in selected}
+    return {name: (futures[name].result() if name in futures else value) for name, value in x.items()}
+
 def _defensive_copy_kwargs(kw: dict[str, Any]) -> dict[str, Any]:
     """
     Shallow-Kopie mutabler Kwarg-Werte (best-effort):
@@ -148,14 +186,18 @@ def transform_all_sensors[T](func: Callable[..., T]) -> SensorStep[T]:
         (include/exclude/regex/predicate; nur bei Dict-Inputs wirksam).
       - `with_kwargs(**kw)` bindet zusätzliche Keyword-Argumente früh und
         validiert gegen die Signatur von `func` (außer `sensor_name`, reserviert).
+      - `parallel(executor=None)` verteilt die (ausgewählten) Sensoren auf einen
+        Thread-Pool (Default: default_sensor_executor()); Ergebnis-Reihenfolge
+        und Exceptions wie sequentiell. Kombinierbar mit select/with_kwargs.
 
     Verträge:
       - Falls `sensor_name` vorhanden, MUSS er keyword-only sein.
       - `sensor_name` darf nicht via `with_kwargs` gesetzt werden.
+      - Für `parallel` muss `func` thread-safe sein (reine Funktion, keine globalen Zustände).
     """
     _enforce_sensor_name_keyword_only_if_present(func)
 
-    def build_wrappers(core: Callable[..., T]) -> "SensorStep[T]":
+    def build_wrappers(core: Callable[..., T], executor: Executor | None = None) -> "SensorStep[T]":
         accepts_name = "sensor_name" in signature(core).parameters
 
         def apply(name: SensorName, value: T) -> T:
@@ -166,10 +208,7 @@ def apply(name: SensorName, value: T) -> T:
         @wraps(core)
         def wrapper(x: T | dict[str, T]) -> T | dict[str, T]:
             if isinstance(x, dict):
-                out: dict[str, T] = {}
-                for name, value in x.items():
-                    out[name] = apply(name, value)
-                return out
+                return _map_sensors(apply, x, None, executor)
             else:
                 return apply(None, x)
 
@@ -198,10 +237,7 @@ def is_selected(name: str, value: T) -> bool:
             @wraps(core)
             def selective_wrapper(x: T | dict[str, T]) -> T | dict[str, T]:
                 if isinstance(x, dict):
-                    out: dict[str, T] = {}
-                    for name, value in x.items():
-                        out[name] = apply(name, value) if is_selected(name, value) else value
-                    return out
+                    return _map_sensors(apply, x, is_selected, executor)
                 else:
                     return apply(None, x)
             
@@ -213,10 +249,23 @@ def with_kwargs_select(**kw: Any) -> "SensorStep[T]":
                     include=include, exclude=exclude, regex=regex, predicate=predicate
                     )
 
+            def parallel_select(*, executor: Executor | None = None) -> "SensorStep[T]":
+                # Policy setzen, identische Selektion erneut anwenden
+                return parallel(executor=executor).select(
+                    include=include, exclude=exclude, regex=regex, predicate=predicate
+                    )
+
             # Meta-API an selektiven Wrapper binden
             selective_wrapper.select = select  # type: ignore[attr-defined]
             selective_wrapper.core = core      # type: ignore[attr-defined]
             selective_wrapper.with_kwargs = with_kwargs_select  # type: ignore[attr-defined]
+            selective_wrapper.parallel = parallel_select  # type: ignore[attr-defined]
+            selective_wrapper._selection = {   # type: ignore[attr-defined]
+                "include": sorted(inc) if inc is not None else None,
+                "exclude": sorted(exc) if exc is not None else None,
+                "regex": regex,
+                "predicate": predicate,
+            }
             return cast("SensorStep[T]", selective_wrapper)
 
         def with_kwargs(**kw: Any) -> "SensorStep[T]":
@@ -243,13 +292,22 @@ def bound_core(value: T, *, sensor_name: SensorName = None) -> T:
                 pass
             setattr(bound_core, "_base_name", base)
             setattr(bound_core, "_bound_kwargs", safe.copy())
+            setattr(bound_core, "_core_func", func)  # stabile Identität (Memoization)
         
-            return build_wrappers(bound_core)
+            return build_wrappers(bound_core, executor)
+
+        def parallel(*, executor: Executor | None = None) -> "SensorStep[T]":
+            """
+            Ausführungs-Policy: Sensoren parallel im Thread-Pool verarbeiten.
+            - executor=None → default_sensor_executor()
+            """
+            return build_wrappers(core, executor or default_sensor_executor())
 
         # Meta-API an Basis-Wrapper binden
         wrapper.select = select            # type: ignore[attr-defined]
         wrapper.core = func                # type: ignore[attr-defined]
         wrapper.with_kwargs = with_kwargs  # type: ignore[attr-defined]
+        wrapper.parallel = parallel        # type: ignore[attr-defined]
         return cast("SensorStep[T]", wrapper)
 
     return build_wrappers(func)
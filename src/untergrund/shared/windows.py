@@ -0,0 +1,149 @@
+# windows.py
+"""
+Untergrundklassifizierung – Fenster-Hilfsfunktionen
+
+Zweck
+-----
+Bildet Zeitfenster [start_utc, end_utc) einmalig per `searchsorted` auf
+Sample-Offsets [start, stop) eines sortierten DatetimeIndex ab und stellt
+vektorisierte Segment-Werkzeuge bereit, damit Feature-Funktionen nicht pro
+Fenster eine boolesche Maske über die komplette Zeitreihe bilden müssen.
+
+Die WINDOW-Stage legt die Offsets pro Sensor einmalig als Index-Map in
+`ctx.artifacts["window_index"][window_key][sensor_name]` ab; FEATURES schneidet
+damit per `iloc[start:stop]` bzw. NumPy-Views statt erneut zu suchen.
+
+Verträge
+--------
+- Der Sensor-Index MUSS ein monoton steigender DatetimeIndex ohne NaT sein
+  (wird durch PREPROCESS/validate_basic_preprocessing garantiert).
+- Offsets sind halboffen: Fenster i umfasst die Zeilen `iloc[start[i]:stop[i]]`.
+- Ein Index-Map-Eintrag ist nur gültig für denselben Sensor-DataFrame
+  (Zeilenanzahl) und dasselbe Fenster-DataFrame (Fensteranzahl);
+  sonst wird neu berechnet (resolve_window_bounds).
+"""
+
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from ..log import get_logger
+
+log = get_logger("windows")
+
+# ---------- Typen --------------------------------------------------------
+
+type WindowBounds = tuple[np.ndarray, np.ndarray]
+# Eintrag der Index-Map: {"start": int64[], "stop": int64[], "n_rows": int}
+type WindowIndexEntry = dict[str, Any]
+
+# Obergrenze für Elemente einer Gather-Matrix (Fenster x Samples x Spalten)
+_MAX_GATHER_ELEMENTS = 2**22
+
+
+# ---------- Fenster -> Sample-Offsets ------------------------------------
+
+def window_sample_bounds(index: pd.Index, starts: pd.Series | pd.Index, ends: pd.Series | pd.Index) -> WindowBounds:
+    """
+    Bildet Fenster [start, end) auf Sample-Offsets [start_idx, stop_idx) ab.
+    - entspricht exakt der Maske `(index >= start) & (index < end)`
+    - O(windows * log(samples)) statt O(windows * samples)
+    Gibt zwei int64-Arrays gleicher Länge zurück (stop >= start).
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("window_sample_bounds: index must be a DatetimeIndex")
+    if index.hasnans:
+        raise ValueError("window_sample_bounds: index contains NaT values")
+    if not index.is_monotonic_increasing:
+        raise ValueError("window_sample_bounds: index must be monotonically increasing")
+
+    start_idx = np.asarray(index.searchsorted(starts, side="left"), dtype=np.int64)
+    stop_idx = np.asarray(index.searchsorted(ends, side="left"), dtype=np.int64)
+    # Fenster mit end < start sind leer
+    stop_idx = np.maximum(stop_idx, start_idx)
+    return start_idx, stop_idx
+
+
+def build_window_index(sensors: dict[str, pd.DataFrame], windows: pd.DataFrame) -> dict[str, WindowIndexEntry]:
+    """
+    Index-Map für alle Sensoren: pro Sensor Start-/Stop-Offsets jedes Fensters.
+    - Arrays sind schreibgeschützt (Ctx ist immutable, Map wird geteilt).
+    - n_rows dient als Plausibilitätscheck gegen veraltete Maps.
+    """
+    index_map: dict[str, WindowIndexEntry] = {}
+    for sensor_name, df in sensors.items():
+        start, stop = window_sample_bounds(df.index, windows["start_utc"], windows["end_utc"])
+        start.flags.writeable = False
+        stop.flags.writeable = False
+        index_map[sensor_name] = {"start": start, "stop": stop, "n_rows": len(df)}
+    return index_map
+
+
+def resolve_window_bounds(
+    df: pd.DataFrame,
+    windows: pd.DataFrame,
+    *,
+    sensor_name: str,
+    window_index: dict[str, WindowIndexEntry] | None = None,
+) -> WindowBounds:
+    """
+    Liefert die Offsets eines Sensors: aus der Index-Map, falls passend,
+    sonst frisch per searchsorted (z. B. in Unit-Tests ohne WINDOW-Stage).
+    """
+    entry = (window_index or {}).get(sensor_name)
+    if entry is not None:
+        if entry["n_rows"] == len(df) and len(entry["start"]) == len(windows):
+            return entry["start"], entry["stop"]
+        log.warning("window_index for '%s' does not match data (rows/windows changed) -> recomputing offsets.", sensor_name)
+    return window_sample_bounds(df.index, windows["start_utc"], windows["end_utc"])
+
+
+# ---------- Segment-Werkzeuge --------------------------------------------
+
+def iter_window_chunks(lengths: np.ndarray, *, width: int = 1, max_elements: int = _MAX_GATHER_ELEMENTS) -> Iterator[slice]:
+    """
+    Teilt die Fenster in Blöcke, deren Gather-Matrix (Fenster x max. Länge x width)
+    höchstens `max_elements` Elemente hat -> begrenzter Speicher auch bei langen Fahrten.
+    """
+    n = len(lengths)
+    if n == 0:
+        return
+    max_len = max(int(lengths.max()), 1)
+    per_chunk = max(max_elements // (max_len * max(width, 1)), 1)
+    for begin in range(0, n, per_chunk):
+        yield slice(begin, min(begin + per_chunk, n))
+
+
+def gather_windows(values: np.ndarray, start: np.ndarray, stop: np.ndarray, *, fill: float = np.nan) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sammelt die Samples aller Fenster in eine gepolsterte Matrix.
+    - values: 1D (samples,) oder 2D (samples, cols)
+    - Rückgabe: (matrix, mask)
+        * matrix: (windows, max_len) bzw. (windows, max_len, cols), Polsterung = fill
+        * mask:   (windows, max_len), True für echte Samples
+    """
+    lengths = stop - start
+    max_len = int(lengths.max()) if len(lengths) else 0
+    offsets = np.arange(max_len, dtype=np.int64)
+    mask = offsets[None, :] < lengths[:, None]
+    idx = np.where(mask, start[:, None] + offsets[None, :], 0)
+
+    if len(values) == 0:
+        shape = mask.shape if values.ndim == 1 else (*mask.shape, values.shape[1])
+        return np.full(shape, fill, dtype=np.float64), mask
+
+    matrix = values[idx].astype(np.float64, copy=False)
+    matrix[~mask] = fill
+    return matrix, mask
+
+
+def segment_counts(flags: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """
+    Zählt True-Werte von `flags` je Segment [start, stop) über kumulative Summen.
+    - flags: 1D oder 2D (samples, cols) bool/int -> exakt, da ganzzahlig
+    """
+    flags = np.asarray(flags, dtype=np.int64)
+    zeros = np.zeros((1, *flags.shape[1:]), dtype=np.int64)
+    csum = np.concatenate([zeros, np.cumsum(flags, axis=0)], axis=0)
+    return csum[stop] - csum[start]
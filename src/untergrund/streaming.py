@@ -0,0 +1,519 @@
+# streaming.py
+"""
+Untergrundklassifizierung – Echtzeit-Modus über einen Live-Sensor-Feed
+
+Zweck
+-----
+Die Stages arbeiten auf fertigen Dateien. Für die Klassifizierung während der Fahrt
+(SensorLogger HTTP-Push, Fahrradcomputer) verarbeitet StreamEngine Records
+blockweise, sobald sie eintreffen, mit denselben Bausteinen wie der Batch:
+- pro Sensor ein RingBuffer fester Kapazität (streaming.buffer_s) -> Speicher konstant
+- IMU: kausaler Anti-Aliasing-Tiefpass (nur wenn Quellrate > Zielrate) -> Online-Resampling
+  auf das Epoch-Raster (lineare Interpolation wie resample "interp") -> kausaler Hochpass;
+  Filter per shared.filters.causal_filter mit weitergereichtem Zustand statt sosfiltfilt
+- Location: Online-Resampling per ffill (wie resample_location_sensors)
+- Fenster im Raster window_hop_s ab dem gemeinsamen Start aller Sensoren (wie
+  trim_to_common_timeframe + WINDOW) werden ausgegeben, sobald alle IMU-Sensoren bis zum Fensterende Daten haben
+- Features je Fenster: acc_window_stats, compute_window_velocity,
+  normalize_features_by_velocity; optional Cluster-Zuordnung (runners.model.predict_clusters)
+
+Verträge
+--------
+- Kausale Filter haben Phasenverzug: Features weichen leicht vom Batch (Nullphase) ab.
+- Der Geschwindigkeits-Exponent kann live nicht kalibriert werden:
+  streaming.velocity_exponent (Default 1.5, wie der Fallback von compute_optimal_exponent).
+- Fenster, die vor Start + warmup_s (auf hop aufgerundet) beginnen, werden nicht ausgegeben
+  (Filter-Einschwingen); window_id entspricht trotzdem der des Batch-Laufs.
+- Verspätete Samples (time <= letztes Sample des Sensors) werden verworfen.
+- Große Blöcke (z. B. eine ganze Fahrt vom Server) werden in Zeitscheiben von window_hop_s
+  zerlegt, nach jeder Scheibe werden die fertigen Fenster berechnet -> Ergebnis wie beim
+  Abspielen in kleinen Blöcken. Fenster, die vor dem ältesten Sample im Ringpuffer beginnen
+  (ein IMU-Sensor hinkt > buffer_s hinterher), werden mit Warnung als NaN ausgegeben.
+- Views aus RingBuffer.window() werden beim nächsten append überschrieben -> sofort verwenden.
+
+Aufruf (Replay einer aufgezeichneten Fahrt in Echtzeit)
+------
+    python -m src.untergrund.streaming data/testdaten.json --config config.json --speed 1
+
+Config
+------
+    "streaming": {"warmup_s": 5, "buffer_s": 30, "batch_s": 0.1, "rate_probe": 64, "velocity_exponent": 1.5}
+"""
+
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import validate_config
+from .log import get_logger, log_level_from_config
+from .runners.features import compute_window_velocity, acc_window_stats, normalize_features_by_velocity
+from .runners.ingest import iter_json_array
+from .runners.model import ClusterModel, predict_clusters
+from .runners.window import window_params
+from .shared.filters import FilterDesign, butter_design, causal_filter
+from .shared.resample import interp_columns, source_rate
+
+log = get_logger("streaming")
+
+IMU_COLUMNS = ["x", "y", "z"]
+LOCATION_COLUMNS = ["speed", "speedAccuracy"]
+WINDOW_KEY = "stream"
+
+
+# ---------- Ringpuffer ---------------------------------------------------
+
+class RingBuffer:
+    """
+    Zeitstempel (int64 ns) + Werte (float64, Samples x Spalten) mit fester Kapazität.
+    Jedes Sample liegt doppelt (i und i + capacity) -> der Inhalt ist immer ein
+    zusammenhängender Slice, window() liefert Views ohne Kopie.
+    """
+
+    def __init__(self, capacity: int, n_cols: int):
+        if capacity < 1:
+            raise ValueError(f"RingBuffer capacity must be >= 1, got {capacity}")
+        self.capacity = capacity
+        self._t = np.zeros(2 * capacity, dtype=np.int64)
+        self._v = np.zeros((2 * capacity, n_cols), dtype=np.float64)
+        self._head = 0      # nächste Schreibposition in [0, capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, t_ns: np.ndarray, values: np.ndarray) -> None:
+        if len(t_ns) > self.capacity:
+            t_ns, values = t_ns[-self.capacity:], values[-self.capacity:]
+        pos = (self._head + np.arange(len(t_ns))) % self.capacity
+        self._t[pos] = self._t[pos + self.capacity] = t_ns
+        self._v[pos] = self._v[pos + self.capacity] = values
+        self._head = (self._head + len(t_ns)) % self.capacity
+        self._size = min(self._size + len(t_ns), self.capacity)
+
+    def view(self) -> tuple[np.ndarray, np.ndarray]:
+        """Gesamter Inhalt, zeitlich sortiert (Views)."""
+        stop = self._head + self.capacity
+        return self._t[stop - self._size:stop], self._v[stop - self._size:stop]
+
+    def window(self, start_ns: int, end_ns: int) -> tuple[np.ndarray, np.ndarray]:
+        """Samples mit start_ns <= t < end_ns (Views)."""
+        t, v = self.view()
+        i, j = np.searchsorted(t, [start_ns, end_ns], side="left")
+        return t[i:j], v[i:j]
+
+    @property
+    def t_first(self) -> int | None:
+        return int(self.view()[0][0]) if self._size else None
+
+    @property
+    def t_last(self) -> int | None:
+        return int(self._t[self._head + self.capacity - 1]) if self._size else None
+
+
+# ---------- Online-Resampling --------------------------------------------
+
+class OnlineResampler:
+    """
+    Resampling auf das Epoch-Raster k * step_ns, blockweise.
+    - "interp": lineare Interpolation zwischen Nachbarsamples (wie resample.interp_resample)
+    - "ffill":  letzter bekannter Wert (wie resample_location_sensors, fill_method="ffill")
+    Ein Rasterpunkt wird ausgegeben, sobald ein Sample mit t >= Rasterpunkt vorliegt.
+    """
+
+    def __init__(self, step_ns: int, *, method: str = "interp"):
+        if method not in ("interp", "ffill"):
+            raise ValueError(f"Unknown online resample method '{method}' (expected 'interp' or 'ffill').")
+        self.step_ns = step_ns
+        self.method = method
+        self._t_prev: np.ndarray | None = None     # letztes Sample (Stützstelle für den nächsten Block)
+        self._v_prev: np.ndarray | None = None
+        self._next = None                            # nächster auszugebender Rasterindex
+
+    def push(self, t_ns: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if len(t_ns) == 0:
+            return t_ns, values
+        if self._t_prev is not None:
+            t_ns = np.concatenate([self._t_prev, t_ns])
+            values = np.concatenate([self._v_prev, values])
+        if self._next is None:
+            self._next = -(-int(t_ns[0]) // self.step_ns)   # ceil
+        last = int(t_ns[-1]) // self.step_ns
+        grid = np.arange(self._next, last + 1, dtype=np.int64) * self.step_ns
+        self._t_prev, self._v_prev = t_ns[-1:], values[-1:]
+        if len(grid) == 0:
+            return grid, np.empty((0, values.shape[1]))
+        self._next = last + 1
+        if self.method == "interp":
+            out = interp_columns(t_ns, values, (grid - t_ns[0]).astype(np.float64))
+        else:
+            out = values[np.searchsorted(t_ns, grid, side="right") - 1]
+        return grid, out
+
+
+# ---------- Sensor-Kette -------------------------------------------------
+
+class SensorStream:
+    """
+    Online-Aufbereitung eines Sensors: [kausaler Tiefpass] -> Resampling -> [kausaler Hochpass] -> RingBuffer.
+    Ein Tiefpass wird erst entworfen, wenn die ersten rate_probe Samples die Quellrate schätzen lassen
+    (unabhängig von der Blockgröße);
+    bis dahin werden Samples gepuffert.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[str],
+        *,
+        target_rate: float,
+        buffer_s: float,
+        resample: str = "interp",
+        lowpass: dict[str, Any] | None = None,
+        highpass: dict[str, Any] | None = None,
+        rate_probe: int = 64,
+    ):
+        self.name = name
+        self.columns = list(columns)
+        self.target_rate = target_rate
+        self.resampler = OnlineResampler(round(1e9 / target_rate), method=resample)
+        self.buffer = RingBuffer(max(int(math.ceil(buffer_s * target_rate)), 1), len(self.columns))
+        self.rate_probe = rate_probe
+        self._lowpass_cfg = lowpass
+        self._lowpass: FilterDesign | None = None
+        self._highpass = _highpass_design(name, highpass, target_rate) if highpass else None
+        self._z_low: np.ndarray | None = None
+        self._z_high: np.ndarray | None = None
+        self._probe: list[tuple[np.ndarray, np.ndarray]] = []
+        self._t_last: int | None = None
+        self.t_origin: int | None = None    # erster Rasterpunkt (bleibt, auch wenn der Ring überläuft)
+        self.n_late = 0
+
+    def push(self, t_ns: np.ndarray, values: np.ndarray) -> None:
+        order = np.argsort(t_ns, kind="stable")
+        t_ns, values = t_ns[order], values[order]
+        if self._t_last is not None:
+            fresh = t_ns > self._t_last
+            self.n_late += int(len(t_ns) - fresh.sum())
+            t_ns, values = t_ns[fresh], values[fresh]
+        # Duplikate im Block: erster Wert gewinnt
+        if len(t_ns) > 1:
+            keep = np.concatenate([[True], np.diff(t_ns) > 0])
+            t_ns, values = t_ns[keep], values[keep]
+        if len(t_ns) == 0:
+            return
+        self._t_last = int(t_ns[-1])
+
+        if self._lowpass_cfg is not None:
+            self._probe.append((t_ns, values))
+            if sum(len(t) for t, _ in self._probe) < self.rate_probe:
+                return
+            t_ns = np.concatenate([t for t, _ in self._probe])
+            values = np.concatenate([v for _, v in self._probe])
+            self._lowpass = _lowpass_design(self.name, self._lowpass_cfg, source_rate(t_ns[:self.rate_probe]), self.target_rate)
+            self._lowpass_cfg, self._probe = None, []
+
+        if self._lowpass is not None:
+            values, self._z_low = causal_filter(self._lowpass, values, self._z_low)
+        grid, out = self.resampler.push(t_ns, values)
+        if len(grid) == 0:
+            return
+        if self._highpass is not None:
+            out, self._z_high = causal_filter(self._highpass, out, self._z_high)
+        if self.t_origin is None:
+            self.t_origin = int(grid[0])
+        self.buffer.append(grid, out)
+
+
+def _lowpass_design(name: str, cfg: dict[str, Any], current_rate: float, target_rate: float) -> FilterDesign | None:
+    """Anti-Aliasing wie anti_aliasing_lowpass_filter: nur wenn Quellrate > Zielrate, cutoff = 0.8 * Ziel-Nyquist."""
+    if current_rate <= target_rate:
+        log.info("Stream '%s': Current rate %.2f Hz <= target rate %.2f Hz, no lowpass filtering needed.", name, current_rate, target_rate)
+        return None
+    cutoff = cfg.get("safety_factor", 0.8) * (target_rate / 2)
+    wn = cutoff / (current_rate / 2)
+    if not 0.02 <= wn <= 0.9:
+        raise ValueError(f"Stream '{name}': Normalized cutoff frequency wn={wn} out of valid range.")
+    log.info("Stream '%s': causal lowpass %.1f Hz at %.2f Hz source rate.", name, cutoff, current_rate)
+    return butter_design(cfg.get("order", 6), cutoff, current_rate, "lowpass")
+
+
+def _highpass_design(name: str, cfg: dict[str, Any], target_rate: float) -> FilterDesign:
+    """Hochpass wie high_pass_filter, auf der Zielrate nach dem Resampling."""
+    sample_rate = cfg.get("sample_rate", target_rate)
+    if not np.isclose(sample_rate, target_rate):
+        log.warning("Stream '%s': hp_filters sample_rate %s Hz != resample target_rate %s Hz, using %s Hz.", name, sample_rate, target_rate, target_rate)
+    cutoff = cfg.get("cutoff_freq", 2)
+    wn = cutoff / (target_rate / 2)
+    if not 0.02 <= wn <= 0.8:
+        raise ValueError(f"Stream '{name}': Normalized cutoff frequency wn={wn} out of valid range.")
+    return butter_design(cfg.get("order", 4), cutoff, target_rate, "highpass")
+
+
+# ---------- Engine -------------------------------------------------------
+
+class StreamEngine:
+    """
+    Nimmt SensorLogger-Records entgegen (push_records) und gibt fertige Fenster mit
+    Features zurück. Parameter aus der normalen Config (resample_imu, anti_aliasing_lowpass,
+    hp_filters, resample_location, window_*, velocity_normalization) + config["streaming"].
+    - model: optionales Cluster-Modell (artifacts["cluster_model"]) -> Spalte "cluster"
+    """
+
+    def __init__(self, cfg: dict[str, Any], *, model: ClusterModel | None = None):
+        self.cfg = cfg
+        self.model = model
+        stream_cfg = cfg.get("streaming", {})
+        self.warmup_ns = int(stream_cfg.get("warmup_s", 5) * 1e9)
+        self.velocity_exponent = stream_cfg.get("velocity_exponent", 1.5)
+        buffer_s = stream_cfg.get("buffer_s", 30)
+        duration_s, hop_s = window_params(cfg)
+        if buffer_s < duration_s + hop_s:
+            raise ValueError(f"streaming.buffer_s ({buffer_s}) must be >= window_duration_s + window_hop_s ({duration_s + hop_s}).")
+        self.duration_ns, self.hop_ns = int(duration_s * 1e9), int(hop_s * 1e9)
+
+        self.streams: dict[str, SensorStream] = {}
+        for name in cfg["sensor_list"]:
+            if name == "Location":
+                self.streams[name] = SensorStream(
+                    name, LOCATION_COLUMNS, resample="ffill", buffer_s=buffer_s,
+                    target_rate=cfg.get("resample_location", {}).get("target_rate", 1),
+                )
+            else:
+                self.streams[name] = SensorStream(
+                    name, IMU_COLUMNS, buffer_s=buffer_s,
+                    target_rate=cfg.get("resample_imu", {}).get("target_rate", 100),
+                    lowpass=cfg.get("anti_aliasing_lowpass", {}).get(name),
+                    highpass=cfg.get("hp_filters", {}).get(name),
+                    rate_probe=stream_cfg.get("rate_probe", 64),
+                )
+        self.imu = [name for name in self.streams if name != "Location"]
+        if "Accelerometer" not in self.imu:
+            raise ValueError("StreamEngine requires 'Accelerometer' in sensor_list.")
+        self._next_start: int | None = None
+        self._next_id = 0
+        self._rows: list[dict[str, Any]] = []
+
+    # Eingang
+    def push_records(self, records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Block von Records (beliebig gemischt) verarbeiten; gibt die neu fertigen Fenster zurück.
+        Der Block wird in Zeitscheiben von window_hop_s zerlegt und nach jeder Scheibe gepollt,
+        damit kein RingBuffer Samples überschreibt, die ein offenes Fenster noch braucht.
+        """
+        t0 = time.perf_counter()
+        columns: dict[str, tuple[list[Any], list[list[Any]]]] = {}
+        for rec in records:
+            stream = self.streams.get(rec.get("sensor"))
+            if stream is None or rec.get("time") is None:
+                continue   # Metadata, nicht konfigurierte Sensoren
+            times, rows = columns.setdefault(stream.name, ([], []))
+            times.append(rec["time"])
+            rows.append([rec.get(c) for c in stream.columns])
+        blocks: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for name, (times, rows) in columns.items():
+            t_ns = np.array(times, dtype=np.int64)
+            order = np.argsort(t_ns, kind="stable")
+            blocks[name] = (t_ns[order], np.array(rows, dtype=np.float64)[order])
+
+        windows: list[dict[str, Any]] = []
+        if blocks:
+            t_min = min(int(t[0]) for t, _ in blocks.values())
+            t_max = max(int(t[-1]) for t, _ in blocks.values())
+            edges = np.append(np.arange(t_min, t_max + 1, self.hop_ns, dtype=np.int64)[1:], t_max + 1)
+            lo = dict.fromkeys(blocks, 0)
+            for edge in edges:
+                for name, (t_ns, values) in blocks.items():
+                    hi = int(np.searchsorted(t_ns, edge, side="left"))
+                    if hi > lo[name]:
+                        self.push(name, t_ns[lo[name]:hi], values[lo[name]:hi])
+                        lo[name] = hi
+                windows.extend(self.poll())
+        for row in windows:
+            row["latency_s"] = time.perf_counter() - t0
+        return windows
+
+    def push(self, sensor: str, t_ns: np.ndarray, values: np.ndarray) -> None:
+        """Samples eines Sensors (Spalten wie SensorStream.columns)."""
+        if np.isnan(values).any():
+            keep = ~np.isnan(values).any(axis=1)     # wie nan_handling(method="drop")
+            t_ns, values = t_ns[keep], values[keep]
+        self.streams[sensor].push(t_ns, values)
+
+    # Fenster
+    def watermark(self) -> int | None:
+        """Zeit, bis zu der alle IMU-Sensoren aufbereitete Daten haben (None = noch keine)."""
+        lasts = [self.streams[name].buffer.t_last for name in self.imu]
+        return None if any(t is None for t in lasts) else min(lasts)  # type: ignore[type-var]
+
+    def origin(self) -> int | None:
+        """
+        Raster-Ursprung wie PREPROCESS/WINDOW: gemeinsamer Start aller Sensoren
+        (trim_to_common_timeframe, ggf. align_to_sensor); None, solange ein Sensor fehlt.
+        Maßgeblich ist der erste Rasterpunkt je Sensor, nicht der aktuelle Ringinhalt.
+        """
+        firsts = {name: s.t_origin for name, s in self.streams.items()}
+        if any(t is None for t in firsts.values()):
+            return None
+        align = self.cfg.get("trim_to_common_timeframe", {}).get("align_to_sensor")
+        return firsts[align] if align in firsts else max(firsts.values())  # type: ignore[type-var]
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Alle Fenster mit end <= watermark berechnen; window_id zählt ab dem Raster-Ursprung (wie WINDOW)."""
+        mark = self.watermark()
+        if mark is None:
+            return []
+        if self._next_start is None:
+            origin = self.origin()
+            if origin is None:
+                return []
+            self._next_start = origin + -(-self.warmup_ns // self.hop_ns) * self.hop_ns
+            self._next_id = (self._next_start - origin) // self.hop_ns
+        n = (mark - self._next_start - self.duration_ns) // self.hop_ns + 1
+        if n <= 0:
+            return []
+        starts = self._next_start + np.arange(n, dtype=np.int64) * self.hop_ns
+        self._next_start = int(starts[-1]) + self.hop_ns
+        rows = self._window_features(starts)
+        self._rows.extend(rows)
+        return rows
+
+    def _window_features(self, starts: np.ndarray) -> list[dict[str, Any]]:
+        start_utc = pd.DatetimeIndex(starts.view("datetime64[ns]")).tz_localize("UTC")
+        fdf = pd.DataFrame({
+            "start_utc": start_utc,
+            "end_utc": start_utc + pd.Timedelta(self.duration_ns, unit="ns"),
+            "center_utc": start_utc + pd.Timedelta(self.duration_ns // 2, unit="ns"),
+        }, index=pd.RangeIndex(self._next_id, self._next_id + len(starts)))
+        self._next_id += len(starts)
+
+        # Beschleunigungs-Features direkt auf dem Ringpuffer (searchsorted -> Offsets)
+        t, values = self.streams["Accelerometer"].buffer.view()
+        lo = np.searchsorted(t, starts, side="left")
+        hi = np.searchsorted(t, starts + self.duration_ns, side="left")
+        truncated = starts < t[0] if len(t) else np.ones(len(starts), dtype=bool)
+        if truncated.any():
+            log.warning(
+                "StreamEngine: %d window(s) from %s start before the oldest buffered Accelerometer sample; "
+                "emitting NaN features (increase streaming.buffer_s).", int(truncated.sum()), start_utc[0],
+            )
+            hi[truncated] = lo[truncated]   # leeres Fenster -> NaN statt Statistik über ein Teilfenster
+        for stat, column in acc_window_stats(values, lo, hi).items():
+            fdf[stat] = column
+
+        features = {WINDOW_KEY: fdf}
+        if "Location" in self.streams:
+            features = compute_window_velocity({"Location": self._location_frame()}, features, window_key=WINDOW_KEY)
+            for columns, exponent in ((["acc_rms", "acc_std", "acc_p2p"], self.velocity_exponent), (["zero_crossing_rate"], 1.0)):
+                features = normalize_features_by_velocity({}, features, window_key=WINDOW_KEY, cfg=self.cfg, feature_columns=columns, velocity_exponent=exponent)
+        fdf = features[WINDOW_KEY]
+        if self.model is not None:
+            fdf = fdf.assign(cluster=predict_clusters(fdf, self.model))
+        return [{"window_id": i, **row} for i, row in zip(fdf.index, fdf.to_dict("records"))]
+
+    def _location_frame(self) -> pd.DataFrame:
+        t, values = self.streams["Location"].buffer.view()
+        index = pd.DatetimeIndex(t.view("datetime64[ns]")).tz_localize("UTC")
+        return pd.DataFrame(values, index=index, columns=LOCATION_COLUMNS)
+
+    def windows(self) -> pd.DataFrame:
+        """Alle bisher ausgegebenen Fenster (Index window_id)."""
+        if not self._rows:
+            return pd.DataFrame()
+        return pd.DataFrame(self._rows).set_index("window_id")
+
+
+# ---------- Quellen / Lauf -----------------------------------------------
+
+def replay_json(
+    path: str | Path,
+    *,
+    speed: float | None = 1.0,
+    sensors: Sequence[str] | None = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[dict[str, Any]]:
+    """
+    Spielt eine aufgezeichnete SensorLogger-JSON (Top-Level-Array) als Live-Feed ab.
+    - speed: 1.0 = Echtzeit, 10 = zehnfach, None = so schnell wie möglich
+    - sensors: nur diese Sensoren (Projection-Pushdown wie beim Ingest)
+    Records ohne "time" (Metadata) werden sofort geliefert.
+    """
+    t_first: int | None = None
+    wall_first = 0.0
+    for rec in iter_json_array(path, keep_sensors=sensors):
+        if speed is not None and rec.get("time") is not None:
+            t = int(rec["time"])
+            if t_first is None:
+                t_first, wall_first = t, clock()
+            delay = wall_first + (t - t_first) / 1e9 / speed - clock()
+            if delay > 0:
+                sleep(delay)
+        yield rec
+
+
+def run_stream(
+    cfg: dict[str, Any],
+    records: Iterable[dict[str, Any]],
+    *,
+    model: ClusterModel | None = None,
+    on_window: Callable[[dict[str, Any]], None] | None = None,
+) -> pd.DataFrame:
+    """
+    Verarbeitet einen Record-Strom in Blöcken von streaming.batch_s (Datenzeit) -> Latenz <= batch_s + Rechenzeit.
+    on_window wird für jedes fertige Fenster sofort aufgerufen; Rückgabe: alle Fenster.
+    """
+    batch_ns = int(cfg.get("streaming", {}).get("batch_s", 0.1) * 1e9)
+    engine = StreamEngine(cfg, model=model)
+    batch: list[dict[str, Any]] = []
+    batch_start: int | None = None
+
+    def flush() -> None:
+        for row in engine.push_records(batch):
+            if on_window is not None:
+                on_window(row)
+        batch.clear()
+
+    with log_level_from_config(cfg):
+        for rec in records:
+            if rec.get("time") is None:
+                continue
+            t = int(rec["time"])
+            batch.append(rec)
+            if batch_start is None:
+                batch_start = t
+            elif t - batch_start >= batch_ns:
+                flush()
+                batch_start = None
+        flush()
+        late = {name: s.n_late for name, s in engine.streams.items() if s.n_late}
+        if late:
+            log.warning("run_stream: discarded late samples %s", late)
+    return engine.windows()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded SensorLogger JSON through the streaming engine.")
+    parser.add_argument("input", help="SensorLogger JSON export (top-level array)")
+    parser.add_argument("--config", default="config.json", help="Config file (default: config.json)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time, 0 = as fast as possible)")
+    args = parser.parse_args(argv)
+
+    cfg = validate_config(json.loads(Path(args.config).read_text(encoding="utf-8")))
+
+    def report(row: dict[str, Any]) -> None:
+        log.info("window %s %s acc_rms=%.3f v=%.2f latency=%.1f ms", row["window_id"], row["start_utc"], row["acc_rms"], row.get("v", float("nan")), row["latency_s"] * 1e3)
+
+    source = replay_json(args.input, speed=args.speed or None, sensors=[*cfg["sensor_list"]])
+    windows = run_stream(cfg, source, on_window=report)
+    log.info("Streamed %s windows.", len(windows))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
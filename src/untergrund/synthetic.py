@@ -0,0 +1,242 @@
+# synthetic.py
+"""
+Untergrundklassifizierung – Synthetische SensorLogger-Fahrten
+
+Zweck
+-----
+Deterministische Testfahrten beliebiger Länge (Benchmarks, Tests):
+- synthetic_sensor_frames: Sensor-Dict wie nach read_json_stream (INGEST-Ausgabe,
+  inkl. "Metadata"-Sensor)
+- write_synthetic_ride:    dieselben Daten als SensorLogger-JSON (Records mit
+  String-Werten, nach Zeit verschränkt, gestreamt geschrieben)
+- parse_ride_length:       "10min" | "1h" | "8h" | "90s" | "600" -> Sekunden
+
+Signalmodell
+------------
+- Untergrund-Abschnitte (30–120 s) mit eigener Vibrations-Amplitude
+  (asphalt / gravel / cobblestone), skaliert mit der Geschwindigkeit
+- Geschwindigkeit als geglätteter Random Walk (2–9 m/s), Location mit 1 Hz
+- Accelerometer: Schwerkraft auf z + Trittfrequenz + Vibration; Gyroscope analog klein
+- Zeitstempel mit Jitter (< 20 % der Periode, monoton steigend)
+
+Gleicher seed + gleiche Parameter -> bitgleiche Frames und Dateien.
+read_json_stream(write_synthetic_ride(path, frames)) == frames (Round-Trip über repr).
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .runners.ingest import _typed_column
+
+# Fahrtlängen der Benchmark-Suite (Sekunden)
+RIDE_LENGTHS: dict[str, int] = {"10min": 600, "1h": 3_600, "8h": 28_800}
+
+# Untergrund -> Vibrations-Amplitude (m/s² bei 5 m/s)
+SURFACES: dict[str, float] = {"asphalt": 0.3, "gravel": 1.2, "cobblestone": 2.5}
+
+_T0_NS = 1_698_501_144_401_773_000
+_IMU_COLUMNS = ("z", "y", "x")   # Reihenfolge wie in SensorLogger-Exporten
+_LOCATION_COLUMNS = (
+    "bearingAccuracy", "speedAccuracy", "verticalAccuracy", "horizontalAccuracy",
+    "speed", "bearing", "altitude", "longitude", "latitude",
+)
+_UNITS = {"s": 1, "min": 60, "h": 3_600}
+
+
+def parse_ride_length(length: str | int) -> int:
+    """Fahrtlänge in Sekunden: Preset aus RIDE_LENGTHS, "<n>s|min|h" oder Sekunden als Zahl."""
+    if isinstance(length, int):
+        seconds = length
+    elif length in RIDE_LENGTHS:
+        seconds = RIDE_LENGTHS[length]
+    else:
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(s|min|h)?\s*", str(length))
+        if match is None:
+            raise ValueError(f"Invalid ride length '{length}' (expected e.g. {list(RIDE_LENGTHS)}, '90s' or '600').")
+        seconds = int(float(match.group(1)) * _UNITS[match.group(2) or "s"])
+    if seconds <= 0:
+        raise ValueError(f"Ride length must be positive, got {length!r}.")
+    return seconds
+
+
+def _surface_segments(rng: np.random.Generator, seconds: int) -> np.ndarray:
+    """Untergrund-Index je Sekunde (Abschnitte von 30–120 s)."""
+    labels = np.empty(seconds, dtype=np.int64)
+    pos = 0
+    while pos < seconds:
+        length = int(rng.integers(30, 121))
+        labels[pos:pos + length] = rng.integers(0, len(SURFACES))
+        pos += length
+    return labels
+
+
+def _speed_profile(rng: np.random.Generator, seconds: int) -> np.ndarray:
+    """Geschwindigkeit je Sekunde (m/s): geglätteter Random Walk in [2, 9]."""
+    steps = rng.normal(0.0, 0.4, seconds)
+    kernel = np.ones(15) / 15
+    walk = 5.5 + np.cumsum(np.convolve(steps, kernel, mode="same"))
+    # an den Rändern reflektieren statt abschneiden (keine langen Plateaus)
+    span = 7.0
+    walk = np.abs((walk - 2.0) % (2 * span) - span)
+    return 2.0 + (span - walk)
+
+
+def _imu_frame(
+    rng: np.random.Generator,
+    sensor: str,
+    *,
+    seconds: int,
+    rate: float,
+    amplitude: np.ndarray,
+    gravity: float,
+    scale: float,
+) -> pd.DataFrame:
+    n = int(seconds * rate)
+    period_ns = 1e9 / rate
+    jitter = rng.uniform(0.0, 0.2, n) * period_ns
+    time_ns = _T0_NS + (np.arange(n) * period_ns + jitter).astype(np.int64)
+    t = (time_ns - _T0_NS) / 1e9
+    amp = amplitude[np.minimum(t.astype(np.int64), seconds - 1)] * scale
+    pedal = 0.4 * scale * np.sin(2 * np.pi * 1.2 * t)
+    values = rng.standard_normal((n, 3)) * amp[:, None]
+    values[:, 0] += gravity + pedal          # z
+    values[:, 1] += 0.5 * pedal              # y
+    return pd.DataFrame({
+        "sensor": np.full(n, sensor, dtype=object),
+        "time": time_ns,
+        "seconds_elapsed": t,
+        **{col: values[:, i] for i, col in enumerate(_IMU_COLUMNS)},
+    })
+
+
+def _location_frame(rng: np.random.Generator, *, seconds: int, speed: np.ndarray) -> pd.DataFrame:
+    time_ns = _T0_NS + np.arange(seconds, dtype=np.int64) * 1_000_000_000 + rng.integers(0, 5_000_000, seconds)
+    bearing = np.cumsum(rng.normal(0.0, 2.0, seconds)) % 360
+    heading = np.deg2rad(bearing)
+    lat = 50.0 + np.cumsum(speed * np.cos(heading)) / 111_320
+    lon = 8.0 + np.cumsum(speed * np.sin(heading)) / (111_320 * np.cos(np.deg2rad(50.0)))
+    columns = {
+        "bearingAccuracy": rng.uniform(5, 30, seconds),
+        "speedAccuracy": np.abs(rng.normal(0.5, 0.3, seconds)),
+        "verticalAccuracy": rng.uniform(1, 4, seconds),
+        "horizontalAccuracy": rng.uniform(3, 12, seconds),
+        "speed": speed,
+        "bearing": bearing,
+        "altitude": 200 + np.cumsum(rng.normal(0.0, 0.05, seconds)),
+        "longitude": lon,
+        "latitude": lat,
+    }
+    return pd.DataFrame({
+        "sensor": np.full(seconds, "Location", dtype=object),
+        "time": time_ns,
+        "seconds_elapsed": (time_ns - _T0_NS) / 1e9,
+        **{col: columns[col] for col in _LOCATION_COLUMNS},
+    })
+
+
+def _metadata_frame(*, acc_rate: float, gyro_rate: float, seed: int) -> pd.DataFrame:
+    """Metadata-Record; Typen wie beim Streaming-Ingest (Zahlen-Strings -> float64)."""
+    record = {
+        "version": "3",
+        "device name": f"synthetic-{seed}",
+        "recording epoch time": str(_T0_NS // 1_000_000),
+        "recording time": "2023-10-28_13-52-24",
+        "recording timezone": "Europe/Berlin",
+        "platform": "android",
+        "appVersion": "1.29.1",
+        "sensors": "Accelerometer|Gyroscope|Location",
+        "sampleRateMs": f"{1000 / acc_rate:g}|{1000 / gyro_rate:g}|1000",
+    }
+    data = {"sensor": np.array(["Metadata"], dtype=object)}
+    data.update((key, _typed_column(key, [value])) for key, value in record.items())
+    return pd.DataFrame(data)
+
+
+def synthetic_sensor_frames(
+    seconds: int,
+    *,
+    acc_rate: float = 200.0,
+    gyro_rate: float = 200.0,
+    seed: int = 0,
+) -> dict[str, pd.DataFrame]:
+    """
+    Synthetische Fahrt als Sensor-Dict (Form wie read_json_stream):
+    Accelerometer/Gyroscope mit acc_rate/gyro_rate Hz, Location mit 1 Hz, Metadata.
+    """
+    if not (seconds > 0 and acc_rate > 0 and gyro_rate > 0):
+        raise ValueError("seconds, acc_rate and gyro_rate must be positive.")
+    rng = np.random.default_rng(seed)
+    surface = _surface_segments(rng, seconds)
+    speed = _speed_profile(rng, seconds)
+    amplitude = np.array(list(SURFACES.values()))[surface] * (speed / 5.0) ** 1.5
+    return {
+        "Accelerometer": _imu_frame(rng, "Accelerometer", seconds=seconds, rate=acc_rate, amplitude=amplitude, gravity=9.81, scale=1.0),
+        "Gyroscope": _imu_frame(rng, "Gyroscope", seconds=seconds, rate=gyro_rate, amplitude=amplitude, gravity=0.0, scale=0.1),
+        "Location": _location_frame(rng, seconds=seconds, speed=speed),
+        "Metadata": _metadata_frame(acc_rate=acc_rate, gyro_rate=gyro_rate, seed=seed),
+    }
+
+
+def _records(df: pd.DataFrame) -> list[str]:
+    """JSON-Records eines Sensors (alle Werte als Strings wie in SensorLogger-Exporten)."""
+    columns = [col for col in df.columns if col != "sensor"]
+    head = f'{{"sensor": "{df["sensor"].iloc[0]}"' if len(df) else ""
+    arrays = [df[col].tolist() for col in columns]
+    return [
+        head + "".join(f', "{col}": "{value!r}"' if not isinstance(value, str) else f', "{col}": "{value}"'
+                       for col, value in zip(columns, row)) + "}"
+        for row in zip(*arrays)
+    ]
+
+
+def write_synthetic_ride(
+    path: str | os.PathLike,
+    frames: dict[str, pd.DataFrame],
+    *,
+    chunk_s: int = 60,
+) -> Path:
+    """
+    Schreibt frames (synthetic_sensor_frames) als SensorLogger-JSON nach path.
+    Metadata zuerst, danach alle Records nach Zeit verschränkt; gestreamt in
+    Blöcken von chunk_s Sekunden (kein Gesamt-String im Speicher).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    timed = {name: df for name, df in frames.items() if "time" in df.columns}
+    end_ns = max(int(df["time"].iloc[-1]) for df in timed.values() if len(df)) + 1
+    t_start = min(int(df["time"].iloc[0]) for df in timed.values() if len(df))
+    step_ns = chunk_s * 1_000_000_000
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        first = True
+        for name, df in frames.items():
+            if name not in timed:
+                for record in _records(df):
+                    f.write(("" if first else ",\n") + record)
+                    first = False
+        for lo in range(t_start, end_ns, step_ns):
+            times, records = [], []
+            for df in timed.values():
+                lo_i, hi_i = np.searchsorted(df["time"].to_numpy(), [lo, lo + step_ns])
+                part = df.iloc[lo_i:hi_i]
+                times.append(part["time"].to_numpy())
+                records += _records(part)
+            if not records:
+                continue
+            order = np.argsort(np.concatenate(times), kind="stable")
+            f.write(("" if first else ",\n") + ",\n".join(records[i] for i in order))
+            first = False
+        f.write("\n]\n")
+    return path
+
+
+def ride_size(frames: dict[str, pd.DataFrame]) -> dict[str, Any]:
+    """Kennzahlen einer (synthetischen) Fahrt: Records je Sensor und gesamt."""
+    rows = {name: len(df) for name, df in frames.items()}
+    return {"records": sum(rows.values()), "rows": rows}
@@ -0,0 +1,30 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "config.json"
+
+
+@pytest.fixture(scope="session")
+def _repo_config() -> dict:
+    return json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def config(_repo_config):
+    """
+    Factory für die Repo-config.json mit Test-Defaults (log_level WARNING, keine parallelen
+    Sensoren, keine Checkpoints). Overrides je Test: Sektionen (dict) werden in die
+    vorhandene Sektion gemischt, alles andere ersetzt, z. B. config(server={"port": 0}).
+    """
+    def make(**overrides) -> dict:
+        cfg = copy.deepcopy(_repo_config)
+        cfg.update({"log_level": "WARNING", "parallel_sensors": False})
+        cfg["checkpoint"] = {**cfg.get("checkpoint", {}), "enabled": False}
+        for key, value in overrides.items():
+            cfg[key] = {**cfg[key], **value} if isinstance(value, dict) and isinstance(cfg.get(key), dict) else value
+        return cfg
+
+    return make
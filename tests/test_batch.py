@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from untergrund import orchestrator
+from untergrund.batch import collect_inputs, ride_config, run_batch, run_ride, summarize_batch
+from untergrund.context import make_ctx
+from untergrund.runners.ingest import read_json_stream
+from untergrund.stages import Stage
+
+
+def _write_ride(path: Path, *, seconds: int = 30, seed: int = 0) -> Path:
+    """Kleine synthetische SensorLogger-Fahrt (IMU 100 Hz, GPS 1 Hz)."""
+    rng = np.random.default_rng(seed)
+    t0 = 1698501144401773000
+    records = [{"sensor": "Metadata", "device name": "Pixel", "sampleRateMs": "10|10|1000"}]
+    for sensor in ("Accelerometer", "Gyroscope"):
+        t = t0 + np.arange(seconds * 100) * 10_000_000
+        xyz = rng.normal(0, 1, (len(t), 3))
+        records += [
+            {"sensor": sensor, "time": str(ti), "seconds_elapsed": str((ti - t0) / 1e9), "z": str(z), "y": str(y), "x": str(x)}
+            for ti, (x, y, z) in zip(t, xyz)
+        ]
+    records += [
+        {"sensor": "Location", "time": str(t0 + i * 1_000_000_000), "seconds_elapsed": str(i), "speed": "5.0", "speedAccuracy": "0.2"}
+        for i in range(seconds)
+    ]
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return path
+
+
+def test_collect_inputs_directory_and_glob(tmp_path):
+    for name in ("b.json", "a.json", "notes.txt"):
+        (tmp_path / name).write_text("[]", encoding="utf-8")
+    assert [p.name for p in collect_inputs(tmp_path)] == ["a.json", "b.json"]
+    assert [p.name for p in collect_inputs(tmp_path / "b*.json")] == ["b.json"]
+    with pytest.raises(ValueError):
+        collect_inputs(tmp_path / "missing*.json")
+
+
+def test_run_stages_records_stage_timings(monkeypatch):
+    monkeypatch.setattr(orchestrator, "STAGE_FUNCS", {st: (lambda ctx: ctx) for st in Stage})
+    ctx = orchestrator.run_stages(make_ctx({}))
+    assert list(ctx.artifacts["stage_timings"]) == [st.name for st in Stage]
+
+
+def test_run_batch_isolates_failing_ride(tmp_path, config):
+    rides = tmp_path / "rides"
+    rides.mkdir()
+    _write_ride(rides / "a.json")
+    (rides / "b.json").write_text('[{"sensor": ', encoding="utf-8")
+
+    summary = run_batch(config(ingest={"cache": False}), collect_inputs(rides), workers=1, log_dir=tmp_path / "logs")
+
+    assert (summary["n_ok"], summary["n_failed"]) == (1, 1)
+    ok, failed = summary["rides"]
+    assert ok["status"] == "ok" and ok["n_windows"] > 0
+    assert set(ok["stage_timings"]) == {st.name for st in Stage}
+    assert failed["status"] == "failed" and "RuntimeError" in failed["error"]
+    assert "RuntimeError" in (tmp_path / "logs" / "0001_b.log").read_text(encoding="utf-8")
+
+
+def test_run_ride_with_pushed_sensors_ignores_sensor_store(tmp_path, config):
+    cfg = config(ingest={"cache": False}, sensor_store={"enabled": True, "dir": str(tmp_path / "store")})
+    sensors = read_json_stream(_write_ride(tmp_path / "ride.json"))
+
+    result = run_ride(ride_config(cfg, "session-abc"), sensors=sensors)
+
+    assert result["status"] == "ok", result["error"]
+    assert result["n_windows"] > 0 and not (tmp_path / "store").exists()
+
+
+def test_summarize_batch_stage_totals():
+    rides = [
+        {"input_path": "a", "status": "ok", "stage_timings": {"INGEST": 1.0, "WINDOW": 0.5}},
+        {"input_path": "b", "status": "ok", "stage_timings": {"INGEST": 3.0}},
+        {"input_path": "c", "status": "failed", "stage_timings": {}},
+    ]
+    summary = summarize_batch(rides, wall_s=2.0)
+    assert summary["stages"]["INGEST"] == {"total_s": 4.0, "mean_s": 2.0, "max_s": 3.0}
+    assert summary["stages"]["WINDOW"]["total_s"] == 0.5
+    assert (summary["n_ok"], summary["n_failed"]) == (2, 1)
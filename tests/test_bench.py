@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from untergrund.bench import FEATURE_BENCHMARKS, benchmark_ride, compare_results, format_bench_report
+from untergrund.runners.ingest import read_json_stream
+from untergrund.stages import Stage
+from untergrund.synthetic import parse_ride_length, synthetic_sensor_frames, write_synthetic_ride
+
+
+def test_synthetic_ride_is_deterministic_and_round_trips_through_ingest(tmp_path):
+    frames = synthetic_sensor_frames(40, acc_rate=100, gyro_rate=50, seed=3)
+    assert {k: len(v) for k, v in frames.items()} == {"Accelerometer": 4000, "Gyroscope": 2000, "Location": 40, "Metadata": 1}
+    assert frames["Accelerometer"]["time"].is_monotonic_increasing
+    pd.testing.assert_frame_equal(frames["Gyroscope"], synthetic_sensor_frames(40, acc_rate=100, gyro_rate=50, seed=3)["Gyroscope"])
+    assert not frames["Accelerometer"]["x"].equals(synthetic_sensor_frames(40, acc_rate=100, gyro_rate=50, seed=4)["Accelerometer"]["x"])
+
+    ingested = read_json_stream(write_synthetic_ride(tmp_path / "ride.json", frames))
+    for sensor, df in frames.items():
+        pd.testing.assert_frame_equal(ingested[sensor], df)
+
+    assert [parse_ride_length(x) for x in ("10min", "1h", "8h", "90s", "2min", "600", 30)] == [600, 3600, 28800, 90, 120, 600, 30]
+    with pytest.raises(ValueError):
+        parse_ride_length("ten minutes")
+
+
+def test_benchmark_ride_measures_stages_and_features_and_detects_regressions(tmp_path, config):
+    cfg = config()
+    ride = benchmark_ride(cfg, "30s", acc_rate=100, gyro_rate=100, workdir=tmp_path)
+    assert set(ride["stages"]) == {st.name for st in Stage}
+    assert set(ride["features"]) == set(FEATURE_BENCHMARKS)
+    assert ride["n_windows"] > 0 and ride["records"] == 6031
+    assert [p.name for p in tmp_path.iterdir()] == ["ride_30s_100hz_100hz_seed0.json"]
+
+    current = {"rides": {"30s": ride}}
+    faster = {"rides": {"30s": {**ride, "stages": {k: v * 2 + 1 for k, v in ride["stages"].items()}}}}
+    assert compare_results(current, faster) == []
+    slower = {"rides": {"30s": {**ride, "stages": {**ride["stages"], "PREPROCESS": ride["stages"]["PREPROCESS"] / 2}}}}
+    assert [(r["group"], r["name"]) for r in compare_results(current, slower, tolerance=0.25, min_delta_s=0.0)] == [("stages", "PREPROCESS")]
+    other_seed = {"rides": {"30s": {**slower["rides"]["30s"], "seed": 1}}}
+    assert compare_results(current, other_seed) == []
+    assert "PREPROCESS" in format_bench_report(current, slower)
+    stub = {"rides": {"30s": {**ride, "stages": {**ride["stages"], "MODEL": 1e-9}}}}
+    model_line = next(l for l in format_bench_report(current, stub).splitlines() if "MODEL" in l)
+    assert model_line.endswith("     >9999") and len(model_line) == len(format_bench_report(current).splitlines()[1])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund.shared.cache import save_frames, load_frames, has_frames, file_digest, cache_key
+
+
+def _frames() -> dict[str, pd.DataFrame]:
+    idx = pd.date_range("2025-01-01", periods=5, freq="10ms", tz="UTC", name="time_utc")
+    sensor = pd.DataFrame({"x": np.arange(5.0), "n": np.arange(5, dtype=np.int64)}, index=idx)
+    windows = pd.DataFrame({"start_utc": idx, "label": ["a", "b", None, "a", "b"], "sensor": ["Acc"] * 5})
+    return {"Accelerometer": sensor, "cluster": windows}
+
+
+def test_save_load_frames_roundtrip(tmp_path):
+    frames = _frames()
+    entry = save_frames(tmp_path / "entry", frames, extra={"input_digest": "abc"})
+    assert has_frames(entry)
+    loaded = load_frames(entry)
+    assert list(loaded) == list(frames)
+    for name, df in frames.items():
+        pd.testing.assert_frame_equal(loaded[name], df)
+
+
+def test_load_frames_memmap(tmp_path):
+    entry = save_frames(tmp_path / "entry", _frames())
+    loaded = load_frames(entry, mmap_mode="r")
+    assert isinstance(loaded["Accelerometer"]["x"].to_numpy(), np.ndarray)
+    assert loaded["Accelerometer"]["x"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_save_frames_rejects_unserializable_objects(tmp_path):
+    df = pd.DataFrame({"obj": [object(), object()]})
+    with pytest.raises(ValueError):
+        save_frames(tmp_path / "entry", {"bad": df})
+    assert not has_frames(tmp_path / "entry")
+
+
+def test_cache_key_depends_on_content_and_params(tmp_path):
+    path = tmp_path / "ride.json"
+    path.write_text("[1, 2]", encoding="utf-8")
+    digest = file_digest(path)
+    assert cache_key(digest, {"engine": "stream"}) != cache_key(digest, {"engine": "pandas"})
+    path.write_text("[1, 3]", encoding="utf-8")
+    assert file_digest(path) != digest
@@ -0,0 +1,68 @@
+from dataclasses import replace
+
+import pandas as pd
+
+from untergrund import orchestrator
+from untergrund.context import make_ctx
+from untergrund.stages import Stage
+from untergrund.shared.checkpoint import stage_fingerprints, save_checkpoint, load_checkpoint
+
+
+def _cfg(tmp_path, **overrides):
+    path = tmp_path / "ride.json"
+    if not path.exists():
+        path.write_text("[]", encoding="utf-8")
+    cfg = {"input_path": str(path), "sensor_list": ["Accelerometer"], "window_duration_s": 4, "window_hop_s": 2,
+           "checkpoint": {"enabled": True, "dir": str(tmp_path / "ckpt")}}
+    return {**cfg, **overrides}
+
+
+def test_stage_fingerprints_only_change_downstream(tmp_path):
+    before = stage_fingerprints(_cfg(tmp_path))
+    after = stage_fingerprints(_cfg(tmp_path, window_duration_s=6))
+    for stage in (Stage.INGEST, Stage.SELECT, Stage.PREPROCESS):
+        assert before[stage] == after[stage]
+    for stage in (Stage.WINDOW, Stage.FEATURES, Stage.MODEL):
+        assert before[stage] != after[stage]
+
+
+def test_checkpoint_roundtrip_keeps_current_config(tmp_path):
+    idx = pd.date_range("2025-01-01", periods=3, freq="10ms", tz="UTC", name="time_utc")
+    ctx = replace(
+        make_ctx({"a": 1}),
+        sensors={"Accelerometer": pd.DataFrame({"x": [1.0, 2.0, 3.0]}, index=idx)},
+        meta={"device name": "Pixel"},
+        artifacts={"input": {"digest": "abc"}},
+    )
+    save_checkpoint(tmp_path / "cp", ctx)
+    loaded = load_checkpoint(tmp_path / "cp", config={"a": 2})
+    pd.testing.assert_frame_equal(loaded.sensors["Accelerometer"], ctx.sensors["Accelerometer"])
+    assert loaded.meta == ctx.meta and loaded.artifacts == ctx.artifacts
+    assert loaded.config == {"a": 2}
+
+
+def test_run_stages_resumes_after_unchanged_stages(tmp_path, monkeypatch, capsys):
+    calls: list[Stage] = []
+
+    def make_stage(stage):
+        def run(ctx):
+            calls.append(stage)
+            return replace(ctx, meta={**ctx.meta, stage.name: ctx.config.get("window_duration_s")})
+        return run
+
+    monkeypatch.setattr(orchestrator, "STAGE_FUNCS", {st: make_stage(st) for st in Stage})
+
+    first = orchestrator.run_stages(make_ctx(_cfg(tmp_path)))
+    assert calls == list(Stage)
+
+    calls.clear()
+    second = orchestrator.run_stages(make_ctx(_cfg(tmp_path, window_duration_s=6)))
+    assert calls == [Stage.WINDOW, Stage.FEATURES, Stage.MODEL, Stage.EXPORT]
+    assert second.meta["PREPROCESS"] == 4 and second.meta["WINDOW"] == 6
+    assert first.meta["WINDOW"] == 4
+
+    calls.clear()
+    capsys.readouterr()
+    orchestrator.run_stages(make_ctx(_cfg(tmp_path, window_duration_s=6, log_level="WARNING")))
+    assert calls == [Stage.EXPORT]
+    assert "Resuming after" not in capsys.readouterr().out   # log_level gilt auch beim Laden des Checkpoints
@@ -1,7 +1,9 @@
 from typing import cast, Any
 from untergrund import Ctx, CtxPipeline
 from dataclasses import replace
+import numpy as np
 import pandas as pd
+import pytest
 
 # sentinel values for unchanged fields
 S_META = object()
@@ -167,4 +169,29 @@ def tap_func(s: dict[str, pd.DataFrame]) -> None:
     assert final_ctx.preds is ctx.preds
     assert final_ctx.config is ctx.config
     assert final_ctx.artifacts is ctx.artifacts
-    
\ No newline at end of file
+    
+
+
+def test_ctx_pipeline_tap_readonly_projection():
+    """Testet, dass readonly-Taps ohne Kopie arbeiten und Mutationen abweisen."""
+    ctx = Ctx(sensors={"acc": pd.DataFrame({"x": np.arange(5.0), "t": pd.date_range("2024-01-01", periods=5, tz="UTC")})})
+    seen = {}
+
+    def tap_func(s: dict[str, pd.DataFrame]) -> None:
+        seen["x"] = s["acc"]["x"].to_numpy()
+        s["acc"]["flag"] = True                     # Strukturänderung: nur in der Projektion
+        s["acc"].sort_values("x", ascending=False, inplace=True)
+    CtxPipeline().tap(tap_func, source="sensors", readonly=True)(ctx)
+    assert np.shares_memory(seen["x"], ctx.sensors["acc"]["x"].to_numpy())
+    assert list(ctx.sensors["acc"].columns) == ["x", "t"]
+    assert ctx.sensors["acc"]["x"].is_monotonic_increasing
+
+    def write_values(s: dict[str, pd.DataFrame]) -> None:
+        s["acc"].loc[0, "x"] = -1.0
+    with pytest.raises(RuntimeError, match="read-only"):
+        CtxPipeline().tap(write_values, source="sensors", readonly=True)(ctx)
+    assert ctx.sensors["acc"]["x"].iloc[0] == 0.0
+
+    # eingebaute Inspektoren projizieren standardmäßig read-only
+    from untergrund.shared.inspect import head_tail
+    assert head_tail.tap_readonly is True
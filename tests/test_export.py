@@ -0,0 +1,76 @@
+import importlib.util
+import json
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund import Ctx
+from untergrund.runners.export import partition_path, ride_date, ride_id, run_export
+
+
+def _ctx(tmp_path, **export) -> Ctx:
+    starts = pd.date_range("2024-05-01 23:59:50", periods=10, freq="2s", tz="UTC")
+    ends = pd.date_range("2024-05-01 23:59:54", periods=10, freq="2s", tz="UTC")
+    features = pd.DataFrame({"start_utc": starts, "end_utc": ends, "acc_rms_vnorm": np.arange(10.0)})
+    cfg = {"input_path": "data/Fahrt 01.json", "export": {"enabled": True, "dir": str(tmp_path / "export"), **export}}
+    return Ctx(
+        features={"cluster": features},
+        preds={"cluster": pd.Series(np.arange(10) % 2, name="cluster")},
+        meta={"device name": "pixel", "recording epoch time": 1698501144000.0},
+        config=cfg,
+        artifacts={"input": {"path": cfg["input_path"], "digest": "abc123"}},
+    )
+
+
+def test_partition_layout_and_disabled_or_unavailable_export(tmp_path):
+    ctx = _ctx(tmp_path)
+    assert ride_id(ctx.config) == "Fahrt_01"
+    assert ride_date(ctx.meta, ctx.features) == "2023-10-28"
+    assert ride_date({}, ctx.features) == "2024-05-01" and ride_date({}, {}) == "unknown"
+    assert partition_path("out", "meta", date="2023-10-28", ride="Fahrt_01").as_posix() == "out/meta/date=2023-10-28/ride=Fahrt_01"
+
+    disabled = Ctx(config={"input_path": "x.json"})
+    assert run_export(disabled) is disabled
+
+    with pytest.raises(RuntimeError, match="Unknown export format"):
+        run_export(_ctx(tmp_path, format="csv"))
+    if importlib.util.find_spec("pyarrow") is None:
+        with pytest.raises(RuntimeError, match="requires the pyarrow package"):
+            run_export(ctx)
+        assert list((tmp_path / "export").rglob("*")) == []   # kein halbes Export-Verzeichnis
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_export_round_trips_through_arrow_in_row_groups(tmp_path, fmt):
+    ds = pytest.importorskip("pyarrow.dataset")
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = run_export(_ctx(tmp_path, format=fmt, row_group_size=4))
+    root = tmp_path / "export"
+    part = "date=2023-10-28/ride=Fahrt_01"
+    assert out.artifacts["export"]["tables"]["meta"] == str(root / "meta" / part)
+
+    manifest = json.loads((root / "_manifests" / part / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["run_id"] == out.artifacts["run_id"] and manifest["input"]["digest"] == "abc123"
+    assert manifest["config"]["export"]["format"] == fmt
+    assert [f["file"] for f in manifest["files"]] == [f"{t}/{part}/part-0.{fmt}" for t in ("features_cluster", "preds_cluster", "meta")]
+
+    # jede Tabelle ist ein eigenes hive-partitioniertes Dataset (Manifeste stören nicht)
+    def read(table):
+        dataset = ds.dataset(root / table, format="parquet" if fmt == "parquet" else "feather", partitioning="hive")
+        df = dataset.to_table().to_pandas()
+        assert set(df["ride"]) == {"Fahrt_01"} and set(df["date"].astype(str)) == {"2023-10-28"}
+        return df.drop(columns=["date", "ride"])
+
+    pd.testing.assert_frame_equal(read("features_cluster"), out.features["cluster"])
+    pd.testing.assert_series_equal(read("preds_cluster")["cluster"], out.preds["cluster"])
+    assert read("meta").iloc[0]["device name"] == "pixel"
+    if fmt == "parquet":
+        assert len(pd.read_parquet(root / "features_cluster")) == 10
+        assert pq.ParquetFile(root / "features_cluster" / part / "part-0.parquet").num_row_groups == 3
+
+    # erneuter Export ohne preds ersetzt die Partitionen und entfernt die alte preds-Tabelle
+    again = run_export(replace(_ctx(tmp_path, format=fmt), preds={}))
+    assert not (root / "preds_cluster" / part).exists() and again.artifacts["run_id"] != out.artifacts["run_id"]
+    assert sorted(p.name for p in root.iterdir()) == ["_manifests", "features_cluster", "meta", "preds_cluster"]
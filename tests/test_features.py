@@ -11,7 +11,8 @@
     acc_p2p,
     normalize_features_by_velocity,
     compute_window_velocity,
-    compute_optimal_exponent
+    compute_optimal_exponent,
+    acc_window_features,
 )
 from untergrund.context import Ctx, make_ctx
 
@@ -801,5 +802,103 @@ def test_compute_optimal_exponent_missing_columns():
     assert exponent == 1.5, f"Expected fallback to 1.5 due to missing columns, got {exponent}"
 
 
+
+# ============================================================================
+# Tests for acc_window_features (Single-Pass Fenster-Engine)
+# ============================================================================
+
+def _reference_acc_features(acc: pd.DataFrame, fdf: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Referenz: klassische Schleife mit boolescher Maske pro Fenster (altes Verhalten)."""
+    from scipy.stats import kurtosis as scipy_kurtosis
+    rows = []
+    for _, row in fdf.iterrows():
+        w = acc.loc[(acc.index >= row["start_utc"]) & (acc.index < row["end_utc"]), cols]
+        if len(w) == 0:
+            rows.append([np.nan] * 5)
+            continue
+        mag = np.sqrt((w**2).sum(axis=1))
+        zcr = np.mean([np.sum(np.diff(np.sign(w[c].values)) != 0) / len(w) for c in cols])
+        rows.append([
+            np.sqrt((w**2).sum().sum() / len(w)),
+            np.std(mag),
+            w.max().max() - w.min().min(),
+            zcr,
+            scipy_kurtosis(mag, fisher=True),
+        ])
+    return pd.DataFrame(rows, columns=["acc_rms", "acc_std", "acc_p2p", "zero_crossing_rate", "acc_kurtosis"])
+
+
+def test_acc_window_features_matches_reference_loop():
+    """Engine liefert dieselben Werte wie die Masken-Schleife (überlappende, leere und 1-Sample-Fenster)."""
+    rng = np.random.default_rng(7)
+    idx = pd.date_range("2025-01-01", periods=3000, freq="10ms", tz="UTC", name="time_utc")
+    acc = pd.DataFrame(rng.normal(0, 1, (3000, 3)), columns=["x", "y", "z"], index=idx)
+    acc.iloc[100:140] = 0.5  # konstanter Block -> Kurtosis NaN
+
+    starts = pd.date_range("2025-01-01", periods=13, freq="2s", tz="UTC")
+    fdf = pd.DataFrame({"start_utc": starts, "end_utc": starts + pd.Timedelta(4, "s")})
+    fdf.loc[len(fdf)] = [pd.Timestamp("2025-01-02", tz="UTC"), pd.Timestamp("2025-01-02 00:00:01", tz="UTC")]
+    fdf.loc[len(fdf)] = [pd.Timestamp("2025-01-01 00:00:01.005", tz="UTC"), pd.Timestamp("2025-01-01 00:00:01.015", tz="UTC")]
+
+    result = acc_window_features({"Accelerometer": acc}, {"cluster": fdf}, window_key="cluster")["cluster"]
+    expected = _reference_acc_features(acc, fdf, ["x", "y", "z"])
+
+    for col in expected.columns:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-10, atol=1e-12, equal_nan=True)
+
+
+def test_acc_window_features_stats_subset_and_no_mutation(mock_accelerometer_data, mock_features_dataframe):
+    """stats wählt Spalten aus, Input-Features bleiben unverändert."""
+    before = mock_features_dataframe["cluster"].copy()
+    result = acc_window_features(mock_accelerometer_data, mock_features_dataframe, window_key="cluster", stats=["acc_rms", "acc_p2p"])
+    assert {"acc_rms", "acc_p2p"} <= set(result["cluster"].columns)
+    assert "acc_kurtosis" not in result["cluster"].columns
+    pd.testing.assert_frame_equal(mock_features_dataframe["cluster"], before)
+
+
+def test_acc_window_features_unknown_stat_raises(mock_accelerometer_data, mock_features_dataframe):
+    with pytest.raises(ValueError):
+        acc_window_features(mock_accelerometer_data, mock_features_dataframe, window_key="cluster", stats=["acc_mean"])
+
+
+def test_acc_window_features_unsorted_index_raises(mock_accelerometer_data, mock_features_dataframe):
+    acc = mock_accelerometer_data["Accelerometer"].iloc[::-1]
+    with pytest.raises(ValueError):
+        acc_window_features({"Accelerometer": acc}, mock_features_dataframe, window_key="cluster")
+
+
+
+# ============================================================================
+# Tests for compute_window_velocity (vektorisiert)
+# ============================================================================
+
+def test_compute_window_velocity_confidence_rules(capsys):
+    """Penalties (1/2 Punkte), Showstopper, ungültige Punkte und leere Fenster."""
+    t0 = pd.Timestamp("2025-01-01", tz="UTC")
+    secs = [0, 1, 2, 3,   10,   20, 21,   30, 31, 32,   40, 41]
+    speed = [4.0, 5.0, 6.0, 100.0,   5.0,   5.0, 7.0,   25.0, 25.0, 25.0,   -1.0, 5.0]
+    speedacc = [1.0, 1.0, 1.0, -1.0,   2.5,   1.0, 3.0,   1.0, 1.0, 1.0,   1.0, -1.0]
+    location = pd.DataFrame({"speed": speed, "speedAccuracy": speedacc}, index=t0 + pd.to_timedelta(secs, unit="s"))
+    starts = t0 + pd.to_timedelta([0, 10, 20, 30, 40, 50], unit="s")
+    fdf = pd.DataFrame({"start_utc": starts, "end_utc": starts + pd.Timedelta(4, "s")})
+
+    result = compute_window_velocity({"Location": location}, {"cluster": fdf}, window_key="cluster")["cluster"]
+
+    # 3 valide Punkte (100 m/s hat speedAccuracy < 0) -> keine Penalty
+    assert result["v"][0] == pytest.approx(5.0)
+    assert result["v_confidence"][0] == pytest.approx(0.8)
+    # 1 Punkt -> -0.15
+    assert result["v_confidence"][1] == pytest.approx(1.0 - 2.5 / 5.0 - 0.15)
+    # 2 Punkte -> -0.05, Median = Mittelwert
+    assert result["v"][2] == pytest.approx(6.0)
+    assert result["v_confidence"][2] == pytest.approx(1.0 - 2.0 / 5.0 - 0.05)
+    # Showstopper: v > max_speed
+    assert result["v"][3] == pytest.approx(25.0)
+    assert result["v_confidence"][3] == 0.0
+    # nur ungültige Punkte bzw. leeres Fenster -> NaN
+    assert result[["v", "v_confidence"]].iloc[4:].isna().all().all()
+    assert "2 windows had no valid GPS data" in capsys.readouterr().out
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+
+from untergrund.shared.filters import butter_design, causal_filter, zero_phase_filter, chunked_zero_phase_filter
+
+
+@pytest.mark.parametrize("args", [(6, 40.0, 398.7, "lowpass"), (4, 2.0, 100.0, "highpass")])
+@pytest.mark.parametrize("shape", [(500,), (500, 3)])
+def test_zero_phase_filter_matches_sosfiltfilt(args, shape):
+    x = np.random.default_rng(0).normal(size=shape)
+    order, cutoff, fs, btype = args
+    expected = sosfiltfilt(butter(order, cutoff / (fs / 2), btype=btype, output="sos"), x, axis=0)
+    assert np.array_equal(zero_phase_filter(butter_design(*args), x), expected)
+
+
+def test_butter_design_is_memoized_and_read_only():
+    butter_design.cache_clear()
+    first = butter_design(4, 1.0, 100.0, "highpass")
+    second = butter_design(4, 1.0, 100.0, "highpass")
+    assert first is second
+    assert butter_design.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        first.sos[0, 0] = 0.0
+
+
+def test_zero_phase_filter_too_short_raises():
+    design = butter_design(4, 2.0, 100.0, "highpass")
+    with pytest.raises(ValueError):
+        zero_phase_filter(design, np.zeros(design.padlen))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 37, 1000, 10_000])
+def test_chunked_zero_phase_filter_matches_whole_signal(chunk_size):
+    x = np.random.default_rng(1).normal(size=(2000, 3))
+    design = butter_design(6, 40.0, 400.0, "lowpass")
+    assert np.array_equal(chunked_zero_phase_filter(design, x, chunk_size=chunk_size), zero_phase_filter(design, x))
+
+
+def test_chunked_zero_phase_filter_memmap_in_place(tmp_path):
+    x = np.random.default_rng(2).normal(size=(5000, 2))
+    expected = zero_phase_filter(butter_design(4, 2.0, 100.0, "highpass"), x)
+    mm = np.lib.format.open_memmap(tmp_path / "acc.npy", mode="w+", dtype=np.float64, shape=x.shape)
+    mm[:] = x
+    chunked_zero_phase_filter(butter_design(4, 2.0, 100.0, "highpass"), mm, chunk_size=512, out=mm)
+    mm.flush()
+    assert np.array_equal(np.load(tmp_path / "acc.npy"), expected)
+
+
+def test_causal_filter_carries_state_across_blocks():
+    x = np.random.default_rng(3).normal(size=(1000, 3)) + 9.81
+    design = butter_design(4, 2.0, 100.0, "highpass")
+    sos = butter(4, 2.0 / 50.0, btype="highpass", output="sos")
+    expected, _ = sosfilt(sos, x, axis=0, zi=sosfilt_zi(sos)[:, :, None] * x[:1])
+    blocks, z = [], None
+    for block in np.array_split(x, [1, 7, 300, 301]):
+        y, z = causal_filter(design, block, z)
+        blocks.append(y)
+    np.testing.assert_allclose(np.concatenate(blocks), expected, rtol=0, atol=1e-12)
+    assert abs(expected[:50].mean()) < 0.5    # eingeschwungener Start: kein Sprung durch den Offset
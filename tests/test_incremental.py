@@ -0,0 +1,65 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from untergrund import Ctx, Stage
+from untergrund.incremental import raw_start, run_incremental
+from untergrund.orchestrator import run_stage
+from untergrund.synthetic import synthetic_sensor_frames
+
+
+def _raw(seconds: int) -> dict[str, pd.DataFrame]:
+    """SELECT-Ausgabe einer synthetischen Fahrt (200 Hz IMU -> Anti-Aliasing + Resampling aktiv)."""
+    frames = synthetic_sensor_frames(seconds, acc_rate=200, gyro_rate=200, seed=1)
+    return {name: df for name, df in frames.items() if name != "Metadata"}
+
+
+def _until(raw: dict[str, pd.DataFrame], end_ns: int) -> dict[str, pd.DataFrame]:
+    return {name: df[df["time"] < end_ns] for name, df in raw.items()}
+
+
+def _features(ctx: Ctx) -> Ctx:
+    for st in (Stage.PREPROCESS, Stage.WINDOW, Stage.FEATURES):
+        ctx = run_stage(st, ctx)
+    return ctx
+
+
+def test_incremental_updates_match_a_full_run_on_the_grown_ride(config):
+    cfg = config(incremental={"warmup_s": 10})
+    raw = _raw(150)
+    t0 = min(int(df["time"].min()) for df in raw.values())
+    full = _features(Ctx(sensors=raw, config=cfg))
+
+    ctx = _features(Ctx(sensors=_until(raw, t0 + 60 * 10**9), config=cfg))
+    n_first = len(ctx.features["cluster"])
+    for end_s in (100, 150):
+        start = raw_start(ctx).value
+        upload = {name: df[df["time"] >= start] for name, df in _until(raw, t0 + end_s * 10**9).items()}
+        ctx = run_incremental(ctx, upload)
+
+    a, b = full.features["cluster"], ctx.features["cluster"]
+    assert b.index.equals(a.index) and b["start_utc"].equals(a["start_utc"])
+    assert list(b.columns) == list(a.columns)
+    np.testing.assert_allclose(b["acc_rms"], a["acc_rms"], rtol=1e-3)
+    np.testing.assert_allclose(b["acc_rms_vnorm"], a["acc_rms_vnorm"], rtol=1e-3)
+    np.testing.assert_array_equal(b["v"], a["v"])
+
+    report = ctx.artifacts["incremental"]
+    assert report["updates"] == 2 and report["kept"] + report["recomputed"] + report["new"] == len(a) > n_first
+    assert report["raw_start"] == raw_start(ctx)
+    # nur der zuletzt verarbeitete Abschnitt wird gehalten
+    assert ctx.sensors["Accelerometer"].index[0] >= report["resume"] - pd.Timedelta(10, unit="s")
+
+
+def test_incremental_without_new_complete_windows_returns_previous_ctx(config):
+    cfg = config(incremental={"warmup_s": 10})
+    raw = _raw(70)
+    t0 = min(int(df["time"].min()) for df in raw.values())
+    prev = _features(Ctx(sensors=_until(raw, t0 + 60 * 10**9), config=cfg))
+    prev = replace(prev, preds={"cluster": pd.Series(0, index=prev.features["cluster"].index)})
+
+    assert run_incremental(prev, _until(raw, t0 + 60 * 10**9)) is prev
+    grown = run_incremental(prev, raw)
+    assert len(grown.features["cluster"]) > len(prev.features["cluster"])
+    assert "cluster" not in grown.preds and "cluster" not in grown.artifacts["window_index"]
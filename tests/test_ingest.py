@@ -0,0 +1,130 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund.runners.ingest import (
+    read_json,
+    build_sensor_dict,
+    read_json_stream,
+    iter_json_array,
+    filter_sensor_records,
+    ingest_projection,
+    cached_sensors_step,
+    run_ingest,
+)
+from untergrund.context import make_ctx
+from untergrund.shared.cache import file_digest
+
+
+RECORDS = [
+    {"sensor": "Metadata", "version": "3", "device name": "Pixel", "sampleRateMs": "10|10|1000"},
+    {"sensor": "Accelerometer", "time": "1698501144401943124", "seconds_elapsed": "0.01", "z": "0.5", "y": "-1.25", "x": "2"},
+    {"sensor": "Location", "time": "1698501144500000000", "seconds_elapsed": "0.1", "speed": "4.2", "speedAccuracy": "-1"},
+    {"sensor": "Magnetometer", "time": "1698501144401943124", "seconds_elapsed": "0.01", "z": "10", "y": "20", "x": "30"},
+    {"sensor": "Accelerometer", "time": "1698501144411943124", "seconds_elapsed": "0.02", "z": "0.75", "y": "-1.5", "x": "-3"},
+    {"sensor": "Location", "time": "1698501145500000000", "seconds_elapsed": "1.1", "speed": "4.4", "speedAccuracy": "0.5"},
+]
+
+
+@pytest.fixture
+def ride_json(tmp_path):
+    path = tmp_path / "ride.json"
+    path.write_text(json.dumps(RECORDS, indent=1), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_iter_json_array_chunk_boundaries(ride_json, chunk_size):
+    assert list(iter_json_array(ride_json, chunk_size=chunk_size)) == RECORDS
+
+
+def test_read_json_stream_matches_pandas_ingest(ride_json):
+    expected = build_sensor_dict(read_json(ride_json))
+    result = read_json_stream(ride_json, chunk_size=16, block_size=1)
+
+    assert list(result) == list(expected)
+    for sensor, df in expected.items():
+        assert list(result[sensor].columns) == list(df.columns)
+        for col in df.columns:
+            if col == "time":
+                # Stream-Ingest: int64 ns (verlustfrei) statt float64
+                assert result[sensor][col].dtype == np.int64
+                np.testing.assert_allclose(result[sensor][col].to_numpy(dtype=float), df[col].to_numpy())
+            else:
+                pd.testing.assert_series_equal(result[sensor][col], df[col])
+
+
+def test_read_json_stream_sensor_list_skips_other_sensors(ride_json):
+    result = read_json_stream(ride_json, sensor_list=["Accelerometer"])
+    assert sorted(result) == ["Accelerometer", "Metadata"]
+    assert result["Accelerometer"]["time"].tolist() == [1698501144401943124, 1698501144411943124]
+
+
+def test_read_json_stream_invalid_json_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"sensor": "Accelerometer", "x": "1"}, {"sensor": ', encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        read_json_stream(path, chunk_size=8)
+
+
+#--- Projection-Pushdown ---#
+def test_ingest_projection_only_with_pushdown():
+    cfg = {"input_path": "x.json", "sensor_list": ["Accelerometer", "Location"]}
+    assert ingest_projection(cfg) is None
+    cfg["ingest"] = {"pushdown": True}
+    assert ingest_projection(cfg) == ["Accelerometer", "Location", "Metadata"]
+
+
+def test_iter_json_array_skips_unselected_records_without_decoding(tmp_path):
+    path = tmp_path / "ride.json"
+    # Magnetometer-Record ist kein gültiges JSON (01) -> würde beim Dekodieren fehlschlagen
+    path.write_text(
+        '[{"sensor": "Magnetometer", "x": 01, "note": "a}b"},\n'
+        ' {"sensor": "Accelerometer", "x": "1"},\n'
+        ' {"x": "2", "sensor": "Magnetometer"}]',
+        encoding="utf-8",
+    )
+    records = list(iter_json_array(path, chunk_size=5, keep_sensors={"Accelerometer"}))
+    # Records ohne führenden "sensor"-Key werden normal dekodiert (Filter danach)
+    assert records == [{"sensor": "Accelerometer", "x": "1"}, {"x": "2", "sensor": "Magnetometer"}]
+    assert list(read_json_stream(path, sensor_list=["Accelerometer"])) == ["Accelerometer"]
+
+
+def test_filter_sensor_records_pandas_engine(ride_json):
+    expected = build_sensor_dict(read_json(ride_json))
+    result = build_sensor_dict(filter_sensor_records(read_json(ride_json), sensor_list=["Location", "Metadata"]))
+    assert list(result) == ["Location", "Metadata"]
+    pd.testing.assert_frame_equal(result["Location"], expected["Location"])
+
+
+#--- Ingest-Cache ---#
+def test_cached_sensors_step_reads_once(ride_json, tmp_path):
+    calls = []
+
+    def read_step(cfg):
+        calls.append(cfg["input_path"])
+        return read_json_stream(cfg["input_path"])
+
+    step = cached_sensors_step(read_step, cache_dir=str(tmp_path / "cache"), params={"engine": "stream", "sensors": None})
+    first = step({"input_path": ride_json})
+    second = step({"input_path": ride_json})
+
+    assert len(calls) == 1
+    assert list(second) == list(first)
+    for sensor, df in first.items():
+        pd.testing.assert_frame_equal(second[sensor], df)
+
+
+def test_run_ingest_records_input_digest(ride_json, tmp_path):
+    cfg = {
+        "input_path": str(ride_json),
+        "sensor_list": ["Accelerometer"],
+        "ingest": {"engine": "stream", "pushdown": True, "cache": True, "cache_dir": str(tmp_path / "cache")},
+    }
+    ctx = run_ingest(make_ctx(cfg))
+    assert list(ctx.sensors) == ["Accelerometer"]
+    assert ctx.meta["device name"] == "Pixel"
+    assert ctx.artifacts["input"]["digest"] == file_digest(ride_json)
+    assert (tmp_path / "cache" / ctx.artifacts["input"]["cache_key"] / "schema.json").is_file()
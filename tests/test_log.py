@@ -0,0 +1,58 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund import Ctx, CtxPipeline
+from untergrund.log import get_logger, is_enabled, log_level, log_level_from_config
+from untergrund.shared.inspect import head_tail, print_description
+
+
+class _NoCopy:
+    """Schlägt fehl, sobald der Tap eine Kopie anlegt oder das Objekt formatiert."""
+
+    def __deepcopy__(self, memo):
+        raise AssertionError("tap copied although disabled")
+
+    def __str__(self):
+        raise AssertionError("formatted although disabled")
+
+
+def _ctx() -> Ctx:
+    return Ctx(sensors={"acc": pd.DataFrame({"x": np.arange(5.0)})}, meta={"probe": _NoCopy()})
+
+
+def test_diagnostic_taps_are_skipped_below_debug_without_copy(capsys):
+    calls = []
+    pipe = CtxPipeline()
+    pipe.tap(head_tail, source="sensors")
+    pipe.tap(lambda s: calls.append("user"), source="sensors")                # ohne Level: läuft immer
+    pipe.tap(lambda m: calls.append("debug"), source="meta", level="DEBUG")   # würde meta kopieren
+
+    with log_level("INFO"):
+        pipe(_ctx())
+    assert calls == ["user"]
+    assert capsys.readouterr().out == ""
+
+    with log_level("DEBUG"):
+        CtxPipeline().tap(head_tail, source="sensors").tap(print_description, source="sensors")(_ctx())
+    out = capsys.readouterr().out
+    assert out.startswith("[Debug] ===== Sensor: acc =====") and "mean" in out
+
+    with pytest.raises(ValueError):
+        CtxPipeline().tap(head_tail, source="sensors", level="LOUD")
+
+
+def test_messages_are_lazy_leveled_and_follow_redirected_stdout():
+    log = get_logger("test")
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), log_level_from_config({"log_level": "WARNING"}):
+        log.info("hidden %s", _NoCopy())
+        log.warning("shown %s of %d", "one", 2)
+        assert not is_enabled("INFO")
+    assert buffer.getvalue() == "[Warning] shown one of 2\n"
+    assert is_enabled("INFO") and not is_enabled("DEBUG")   # Level nach dem Block zurückgesetzt
+    with log_level_from_config({}):
+        assert is_enabled("INFO")
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from untergrund import Ctx, CtxPipeline
+from untergrund.memaudit import dominant_step, format_memory_report, frame_bytes
+from untergrund.shared.sensors import transform_all_sensors
+
+
+@transform_all_sensors
+def _scale(df: pd.DataFrame, *, factor: float = 2.0, copy: bool = True) -> pd.DataFrame:
+    out = df.copy(deep=copy)
+    out["x"] = df["x"] * factor
+    return out
+
+
+def _blow_up(sensors: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    tmp = np.ones((2_000_000,))  # ~16 MB temporär
+    return {k: v.assign(total=float(tmp.sum())) for k, v in sensors.items()}
+
+
+def _ctx() -> Ctx:
+    return Ctx(sensors={"acc": pd.DataFrame({"x": np.arange(1000.0), "y": np.zeros(1000)})})
+
+
+def test_memory_audit_reports_every_step_and_dominant_peak(capsys):
+    pipe = CtxPipeline(memory_audit=True)
+    pipe.add(_scale, source="sensors")
+    pipe.add(_blow_up, source="sensors")
+    pipe.tap(lambda s: None, source="sensors", name="noop")
+    out = pipe(_ctx())
+
+    report = pipe.memory_report
+    assert [r["step"].split(": ")[-1] for r in report] == ["_scale", "_blow_up", "tap(noop)"]
+    assert dominant_step(report)["step"].endswith("_blow_up")
+    assert report[1]["peak_bytes"] >= 16_000_000
+    assert report[-1]["frames_bytes"] == frame_bytes(out) == frame_bytes(out.sensors)
+    assert "peak dominated by step 02" in capsys.readouterr().out
+    marked = [line for line in format_memory_report(report).splitlines()[1:-1] if line.startswith("*")]
+    assert len(marked) == 1 and "_blow_up" in marked[0]
+
+
+def test_defensive_copies_off_binds_copy_false_to_view_safe_steps():
+    ctx = _ctx()
+    pipe = CtxPipeline(defensive_copies=False)
+    pipe.add(_scale, source="sensors")
+    pipe.add(_scale, source="sensors", fn_kwargs={"factor": 1.0, "copy": True})  # explizit hat Vorrang
+    pipe.add(_blow_up, source="sensors")  # ohne copy-Parameter: unverändert
+    assert "copy=False" in repr(pipe).splitlines()[1]
+    assert "copy=True" in repr(pipe).splitlines()[2]
+
+    view_pipe = CtxPipeline(defensive_copies=False).add(_scale, source="sensors")
+    out = view_pipe(ctx)
+    assert np.shares_memory(out.sensors["acc"]["y"].to_numpy(), ctx.sensors["acc"]["y"].to_numpy())
+    assert ctx.sensors["acc"]["x"].iloc[1] == 1.0  # Eingabe unverändert
+    assert out.sensors["acc"]["x"].iloc[1] == 2.0
+    assert pipe(ctx).sensors["acc"]["total"].iloc[0] == 2_000_000
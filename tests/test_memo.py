@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from untergrund import Ctx, CtxPipeline
+from untergrund.memo import StepMemo, fingerprint, step_identity
+from untergrund.shared.sensors import transform_all_sensors
+
+CALLS: list[str] = []
+
+
+@transform_all_sensors
+def scale(df: pd.DataFrame, *, sensor_name: str | None = None, factor: float = 2.0) -> pd.DataFrame:
+    CALLS.append(f"scale:{sensor_name}")
+    return df * factor
+
+
+@transform_all_sensors
+def shift(df: pd.DataFrame, *, sensor_name: str | None = None, offset: float = 1.0) -> pd.DataFrame:
+    CALLS.append(f"shift:{sensor_name}")
+    return df + offset
+
+
+def make_ctx() -> Ctx:
+    idx = pd.date_range("2025-01-01", periods=4, freq="10ms", tz="UTC", name="time_utc")
+    return Ctx(sensors={"acc": pd.DataFrame({"x": np.arange(4.0)}, index=idx), "gyr": pd.DataFrame({"x": np.ones(4)}, index=idx)})
+
+
+def build(memo: StepMemo, offset: float) -> CtxPipeline:
+    return (
+        CtxPipeline(memo=memo)
+        .add(scale, source="sensors", fn_kwargs={"factor": 3.0})
+        .add(shift.select(include=["acc"]), source="sensors", fn_kwargs={"offset": offset})
+    )
+
+
+def test_memo_reuses_unchanged_steps():
+    memo = StepMemo()
+    ctx = make_ctx()
+    CALLS.clear()
+    first = build(memo, offset=1.0)(ctx)
+    assert CALLS == ["scale:acc", "scale:gyr", "shift:acc"]
+
+    # identischer Lauf -> alles aus dem Cache
+    CALLS.clear()
+    again = build(memo, offset=1.0)(ctx)
+    assert CALLS == []
+    pd.testing.assert_frame_equal(again.sensors["acc"], first.sensors["acc"])
+
+    # nur der späte Step ändert sich -> nur dieser rechnet neu
+    CALLS.clear()
+    tweaked = build(memo, offset=5.0)(ctx)
+    assert CALLS == ["shift:acc"]
+    assert tweaked.sensors["acc"]["x"].tolist() == [5.0, 8.0, 11.0, 14.0]
+    assert memo.hits == 3 and memo.misses == 3
+
+
+def test_memo_misses_on_changed_input():
+    memo = StepMemo()
+    ctx = make_ctx()
+    build(memo, offset=1.0)(ctx)
+    changed = make_ctx()
+    changed.sensors["acc"].iloc[0, 0] = 42.0
+    CALLS.clear()
+    build(memo, offset=1.0)(changed)
+    assert CALLS == ["scale:acc", "scale:gyr", "shift:acc"]
+
+
+def test_memo_lru_eviction_by_entries():
+    memo = StepMemo(max_entries=1)
+    build(memo, offset=1.0)(make_ctx())
+    assert len(memo) == 1
+
+
+def test_step_identity_depends_on_kwargs_and_selection():
+    base = step_identity(scale.with_kwargs(factor=3.0))
+    assert base == step_identity(scale.with_kwargs(factor=3.0))
+    assert base != step_identity(scale.with_kwargs(factor=4.0))
+    assert step_identity(scale.select(include=["acc"])) != step_identity(scale.select(include=["gyr"]))
+    assert step_identity(lambda d: d) is None
+
+
+def test_fingerprint_detects_index_changes():
+    df = make_ctx().sensors["acc"]
+    shifted = df.copy()
+    shifted.index = shifted.index + pd.Timedelta(1, "ms")
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(shifted)
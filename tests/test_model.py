@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund import Ctx
+from untergrund.runners.model import (
+    _iter_batches, feature_matrix, fit_cluster_model, fit_ride_model, predict_clusters, run_model, select_model_columns,
+)
+
+
+def _features(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    """Drei gut getrennte Untergründe in acc_rms_vnorm/acc_kurtosis, plus Rohspalte und NaN-Fenster."""
+    rng = np.random.default_rng(seed)
+    surface = np.arange(n) % 3
+    fdf = pd.DataFrame({
+        "acc_rms": rng.normal(size=n),
+        "acc_rms_vnorm": surface * 5.0 + rng.normal(scale=0.1, size=n),
+        "acc_kurtosis": surface * 2.0 + rng.normal(scale=0.1, size=n),
+    })
+    fdf.loc[[0, 1], "acc_rms_vnorm"] = np.nan
+    return fdf
+
+
+def _same_partition(a: np.ndarray, b: np.ndarray) -> bool:
+    return len(set(zip(a, b))) == len(set(a)) == len(set(b))
+
+
+def test_run_model_clusters_vnorm_and_kurtosis_deterministically():
+    fdf = _features()
+    assert select_model_columns(fdf) == ["acc_rms_vnorm", "acc_kurtosis"]
+    X, valid = feature_matrix(fdf, ["acc_rms_vnorm", "acc_kurtosis"])
+    assert X.dtype == np.float32 and X.shape == (298, 2) and not valid[:2].any()
+
+    ctx = Ctx(features={"cluster": fdf}, config={"model": {"n_clusters": 3}})
+    out = run_model(ctx)
+    labels = out.preds["cluster"]
+    assert labels.index.equals(fdf.index) and (labels.iloc[:2] == -1).all()
+    assert _same_partition(labels.iloc[2:].to_numpy(), (np.arange(300) % 3)[2:])
+    assert out.artifacts["cluster_model"]["centers"].dtype == np.float32
+    pd.testing.assert_series_equal(run_model(ctx).preds["cluster"], labels)
+
+    minibatch = fit_ride_model(fdf, n_clusters=3, algorithm="minibatch", batch_size=64)
+    assert minibatch is not None and minibatch["algorithm"] == "minibatch"
+    assert _same_partition(predict_clusters(fdf, minibatch).to_numpy(), labels.to_numpy())
+
+    assert fit_ride_model(fdf.iloc[:3], n_clusters=4) is None
+    with pytest.raises(ValueError):
+        fit_ride_model(fdf, algorithm="dbscan")
+
+
+def test_fit_cluster_model_streams_rides_in_fixed_batches():
+    rides = [_features(n, seed=i) for i, n in enumerate((50, 7, 120, 90))]
+    seen = []
+
+    def frames():
+        for fdf in rides:
+            seen.append(len(fdf))
+            yield fdf
+
+    assert [len(b) for b in _iter_batches(rides, ["acc_rms_vnorm", "acc_kurtosis"], 64)] == [64, 64, 64, 64, 3]
+    model = fit_cluster_model(frames, n_clusters=3, batch_size=64, n_epochs=2)
+    assert seen == [50, 7, 120, 90] * 3      # Scaler-Durchlauf + 2 Epochen, Frame für Frame
+    assert model["n_samples"] == 259 and model["centers"].shape == (3, 2)
+
+    # vorgegebenes Modell: run_model ordnet nur zu
+    ctx = Ctx(features={"cluster": rides[2]}, artifacts={"cluster_model": model})
+    labels = run_model(ctx).preds["cluster"]
+    assert _same_partition(labels.iloc[2:].to_numpy(), (np.arange(120) % 3)[2:])
+    assert run_model(ctx).artifacts["cluster_model"] is model
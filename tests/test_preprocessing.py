@@ -2,7 +2,9 @@
 import numpy as np
 import pytest
 
-from untergrund.runners.preprocess import time_to_index, handle_nat_in_index, sort_sensors_by_time_index, group_duplicate_timeindex, validate_basic_preprocessing
+from untergrund.runners.preprocess import time_to_index, drop_columns, trim_to_common_timeframe, handle_nat_in_index, sort_sensors_by_time_index, group_duplicate_timeindex, validate_basic_preprocessing
+from untergrund.runners.preprocess import anti_aliasing_lowpass_filter, resample_imu_sensors, high_pass_filter, condition_imu_sensors
+from untergrund.shared.resample import bin_resample, resample_block
 
 
 #---KI generierte Tests zu time_to_index---#
@@ -279,3 +281,124 @@ def test_nat_in_index_raises():
         validate_basic_preprocessing.core(df, sensor_name="acc")
     assert "NaT" in str(e.value)
 #--- ---#
+
+
+#--- Fusionierte IMU-Aufbereitung ---#
+def _jittered_imu(n: int = 4000, rate: float = 400.0, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    step = int(1e9 / rate)
+    t = 1698501144401773000 + np.cumsum(rng.integers(int(step * 0.9), int(step * 1.1), n))
+    idx = pd.DatetimeIndex(t.view("datetime64[ns]"), name="time_utc").tz_localize("UTC")
+    return pd.DataFrame(rng.normal(size=(n, 3)), columns=["x", "y", "z"], index=idx)
+
+
+@pytest.mark.parametrize("agg_func", ["mean", "median", "first", "last"])
+def test_bin_resample_matches_pandas_resample(agg_func):
+    df = _jittered_imu().iloc[np.r_[0:1000, 1200:4000]]  # Lücke -> leere Bins
+    step = pd.Timedelta("10ms")
+    expected = df.resample(step, origin="epoch", label="left", closed="left").agg(agg_func).interpolate(method="time", limit_direction="both")
+    grid, out = bin_resample(df.index.asi8, df.to_numpy(), step.value, agg_func=agg_func)
+    assert np.array_equal(grid, expected.index.asi8)
+    # pandas interpoliert über float(ns) (~µs-Rundung), bin_resample über Bin-Positionen
+    np.testing.assert_allclose(out, expected.to_numpy(), rtol=1e-9, atol=1e-5)
+
+
+def test_condition_imu_sensors_matches_separate_steps():
+    df = _jittered_imu()
+    cfg = {
+        "anti_aliasing_lowpass": {"Accelerometer": {"target_rate": 100, "order": 6, "include_columns": ["x", "y", "z"]}},
+        "resample_imu": {"target_rate": 100, "agg_func": "mean", "interp_method": "time"},
+        "hp_filters": {"Accelerometer": {"cutoff_freq": 2, "sample_rate": 100, "order": 4, "include_columns": ["x", "y"]}},
+    }
+    expected = anti_aliasing_lowpass_filter.core(df, sensor_name="Accelerometer", cfg=cfg)
+    expected = resample_imu_sensors.core(expected, sensor_name="Accelerometer", cfg=cfg)
+    expected = high_pass_filter.core(expected, sensor_name="Accelerometer", cfg=cfg)
+
+    out = condition_imu_sensors.core(df, sensor_name="Accelerometer", cfg=cfg)
+
+    assert out.index.equals(expected.index)
+    assert list(out.columns) == list(expected.columns)
+    np.testing.assert_allclose(out.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+    assert df.equals(_jittered_imu())  # Input unverändert
+
+
+def test_condition_imu_sensors_nan_raises():
+    df = _jittered_imu()
+    df.iloc[5, 0] = np.nan
+    with pytest.raises(ValueError):
+        condition_imu_sensors.core(df, sensor_name="Accelerometer")
+#--- ---#
+
+
+#--- Resampling-Pfade (interp / poly) ---#
+def _sine_imu(rate: float, freqs: list[float], seconds: float = 20.0) -> pd.DataFrame:
+    step = int(1e9 / rate)
+    t = 1698501144400000000 + np.arange(int(rate * seconds), dtype=np.int64) * step
+    s = (t - t[0]) / 1e9
+    idx = pd.DatetimeIndex(t.view("datetime64[ns]"), name="time_utc").tz_localize("UTC")
+    return pd.DataFrame({f"f{i}": np.sin(2 * np.pi * f * s) for i, f in enumerate(freqs)}, index=idx)
+
+
+def test_resample_interp_path_keeps_samples_on_grid():
+    df = _sine_imu(100.0, [5.0])
+    grid, out, path = resample_block(df.index.asi8, df.to_numpy(), 10_000_000, method="auto")
+    assert path == "interp"
+    assert np.array_equal(grid, df.index.asi8)
+    np.testing.assert_allclose(out, df.to_numpy(), atol=1e-12)
+
+
+def test_resample_poly_path_decimates_with_anti_aliasing():
+    df = _sine_imu(400.0, [5.0, 150.0])  # 150 Hz liegt oberhalb der neuen Nyquist-Frequenz (50 Hz)
+    grid, out, path = resample_block(df.index.asi8, df.to_numpy(), 10_000_000, method="auto")
+    assert path == "poly"
+    assert np.all(grid % 10_000_000 == 0) and np.all(np.diff(grid) == 10_000_000)
+    inner = slice(100, -100)
+    expected = np.sin(2 * np.pi * 5.0 * (grid - df.index.asi8[0]) / 1e9)
+    np.testing.assert_allclose(out[inner, 0], expected[inner], atol=1e-2)
+    assert np.abs(out[inner, 1]).max() < 1e-2
+
+
+def test_resample_imu_sensors_method_from_config():
+    df = _sine_imu(400.0, [5.0])
+    out = resample_imu_sensors.core(df, sensor_name="Accelerometer", cfg={"resample_imu": {"target_rate": 100, "method": "poly"}})
+    assert out.index.freq == pd.Timedelta("10ms")
+    assert out.index.tz is not None and out.index.name == "time_utc"
+    with pytest.raises(ValueError):
+        resample_imu_sensors.core(df, sensor_name="Accelerometer", cfg={"resample_imu": {"method": "cubic"}})
+#--- ---#
+
+
+#--- Blockweise Filterung ---#
+def test_filters_chunk_size_from_config_matches_whole_signal():
+    df = _jittered_imu(n=3000)
+    cfg = {"anti_aliasing_lowpass": {"Accelerometer": {"target_rate": 100, "order": 6}},
+           "hp_filters": {"Accelerometer": {"cutoff_freq": 8, "sample_rate": 400, "order": 4}}}
+    chunked = {"anti_aliasing_lowpass": {"Accelerometer": {**cfg["anti_aliasing_lowpass"]["Accelerometer"], "chunk_size": 256}},
+               "hp_filters": {"Accelerometer": {**cfg["hp_filters"]["Accelerometer"], "chunk_size": 256}}}
+    for step in (anti_aliasing_lowpass_filter, high_pass_filter, condition_imu_sensors):
+        expected = step.core(df, sensor_name="Accelerometer", cfg=cfg)
+        pd.testing.assert_frame_equal(step.core(df, sensor_name="Accelerometer", cfg=chunked), expected)
+    assert df.equals(_jittered_imu(n=3000))  # Input unverändert
+#--- ---#
+
+
+#--- Views statt defensiver Kopien (copy=False) ---#
+def test_view_mode_matches_copy_mode_and_shares_memory():
+    raw = pd.DataFrame({"time": 1704067200000000000 + np.arange(3000) * 2_500_000,
+                        "seconds_elapsed": np.arange(3000) / 400, "x": np.sin(np.arange(3000.0)), "y": np.cos(np.arange(3000.0))})
+    raw_before = raw.copy()
+    cfg = {"anti_aliasing_lowpass": {"Accelerometer": {"target_rate": 100, "order": 6, "include_columns": ["x"]}},
+           "hp_filters": {"Accelerometer": {"cutoff_freq": 8, "sample_rate": 400, "order": 4, "include_columns": ["x"]}}}
+
+    def run(copy: bool) -> pd.DataFrame:
+        df = time_to_index.core(raw, copy=copy)
+        df = drop_columns.core(df, columns_to_drop=["seconds_elapsed"], copy=copy)
+        df = trim_to_common_timeframe({"Accelerometer": df}, copy=copy)["Accelerometer"]
+        df = anti_aliasing_lowpass_filter.core(df, sensor_name="Accelerometer", cfg=cfg, copy=copy)
+        return high_pass_filter.core(df, sensor_name="Accelerometer", cfg=cfg, copy=copy)
+
+    viewed = run(copy=False)
+    pd.testing.assert_frame_equal(viewed, run(copy=True))
+    assert np.shares_memory(viewed["y"].to_numpy(), raw["y"].to_numpy())  # ungefilterte Spalte ohne Kopie
+    pd.testing.assert_frame_equal(raw, raw_before)  # Input unverändert
+#--- ---#
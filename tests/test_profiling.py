@@ -0,0 +1,67 @@
+import cProfile
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund import Ctx, CtxPipeline
+from untergrund.profiling import StepProfiler, profile_hotspots
+
+
+def _ctx() -> Ctx:
+    return Ctx(sensors={"acc": pd.DataFrame({"x": np.arange(1000.0)}), "gps": pd.DataFrame({"v": np.ones(10)})})
+
+
+def _half(sensors: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    return {k: v.iloc[: len(v) // 2] for k, v in sensors.items()}
+
+
+def _fail(sensors: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    raise ValueError("boom")
+
+
+def test_profile_records_rows_and_times_per_step():
+    pipe = CtxPipeline(profile=True, name="PREPROCESS")
+    pipe.add(_half, source="sensors")
+    pipe.tap(lambda s: None, source="sensors", name="noop")
+    ctx = pipe.record_reports(pipe(_ctx()))
+
+    first, tap = pipe.profile_report
+    assert (first["rows_in"], first["rows_out"]) == (1010, 505)
+    assert (tap["rows_in"], tap["rows_out"]) == (505, None)
+    assert first["wall_s"] >= 0 and first["cpu_s"] >= 0 and "capture" not in first
+    assert ctx.artifacts["profile"] == {"PREPROCESS": pipe.profile_report}
+    # zweite Pipeline derselben Stage wird angehängt
+    assert len(pipe.record_reports(ctx).artifacts["profile"]["PREPROCESS"]) == 4
+
+
+def test_cprofile_capture_and_dump(tmp_path):
+    cfg = {"profile": {"enabled": True, "capture": "cprofile", "top": 5, "dir": str(tmp_path)}}
+    pipe = CtxPipeline.from_config(cfg, name="WINDOW").add(_half, source="sensors")
+    pipe(_ctx())
+    assert "_half" in pipe.profile_report[0]["capture"]
+    assert [p.name for p in (tmp_path / "WINDOW").iterdir()] == ["01__half.prof"]
+
+
+def test_failing_step_stops_cprofile():
+    pipe = CtxPipeline(profile="cprofile").add(_fail, source="sensors")
+    with pytest.raises(RuntimeError):
+        pipe(_ctx())
+    other = cProfile.Profile()
+    other.enable()  # würde scheitern, wenn der Step-Profiler noch aktiv wäre
+    other.disable()
+
+
+def test_profile_options_and_hotspots():
+    assert CtxPipeline.from_config({}).profile is False
+    with pytest.raises(ValueError):
+        StepProfiler(capture="perf")  # type: ignore[arg-type]
+    if importlib.util.find_spec("pyinstrument") is None:
+        with pytest.raises(ValueError):
+            StepProfiler(capture="pyinstrument")
+    with pytest.raises(ValueError):
+        CtxPipeline().record_reports(_ctx())
+
+    profile = {"INGEST": [{"step": "a", "wall_s": 0.5}], "FEATURES": [{"step": "b", "wall_s": 2.0}, {"step": "c", "wall_s": 0.1}]}
+    assert [(r["stage"], r["step"]) for r in profile_hotspots(profile, top=2)] == [("FEATURES", "b"), ("INGEST", "a")]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund.shared.cache import save_frames
+from untergrund.shared.sensor_store import write_sensor_store, open_sensor_store, is_memory_mapped, sensor_store_path
+
+
+def _sensors() -> dict[str, pd.DataFrame]:
+    idx = pd.date_range("2025-01-01", periods=1000, freq="10ms", tz="UTC", name="time_utc")
+    loc_idx = pd.date_range("2025-01-01", periods=10, freq="1s", tz="UTC", name="time_utc")
+    return {
+        "Accelerometer": pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 3)), columns=["x", "y", "z"], index=idx),
+        "Location": pd.DataFrame({"speed": np.arange(10.0)}, index=loc_idx),
+    }
+
+
+def test_write_sensor_store_returns_memory_mapped_frames(tmp_path):
+    sensors = _sensors()
+    mapped = write_sensor_store(sensors, directory=tmp_path / "store")
+
+    assert all(is_memory_mapped(df) for df in mapped.values())
+    assert not is_memory_mapped(sensors["Accelerometer"])
+    for name, df in sensors.items():
+        pd.testing.assert_frame_equal(mapped[name], df, check_freq=False)
+
+    # read-only: In-place-Änderungen schlagen fehl statt die Datei zu verändern
+    with pytest.raises(ValueError):
+        mapped["Accelerometer"]["x"].to_numpy()[0] = 1.0
+    # Slices bleiben Views auf die Datei
+    assert is_memory_mapped(mapped["Accelerometer"].iloc[100:200])
+
+
+def test_write_sensor_store_reuses_an_existing_store(tmp_path):
+    store = tmp_path / "store"
+    first = write_sensor_store(_sensors(), directory=store)
+    files = {p: (p.stat().st_ino, p.stat().st_mtime_ns) for p in store.rglob("*")}
+
+    changed = {name: df * 2 for name, df in _sensors().items()}
+    second = write_sensor_store(changed, directory=store)
+
+    assert {p: (p.stat().st_ino, p.stat().st_mtime_ns) for p in store.rglob("*")} == files
+    pd.testing.assert_frame_equal(second["Accelerometer"], first["Accelerometer"])
+    # Wettlauf: ein anderer Writer hat den Store zwischen Prüfung und os.replace fertig geschrieben
+    save_frames(store, changed, overwrite=False)
+    pd.testing.assert_frame_equal(open_sensor_store(store)["Location"], first["Location"])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["store"]
+
+
+def test_open_sensor_store_missing_raises(tmp_path):
+    with pytest.raises(ValueError):
+        open_sensor_store(tmp_path / "missing")
+
+
+def test_sensor_store_path_depends_on_preprocess_config(tmp_path):
+    ride = tmp_path / "ride.json"
+    ride.write_text("[]", encoding="utf-8")
+    cfg = {"input_path": str(ride), "sensor_list": ["Accelerometer"], "sensor_store": {"dir": str(tmp_path / "s")}}
+    assert sensor_store_path(cfg).parent == tmp_path / "s"
+    assert sensor_store_path(cfg) == sensor_store_path({**cfg, "window_duration_s": 6})
+    assert sensor_store_path(cfg) != sensor_store_path({**cfg, "hp_filters": {"Accelerometer": {"order": 2}}})
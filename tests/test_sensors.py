@@ -178,3 +178,41 @@ def core_fn(x: pd.DataFrame, *, sensor_name: str | None = None, k: int = 0) -> p
     # .core sollte die ursprüngliche Kernfunktion bleiben
     assert w.core is base_core
     assert s.core is base_core
+
+
+# -------------------- parallel(): Ausführungs-Policy ------------------
+
+def test_parallel_matches_sequential_and_composes_with_select_and_with_kwargs():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    @S.transform_all_sensors
+    def inc(x: pd.DataFrame, *, sensor_name: str | None = None, c: int = 1) -> pd.DataFrame:
+        out = x.copy()
+        out["y"] = out["y"] + c
+        out.attrs["thread"] = threading.current_thread().name
+        out.attrs["seen_name"] = sensor_name
+        return out
+
+    sensors = {"A": df([0]), "B": df([1, 2]), "C": df([3])}
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="test-pool") as pool:
+        step = inc.select(exclude=["C"]).parallel(executor=pool).with_kwargs(c=10)
+        out = cast(dict[str, pd.DataFrame], step(sensors))
+
+    assert list(out) == ["A", "B", "C"]   # Reihenfolge bleibt erhalten
+    assert out["A"]["y"].tolist() == [10]
+    assert out["B"]["y"].tolist() == [11, 12]
+    assert out["C"] is sensors["C"]       # nicht selektiert → unverändert
+    assert out["B"].attrs["seen_name"] == "B"
+    assert out["A"].attrs["thread"].startswith("test-pool")
+
+
+def test_parallel_propagates_exceptions():
+    @S.transform_all_sensors
+    def boom(x: pd.DataFrame, *, sensor_name: str | None = None) -> pd.DataFrame:
+        if sensor_name == "B":
+            raise ValueError("bad sensor")
+        return x
+
+    with pytest.raises(ValueError, match="bad sensor"):
+        boom.parallel()({"A": df([0]), "B": df([1])})
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from untergrund.runners.ingest import SensorBuffers, iter_json_array, read_json_stream
+from untergrund.server import IngestServer, push_records
+from untergrund.synthetic import synthetic_sensor_frames, write_synthetic_ride
+
+
+def _request(address, method: str, path: str, body=None) -> tuple[int, dict, dict]:
+    """Lokaler Client (urllib, blockierend -> asyncio.to_thread)."""
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    req = urllib.request.Request(f"http://{address[0]}:{address[1]}{path}", data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read()), dict(resp.headers)
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read()), dict(e.headers)
+
+
+def _push_payload(records: list[dict], session: str) -> dict:
+    """Export-Records -> SensorLogger-Push-Format (name/time/values)."""
+    payload = [
+        {"name": r["sensor"].lower(), "time": int(r["time"]), "values": {k: float(v) for k, v in r.items() if k not in ("sensor", "time", "seconds_elapsed")}}
+        for r in records if r["sensor"] != "Metadata"
+    ]
+    return {"messageId": 0, "sessionId": session, "deviceId": "pixel", "payload": payload}
+
+
+def test_push_payload_buffers_like_streaming_ingest(tmp_path):
+    path = write_synthetic_ride(tmp_path / "ride.json", synthetic_sensor_frames(20, acc_rate=50, gyro_rate=50))
+    records = list(iter_json_array(path))
+
+    buffers = SensorBuffers()
+    for i in range(0, len(records), 500):
+        for record in push_records(records[i:i + 500])[1]:
+            buffers.append(record)
+    frames, expected = buffers.to_frames(), read_json_stream(path)
+    assert list(frames) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(frames[name], expected[name])
+
+    session, pushed = push_records(_push_payload(list(iter_json_array(path))[:5], "s1"))
+    assert session == "s1" and pushed[0] == {"sensor": "Metadata", "deviceId": "pixel", "sessionId": "s1"}
+    assert {r["sensor"] for r in pushed[1:]} <= {"Accelerometer", "Gyroscope", "Location"}
+
+
+def test_invalid_content_length_answers_400_and_closes(config):
+    async def send(address, length: str) -> tuple[bytes, bytes]:
+        reader, writer = await asyncio.open_connection(*address)
+        writer.write(f"POST /push HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=10)   # liest bis die Verbindung schließt
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return head, body
+
+    async def scenario():
+        async with IngestServer(config(server={"port": 0})) as server:
+            return [await send(server.address, length) for length in ("abc", "-5")]
+
+    for head, body in asyncio.run(scenario()):
+        assert head.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in head
+        assert json.loads(body) == {"error": "Invalid Content-Length."}
+
+
+def test_server_processes_pushed_ride_in_worker_pool(tmp_path, config):
+    cfg = config(server={"port": 0})
+    path = write_synthetic_ride(tmp_path / "ride.json", synthetic_sensor_frames(40, acc_rate=200, gyro_rate=200, seed=1))
+    records = list(iter_json_array(path))
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            async with IngestServer(cfg, executor=pool) as server:
+                for i in range(0, len(records), 2000):
+                    status, body, _ = await asyncio.to_thread(_request, server.address, "POST", "/push", _push_payload(records[i:i + 2000], "ride-1"))
+                    assert status == 200
+                assert (await asyncio.to_thread(_request, server.address, "GET", "/status"))[1]["sessions"] == {"receiving": 1}
+                status, body, _ = await asyncio.to_thread(_request, server.address, "POST", "/rides/ride-1/finish")
+                assert status == 202 and body["status"] in ("queued", "running")
+                assert (await asyncio.to_thread(_request, server.address, "POST", "/push", _push_payload(records[:5], "ride-1")))[0] == 409
+                assert (await asyncio.to_thread(_request, server.address, "GET", "/rides/unknown"))[0] == 404
+            return server.sessions["ride-1"]
+
+    ride = asyncio.run(scenario())
+    assert ride.status == "ok", ride.result["error"]
+    assert ride.result["input_path"] == "ride-1" and ride.result["n_windows"] > 10
+    assert "INGEST" not in ride.result["stage_timings"] and "FEATURES" in ride.result["stage_timings"]
+
+
+def test_full_queue_answers_503_until_a_worker_is_free(config):
+    release = threading.Event()
+    processed = []
+
+    def process(cfg, *, log_path=None, sensors=None):
+        release.wait(10)
+        processed.append(cfg["input_path"])
+        return {"input_path": cfg["input_path"], "status": "ok", "error": None, "n_windows": 0, "total_s": 0.0}
+
+    record = {"sensor": "Accelerometer", "time": "1", "x": "0", "y": "0", "z": "0"}
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            server = IngestServer(config(server={"port": 0, "workers": 1, "queue_size": 1, "put_timeout_s": 0.05}), executor=pool, process=process)
+            async with server:
+                for session in ("a", "b", "c"):
+                    assert (await asyncio.to_thread(_request, server.address, "POST", f"/push?session={session}", [record]))[0] == 200
+                assert (await asyncio.to_thread(_request, server.address, "POST", "/rides/a/finish"))[0] == 202
+                while server.in_flight == 0:   # a läuft, b füllt die Queue
+                    await asyncio.sleep(0.01)
+                assert (await asyncio.to_thread(_request, server.address, "POST", "/rides/b/finish"))[0] == 202
+                status, body, headers = await asyncio.to_thread(_request, server.address, "POST", "/rides/c/finish")
+                assert status == 503 and headers["Retry-After"] == "1" and server.sessions["c"].status == "receiving"
+
+                release.set()
+                while server.sessions["b"].status != "ok":
+                    await asyncio.sleep(0.01)
+                assert (await asyncio.to_thread(_request, server.address, "POST", "/rides/c/finish"))[0] == 202
+            return server
+
+    server = asyncio.run(scenario())
+    assert processed == ["a", "b", "c"] and server.status()["sessions"] == {"ok": 3}
+
+
+def test_failed_rides_free_their_slot_and_a_broken_pool_is_replaced(config):
+    server_cfg = config(server={"port": 0, "workers": 1, "queue_size": 1})
+    def crash(cfg, *, log_path=None, sensors=None):
+        raise RuntimeError("boom")
+
+    class BrokenPool(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+    record = {"sensor": "Accelerometer", "time": "1", "x": "0", "y": "0", "z": "0"}
+
+    async def run(server, sessions):
+        async with server:
+            for session in sessions:
+                assert (await asyncio.to_thread(_request, server.address, "POST", f"/push?session={session}", [record]))[0] == 200
+                assert (await asyncio.to_thread(_request, server.address, "POST", f"/rides/{session}/finish"))[0] == 202
+        return server
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            crashed = await run(IngestServer(server_cfg, executor=pool, process=crash), ("a", "b", "c"))
+        owned = IngestServer(server_cfg)
+        owned.executor.shutdown()
+        broken = owned.executor = BrokenPool(max_workers=1)
+        await run(owned, ("d", "e"))
+        return crashed, owned, broken
+
+    crashed, owned, broken = asyncio.run(asyncio.wait_for(scenario(), timeout=30))   # close() darf nicht hängen
+    assert crashed.status()["sessions"] == {"failed": 3} and crashed.in_flight == 0
+    assert crashed.sessions["a"].result["error"] == "RuntimeError: boom"
+    assert owned.status()["sessions"] == {"failed": 2} and owned.in_flight == 0
+    assert "BrokenProcessPool" in owned.sessions["d"].result["error"]
+    assert owned.executor is not broken and isinstance(owned.executor, ProcessPoolExecutor)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund import Ctx, Stage
+from untergrund.orchestrator import run_stage
+from untergrund.streaming import OnlineResampler, RingBuffer, StreamEngine, replay_json, run_stream
+from untergrund.synthetic import synthetic_sensor_frames, write_synthetic_ride
+
+
+def test_ring_buffer_and_online_resampler_match_batch_views():
+    buf = RingBuffer(5, 1)
+    for start in (0, 3, 6):
+        buf.append(np.arange(start, start + 3, dtype=np.int64), np.arange(start, start + 3, dtype=np.float64)[:, None])
+    t, v = buf.view()
+    assert t.tolist() == [4, 5, 6, 7, 8] and v[:, 0].tolist() == [4, 5, 6, 7, 8]
+    assert buf.window(5, 8)[0].tolist() == [5, 6, 7] and np.shares_memory(buf.window(5, 8)[1], v)
+
+    # blockweise Interpolation == Interpolation über die ganze Reihe
+    t_ns = np.cumsum(np.random.default_rng(0).integers(8, 12, size=200)).astype(np.int64)
+    values = np.random.default_rng(1).normal(size=(200, 2))
+    resampler = OnlineResampler(10)
+    parts = [resampler.push(t_ns[i:i + 37], values[i:i + 37]) for i in range(0, 200, 37)]
+    grid = np.concatenate([g for g, _ in parts])
+    out = np.concatenate([o for _, o in parts])
+    assert np.array_equal(grid, np.arange(-(-t_ns[0] // 10), t_ns[-1] // 10 + 1) * 10)
+    np.testing.assert_allclose(out[:, 0], np.interp(grid, t_ns, values[:, 0]))
+
+
+def test_stream_replay_emits_batch_windows_with_close_features(tmp_path, config):
+    cfg = config()
+    frames = synthetic_sensor_frames(40, acc_rate=200, gyro_rate=200, seed=1)
+    path = write_synthetic_ride(tmp_path / "ride.json", frames)
+
+    emitted = []
+    windows = run_stream(cfg, replay_json(path, speed=None), on_window=emitted.append)
+
+    batch = Ctx(sensors={k: v for k, v in frames.items() if k != "Metadata"}, config=cfg)
+    for st in (Stage.PREPROCESS, Stage.WINDOW, Stage.FEATURES):
+        batch = run_stage(st, batch)
+    expected = batch.features["cluster"].loc[windows.index]
+
+    assert len(emitted) == len(windows) > 10 and windows.index[0] == 3   # warmup_s=5 -> erste 3 Fenster fehlen
+    assert (windows["start_utc"].diff().dropna() == pd.Timedelta(2, unit="s")).all()
+    assert windows["start_utc"].equals(expected["start_utc"])
+    np.testing.assert_array_equal(windows["v"], expected["v"])
+    # kausale statt nullphasiger Filter -> kleine Abweichung
+    np.testing.assert_allclose(windows["acc_rms"], expected["acc_rms"], rtol=0.1)
+    np.testing.assert_allclose(windows["acc_rms_vnorm"], expected["acc_rms_vnorm"], rtol=0.1)
+
+
+def test_one_large_block_yields_the_same_windows_as_small_batches(tmp_path, config):
+    cfg = config()
+    path = write_synthetic_ride(tmp_path / "ride.json", synthetic_sensor_frames(120, acc_rate=200, gyro_rate=200, seed=2))
+
+    expected = run_stream(cfg, replay_json(path, speed=None))
+    engine = StreamEngine(cfg)
+    windows = pd.DataFrame(engine.push_records(replay_json(path, speed=None))).set_index("window_id")
+
+    assert len(windows) == len(expected) > 50 and windows.index.equals(expected.index)
+    assert windows["start_utc"].equals(expected["start_utc"])
+    np.testing.assert_allclose(windows["acc_rms"], expected["acc_rms"], rtol=1e-9)
+    assert engine.origin() == min(expected["start_utc"]).value - 3 * engine.hop_ns
+
+
+def test_replay_json_paces_records_by_sensor_time(tmp_path):
+    path = write_synthetic_ride(tmp_path / "ride.json", synthetic_sensor_frames(20, acc_rate=10, gyro_rate=10))
+    now = [0.0]
+    sleeps = []
+
+    def sleep(s):
+        sleeps.append(s)
+        now[0] += s
+
+    records = list(replay_json(path, speed=2.0, sensors=["Accelerometer"], clock=lambda: now[0], sleep=sleep))
+    assert {r["sensor"] for r in records} == {"Accelerometer"}
+    t = [int(r["time"]) for r in records if r["sensor"] == "Accelerometer"]
+    assert sum(sleeps) == pytest.approx((t[-1] - t[0]) / 1e9 / 2)
+
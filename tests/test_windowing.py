@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from untergrund.runners.window import windowing, window_sample_index
+from untergrund.shared.windows import window_sample_bounds, resolve_window_bounds
+
+
+def _sensors() -> dict[str, pd.DataFrame]:
+    acc_idx = pd.date_range("2025-01-01", periods=1000, freq="10ms", tz="UTC", name="time_utc")
+    loc_idx = pd.date_range("2025-01-01", periods=10, freq="1s", tz="UTC", name="time_utc")
+    return {
+        "Accelerometer": pd.DataFrame({"x": np.arange(1000.0)}, index=acc_idx),
+        "Location": pd.DataFrame({"speed": np.arange(10.0)}, index=loc_idx),
+    }
+
+
+#--- Fenster -> Sample-Offsets ---#
+def test_window_sample_bounds_matches_boolean_mask():
+    sensors = _sensors()
+    windows = windowing(sensors, cfg={"window_duration_s": 4, "window_hop_s": 2}, window_key="cluster")["cluster"]
+    for df in sensors.values():
+        start, stop = window_sample_bounds(df.index, windows["start_utc"], windows["end_utc"])
+        for i, row in windows.iterrows():
+            mask = (df.index >= row["start_utc"]) & (df.index < row["end_utc"])
+            assert np.array_equal(np.flatnonzero(mask), np.arange(start[i], stop[i]))
+
+
+def test_window_sample_bounds_unsorted_raises():
+    df = _sensors()["Accelerometer"].iloc[::-1]
+    with pytest.raises(ValueError):
+        window_sample_bounds(df.index, df.index[:1], df.index[:1])
+
+
+def test_window_sample_index_written_to_artifacts():
+    sensors = _sensors()
+    features = windowing(sensors, cfg={"window_duration_s": 4, "window_hop_s": 2}, window_key="cluster")
+    artifacts = window_sample_index(sensors, features, {"run_id": "x"}, window_key="cluster")
+
+    assert artifacts["run_id"] == "x"
+    entry = artifacts["window_index"]["cluster"]["Accelerometer"]
+    assert entry["n_rows"] == 1000
+    assert len(entry["start"]) == len(features["cluster"])
+    assert not entry["start"].flags.writeable
+    # Fenster 0: [0s, 4s) -> 400 Samples @ 100 Hz
+    assert (entry["start"][0], entry["stop"][0]) == (0, 400)
+
+
+def test_resolve_window_bounds_recomputes_on_stale_index(capsys):
+    sensors = _sensors()
+    features = windowing(sensors, cfg={"window_duration_s": 4, "window_hop_s": 2}, window_key="cluster")
+    index_map = window_sample_index(sensors, features, {}, window_key="cluster")["window_index"]["cluster"]
+
+    shorter = sensors["Accelerometer"].iloc[100:]
+    start, stop = resolve_window_bounds(shorter, features["cluster"], sensor_name="Accelerometer", window_index=index_map)
+    assert "does not match" in capsys.readouterr().out
+    assert (start[0], stop[0]) == (0, 300)